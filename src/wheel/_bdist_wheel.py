@@ -30,7 +30,7 @@ from setuptools import Command
 
 from . import __version__ as wheel_version
 from ._metadata import pkginfo_to_metadata
-from .wheelfile import WheelFile
+from .wheelfile import ContentAwareCompression, WheelFile
 
 if TYPE_CHECKING:
     import types
@@ -183,6 +183,7 @@ class bdist_wheel(Command):
     supported_compressions = {
         "stored": ZIP_STORED,
         "deflated": ZIP_DEFLATED,
+        "auto": ZIP_DEFLATED,
     }
 
     user_options = [
@@ -224,6 +225,12 @@ class bdist_wheel(Command):
                 ", ".join(supported_compressions)
             ),
         ),
+        (
+            "compression-level=",
+            None,
+            "deflate compression level from 0 (fastest) to 9 (smallest) "
+            "(default: zlib default)",
+        ),
         (
             "python-tag=",
             None,
@@ -261,6 +268,8 @@ class bdist_wheel(Command):
         self.group = None
         self.universal: bool = False
         self.compression: str | int = "deflated"
+        self.compression_policy: ContentAwareCompression | None = None
+        self.compression_level: str | int | None = None
         self.python_tag: str = python_tag()
         self.build_number: str | None = None
         self.py_limited_api: str | Literal[False] = False
@@ -277,11 +286,24 @@ class bdist_wheel(Command):
         self.data_dir = self.wheel_dist_name + ".data"
         self.plat_name_supplied = self.plat_name is not None
 
+        if self.compression == "auto":
+            self.compression_policy = ContentAwareCompression()
+
         try:
             self.compression = self.supported_compressions[self.compression]
         except KeyError:
             raise ValueError(f"Unsupported compression: {self.compression}") from None
 
+        if self.compression_level is not None:
+            try:
+                self.compression_level = int(self.compression_level)
+                if not 0 <= self.compression_level <= 9:
+                    raise ValueError
+            except ValueError:
+                raise ValueError(
+                    f"Unsupported compression level: {self.compression_level}"
+                ) from None
+
         need_options = ("dist_dir", "plat_name", "skip_build")
 
         self.set_undefined_options("bdist", *zip(need_options, need_options))
@@ -448,7 +470,13 @@ class bdist_wheel(Command):
             os.makedirs(self.dist_dir)
 
         wheel_path = os.path.join(self.dist_dir, archive_basename + ".whl")
-        with WheelFile(wheel_path, "w", self.compression) as wf:
+        with WheelFile(
+            wheel_path,
+            "w",
+            self.compression,
+            self.compression_level,
+            compression_policy=self.compression_policy,
+        ) as wf:
             wf.write_files(archive_root)
 
         # Add to 'Distribution.dist_files' so that the "upload" command works
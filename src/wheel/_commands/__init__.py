@@ -9,30 +9,42 @@ import os
 import sys
 from argparse import ArgumentTypeError
 
-from ..wheelfile import WheelError
+from ..wheelfile import VerificationCache, WheelError, WheelStats
 
 
 def unpack_f(args: argparse.Namespace) -> None:
     from .unpack import unpack
 
-    unpack(args.wheelfile, args.dest)
+    unpack(args.wheelfile, args.dest, args.stats, args.verification_cache)
 
 
 def pack_f(args: argparse.Namespace) -> None:
     from .pack import pack
 
-    pack(args.directory, args.dest_dir, args.build_number, args.local_version)
+    pack(
+        args.directory,
+        args.dest_dir,
+        args.build_number,
+        args.local_version,
+        args.compression,
+        args.compression_level,
+        args.output,
+        args.stats,
+    )
 
 
 def convert_f(args: argparse.Namespace) -> None:
     from .convert import convert
 
-    convert(args.files, args.dest_dir, args.verbose)
+    convert(args.files, args.dest_dir, args.verbose, args.compression_level, args.stats)
 
 
 def tags_f(args: argparse.Namespace) -> None:
     from .tags import tags
 
+    if args.output is not None and len(args.wheel) != 1:
+        raise WheelError("--output can only be used with a single wheel")
+
     names = (
         tags(
             wheel,
@@ -41,23 +53,33 @@ def tags_f(args: argparse.Namespace) -> None:
             args.platform_tag,
             args.build,
             args.remove,
+            args.compression_level,
+            args.output,
+            args.stats,
         )
         for wheel in args.wheel
     )
 
+    # Keep stdout clean when the wheel itself is written to it
     for name in names:
-        print(name)
+        print(name, file=sys.stderr if args.output == "-" else sys.stdout)
 
 
 def info_f(args: argparse.Namespace) -> None:
     from .info import info
 
     try:
-        info(args.wheelfile, args.verbose)
-    except FileNotFoundError as e:
+        info(args.wheelfile, args.verbose, args.stats)
+    except OSError as e:
         raise WheelError(str(e)) from e
 
 
+def verify_f(args: argparse.Namespace) -> None:
+    from .verify import verify
+
+    verify(args.wheelfile, args.jobs, args.stats, args.verification_cache)
+
+
 def version_f(args: argparse.Namespace) -> None:
     from .. import __version__
 
@@ -73,6 +95,66 @@ def parse_build_tag(build_tag: str) -> str:
     return build_tag
 
 
+def parse_compression_level(level: str) -> int:
+    if not level.isdigit() or int(level) > 9:
+        raise ArgumentTypeError("compression level must be an integer from 0 to 9")
+
+    return int(level)
+
+
+def add_compression_level_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--compression-level",
+        type=parse_compression_level,
+        metavar="LEVEL",
+        help="Deflate compression level from 0 (fastest) to 9 (smallest)",
+    )
+
+
+def add_output_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--output",
+        "-o",
+        metavar="FILE",
+        help="Write the wheel to FILE instead, or to standard output if FILE is '-'",
+    )
+
+
+def add_stats_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        dest="show_stats",
+        help="Print performance counters to standard error when done",
+    )
+
+
+def add_verification_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--verify-cache",
+        metavar="FILE",
+        help="Database of verified members, which are not hashed again until the "
+        "wheel changes",
+    )
+    parser.add_argument(
+        "--reverify",
+        action="store_true",
+        help="Hash all members, even those recorded as verified in --verify-cache",
+    )
+
+
+def parse_jobs(jobs: str) -> int:
+    try:
+        value = int(jobs)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid number of jobs: {jobs!r}") from None
+
+    if value < 1:
+        raise ArgumentTypeError("number of jobs must be at least 1")
+
+    return value
+
+
 TAGS_HELP = """\
 Make a new wheel with given tags. Any tags unspecified will remain the same.
 Starting the tags with a "+" will append to the existing tags. Starting with a
@@ -90,7 +172,11 @@ def parser() -> argparse.ArgumentParser:
     unpack_parser.add_argument(
         "--dest", "-d", help="Destination directory", default="."
     )
-    unpack_parser.add_argument("wheelfile", help="Wheel file")
+    unpack_parser.add_argument(
+        "wheelfile", help="Wheel file, or '-' to read it from standard input"
+    )
+    add_verification_cache_arguments(unpack_parser)
+    add_stats_argument(unpack_parser)
     unpack_parser.set_defaults(func=unpack_f)
 
     repack_parser = s.add_parser("pack", help="Repack wheel")
@@ -107,6 +193,16 @@ def parser() -> argparse.ArgumentParser:
     repack_parser.add_argument(
         "--local-version", help="Local version identifier to add or replace"
     )
+    repack_parser.add_argument(
+        "--compression",
+        choices=["stored", "deflated", "auto"],
+        default="deflated",
+        help="Compression method; 'auto' stores files that would not compress well "
+        "(default: %(default)s)",
+    )
+    add_compression_level_argument(repack_parser)
+    add_output_argument(repack_parser)
+    add_stats_argument(repack_parser)
     repack_parser.set_defaults(func=pack_f)
 
     convert_parser = s.add_parser("convert", help="Convert egg or wininst to wheel")
@@ -118,6 +214,8 @@ def parser() -> argparse.ArgumentParser:
         help="Directory to store wheels (default %(default)s)",
     )
     convert_parser.add_argument("--verbose", "-v", action="store_true")
+    add_compression_level_argument(convert_parser)
+    add_stats_argument(convert_parser)
     convert_parser.set_defaults(func=convert_f)
 
     tags_parser = s.add_parser(
@@ -139,15 +237,40 @@ def parser() -> argparse.ArgumentParser:
     tags_parser.add_argument(
         "--build", type=parse_build_tag, metavar="BUILD", help="Specify a build tag"
     )
+    add_compression_level_argument(tags_parser)
+    add_output_argument(tags_parser)
+    add_stats_argument(tags_parser)
     tags_parser.set_defaults(func=tags_f)
 
     info_parser = s.add_parser("info", help="Show information about a wheel file")
-    info_parser.add_argument("wheelfile", help="Wheel file to show information for")
+    info_parser.add_argument(
+        "wheelfile",
+        help="Wheel file to show information for (a path or an HTTP(S) URL)",
+    )
     info_parser.add_argument(
         "--verbose", "-v", action="store_true", help="Show detailed file listing"
     )
+    add_stats_argument(info_parser)
     info_parser.set_defaults(func=info_f)
 
+    verify_parser = s.add_parser(
+        "verify", help="Check the contents of wheels against their RECORD files"
+    )
+    verify_parser.add_argument(
+        "wheelfile",
+        nargs="+",
+        help="Wheel file(s) to verify, where '-' reads a wheel from standard input",
+    )
+    verify_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=parse_jobs,
+        help="Number of threads used for hashing (default: based on CPU count)",
+    )
+    add_verification_cache_arguments(verify_parser)
+    add_stats_argument(verify_parser)
+    verify_parser.set_defaults(func=verify_f)
+
     version_parser = s.add_parser("version", help="Print version and exit")
     version_parser.set_defaults(func=version_f)
 
@@ -163,10 +286,26 @@ def main() -> int:
     if not hasattr(args, "func"):
         p.print_help()
     else:
+        if getattr(args, "reverify", False) and not args.verify_cache:
+            p.error("--reverify requires --verify-cache")
+
+        args.stats = WheelStats() if getattr(args, "show_stats", False) else None
+        args.verification_cache = None
         try:
+            if getattr(args, "verify_cache", None):
+                args.verification_cache = VerificationCache(
+                    args.verify_cache, reverify=args.reverify
+                )
+
             args.func(args)
             return 0
         except WheelError as e:
             print(e, file=sys.stderr)
+        finally:
+            if args.verification_cache is not None:
+                args.verification_cache.close()
+
+            if args.stats is not None:
+                print(args.stats.summary(), file=sys.stderr)
 
     return 1
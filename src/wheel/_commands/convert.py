@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os.path
 import re
+import stat
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
 from collections.abc import Iterator
@@ -11,13 +12,14 @@ from email.policy import EmailPolicy
 from glob import iglob
 from pathlib import Path
 from textwrap import dedent
-from zipfile import ZipFile
+from typing import IO
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
 
 from packaging.tags import parse_tag
 
 from .. import __version__
 from .._metadata import generate_requirements
-from ..wheelfile import WheelError, WheelFile
+from ..wheelfile import WheelError, WheelFile, WheelStats, get_zipinfo_datetime
 
 egg_filename_re = re.compile(
     r"""
@@ -116,6 +118,19 @@ def normalize(name: str) -> str:
     return re.sub(r"[-_.]+", "-", name).lower().replace("-", "_")
 
 
+def _member_info(name: str, size: int) -> ZipInfo:
+    """Describe a member passed through from the source archive.
+
+    Giving its size up front lets :meth:`WheelFile.write_iter` stream it into the
+    wheel without holding it back to find out whether it needs ZIP64 extensions.
+    """
+    zinfo = ZipInfo(name, date_time=get_zipinfo_datetime())
+    zinfo.compress_type = ZIP_DEFLATED
+    zinfo.external_attr = (0o664 | stat.S_IFREG) << 16
+    zinfo.file_size = size
+    return zinfo
+
+
 class ConvertSource(metaclass=ABCMeta):
     name: str
     version: str
@@ -129,7 +144,7 @@ class ConvertSource(metaclass=ABCMeta):
         return f"{self.name}-{self.version}.dist-info"
 
     @abstractmethod
-    def generate_contents(self) -> Iterator[tuple[str, bytes]]:
+    def generate_contents(self) -> Iterator[tuple[str | ZipInfo, IO[bytes] | bytes]]:
         pass
 
 
@@ -150,7 +165,7 @@ class EggFileSource(ConvertSource):
 
         self.metadata = Message()
 
-    def generate_contents(self) -> Iterator[tuple[str, bytes]]:
+    def generate_contents(self) -> Iterator[tuple[str | ZipInfo, IO[bytes] | bytes]]:
         with ZipFile(self.path, "r") as zip_file:
             for filename in sorted(zip_file.namelist()):
                 # Skip pure directory entries
@@ -175,11 +190,15 @@ class EggFileSource(ConvertSource):
                     continue
 
                 # For any other file, just pass it through
-                yield filename, zip_file.read(filename)
+                with zip_file.open(filename) as f:
+                    yield (
+                        _member_info(filename, zip_file.getinfo(filename).file_size),
+                        f,
+                    )
 
 
 class EggDirectorySource(EggFileSource):
-    def generate_contents(self) -> Iterator[tuple[str, bytes]]:
+    def generate_contents(self) -> Iterator[tuple[str | ZipInfo, IO[bytes] | bytes]]:
         for dirpath, _, filenames in os.walk(self.path):
             for filename in sorted(filenames):
                 path = Path(dirpath, filename)
@@ -204,7 +223,14 @@ class EggDirectorySource(EggFileSource):
                     continue
 
                 # For any other file, just pass it through
-                yield str(path.relative_to(self.path)), path.read_bytes()
+                with path.open("rb") as f:
+                    yield (
+                        _member_info(
+                            str(path.relative_to(self.path)),
+                            os.fstat(f.fileno()).st_size,
+                        ),
+                        f,
+                    )
 
 
 class WininstFileSource(ConvertSource):
@@ -267,7 +293,7 @@ class WininstFileSource(ConvertSource):
                 if egg_info_found and pyd_found:
                     break
 
-    def generate_contents(self) -> Iterator[tuple[str, bytes]]:
+    def generate_contents(self) -> Iterator[tuple[str | ZipInfo, IO[bytes] | bytes]]:
         dist_info_dir = f"{self.name}-{self.version}.dist-info"
         data_dir = f"{self.name}-{self.version}.data"
         with ZipFile(self.path, "r") as zip_file:
@@ -298,10 +324,22 @@ class WininstFileSource(ConvertSource):
                     target_filename = f"{data_dir}/scripts/{target_filename}"
 
                 # For any other file, just pass it through
-                yield target_filename, zip_file.read(filename)
+                with zip_file.open(filename) as f:
+                    yield (
+                        _member_info(
+                            target_filename, zip_file.getinfo(filename).file_size
+                        ),
+                        f,
+                    )
 
 
-def convert(files: list[str], dest_dir: str, verbose: bool) -> None:
+def convert(
+    files: list[str],
+    dest_dir: str,
+    verbose: bool,
+    compression_level: int | None = None,
+    stats: WheelStats | None = None,
+) -> None:
     for pat in files:
         for archive in iglob(pat):
             path = Path(archive)
@@ -325,9 +363,10 @@ def convert(files: list[str], dest_dir: str, verbose: bool) -> None:
                 # separators; never write outside the destination directory
                 raise WheelError(f"Invalid distribution name or version in {archive!r}")
 
-            with WheelFile(dest_path, "w") as wheelfile:
-                for name_or_zinfo, contents in source.generate_contents():
-                    wheelfile.writestr(name_or_zinfo, contents)
+            with WheelFile(
+                dest_path, "w", compresslevel=compression_level, stats=stats
+            ) as wheelfile:
+                wheelfile.write_iter(source.generate_contents())
 
                 # Write the METADATA file
                 wheelfile.writestr(
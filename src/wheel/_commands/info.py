@@ -6,23 +6,40 @@ from __future__ import annotations
 
 import email.policy
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from email.parser import BytesParser
 from pathlib import Path
 
-from ..wheelfile import WheelFile
+from .._http import HTTPRangeReader, is_url
+from ..wheelfile import WheelFile, WheelStats
 
 
-def info(path: str, verbose: bool = False) -> None:
+@contextmanager
+def _open_wheel(path: str, stats: WheelStats | None) -> Iterator[WheelFile]:
+    """Open a local wheel, or a remote one if ``path`` is an HTTP(S) URL."""
+    if is_url(path):
+        with HTTPRangeReader(path) as reader, WheelFile(reader, stats=stats) as wf:
+            yield wf
+    else:
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Wheel file not found: {path}")
+
+        with WheelFile(path, stats=stats) as wf:
+            yield wf
+
+
+def info(path: str, verbose: bool = False, stats: WheelStats | None = None) -> None:
     """Display information about a wheel file.
 
-    :param path: The path to the wheel file
+    Wheels given as HTTP(S) URLs are read with range requests, so only the central
+    directory and the ``.dist-info`` members are downloaded.
+
+    :param path: The path or URL to the wheel file
     :param verbose: Show detailed file listing
+    :param stats: Performance counters to fill in while reading the wheel
     """
-    wheel_path = Path(path)
-    if not wheel_path.exists():
-        raise FileNotFoundError(f"Wheel file not found: {path}")
-
-    with WheelFile(path) as wf:
+    with _open_wheel(path, stats) as wf:
         # Extract basic wheel information from filename
         parsed = wf.parsed_filename
         name = parsed.group("name")
@@ -3,14 +3,18 @@ from __future__ import annotations
 import email.policy
 import os.path
 import re
+import sys
 from email.generator import BytesGenerator
 from email.parser import BytesParser
+from typing import IO
+from zipfile import ZIP_DEFLATED, ZIP_STORED
 
 from packaging.version import InvalidVersion, Version
 
-from ..wheelfile import WheelError, WheelFile
+from ..wheelfile import ContentAwareCompression, WheelError, WheelFile, WheelStats
 
 DIST_INFO_RE = re.compile(r"^(?P<namever>(?P<name>.+?)-(?P<ver>\d.*?))\.dist-info$")
+COMPRESSION_METHODS = {"stored": ZIP_STORED, "deflated": ZIP_DEFLATED, "auto": None}
 
 
 def pack(
@@ -18,6 +22,10 @@ def pack(
     dest_dir: str,
     build_number: str | None,
     local_version: str | None = None,
+    compression: str = "deflated",
+    compression_level: int | None = None,
+    output: str | None = None,
+    stats: WheelStats | None = None,
 ) -> None:
     """Repack a previously unpacked wheel directory into a new wheel file.
 
@@ -28,6 +36,12 @@ def pack(
     :param dest_dir: Destination directory (defaults to the current directory)
     :param build_number: Build tag to use in the wheel name
     :param local_version: Local version identifier to add or replace
+    :param compression: The compression method to use (``stored``, ``deflated``,
+        or ``auto`` to choose one per file based on its contents)
+    :param compression_level: The deflate compression level (0-9)
+    :param output: A path to write the wheel to instead of ``dest_dir``, or ``-``
+        to write it to standard output
+    :param stats: Performance counters to fill in while writing the wheel
     """
     # Find the .dist-info directory
     dist_info_dirs = [
@@ -116,12 +130,30 @@ def pack(
     tagline = compute_tagline(tags)
 
     # Repack the wheel
-    wheel_path = os.path.join(dest_dir, f"{name_version}-{tagline}.whl")
-    with WheelFile(wheel_path, "w") as wf:
-        print(f"Repacking wheel as {wheel_path}...", end="", flush=True)
+    wheel_name = f"{name_version}-{tagline}.whl"
+    if output == "-":
+        # The wheel goes to stdout, so report progress on stderr
+        target: str | IO[bytes] = sys.stdout.buffer
+        wheel_path = wheel_name
+        status = sys.stderr
+    else:
+        target = wheel_path = output or os.path.join(dest_dir, wheel_name)
+        status = sys.stdout
+
+    compress_type = COMPRESSION_METHODS[compression]
+    with WheelFile(
+        target,
+        "w",
+        ZIP_DEFLATED if compress_type is None else compress_type,
+        compression_level,
+        compression_policy=ContentAwareCompression() if compress_type is None else None,
+        filename=wheel_name,
+        stats=stats,
+    ) as wf:
+        print(f"Repacking wheel as {wheel_path}...", end="", flush=True, file=status)
         wf.write_files(directory)
 
-    print("OK")
+    print("OK", file=status)
 
 
 def compute_tagline(tags: list[str]) -> str:
@@ -3,14 +3,14 @@ from __future__ import annotations
 import email.policy
 import itertools
 import os
-import struct
+import shutil
+import sys
 from collections.abc import Iterable
 from email.parser import BytesParser
+from tempfile import mkstemp
+from typing import IO
 
-from ..wheelfile import WheelFile
-
-# Header ID of the ZIP64 extended information extra field.
-_ZIP64_EXTRA_ID = 0x0001
+from ..wheelfile import WheelFile, WheelStats, _strip_zip64_extra
 
 
 def _compute_tags(original_tags: Iterable[str], new_tags: str | None) -> set[str]:
@@ -27,26 +27,6 @@ def _compute_tags(original_tags: Iterable[str], new_tags: str | None) -> set[str
     return set(new_tags.split("."))
 
 
-def _strip_zip64_extra(extra: bytes) -> bytes:
-    """Drop the ZIP64 extra field copied from a central-directory entry.
-
-    The ZIP64 field encodes the local-header offset, which is meaningful only
-    in the central directory. Keeping it in a local header produces an invalid
-    archive; removing it lets zipfile regenerate a correct field when needed.
-    """
-    kept: list[bytes] = []
-    while len(extra) >= 4:
-        field_id, field_size = struct.unpack("<HH", extra[:4])
-        field_end = 4 + field_size
-        if field_id != _ZIP64_EXTRA_ID:
-            kept.append(extra[:field_end])
-
-        extra = extra[field_end:]
-
-    kept.append(extra)
-    return b"".join(kept)
-
-
 def tags(
     wheel: str,
     python_tags: str | None = None,
@@ -54,6 +34,9 @@ def tags(
     platform_tags: str | None = None,
     build_tag: str | None = None,
     remove: bool = False,
+    compression_level: int | None = None,
+    output: str | None = None,
+    stats: WheelStats | None = None,
 ) -> str:
     """Change the tags on a wheel file.
 
@@ -67,9 +50,16 @@ def tags(
     :param abi_tags: The ABI tags to set
     :param platform_tags: The platform tags to set
     :param build_tag: The build tag to set
-    :param remove: Remove the original wheel
+    :param remove: Remove the original wheel, unless the new one replaced it
+    :param compression_level: The deflate compression level (0-9) to recompress the
+        members at. The wheel is rewritten at this level even if its tags are
+        unchanged.
+    :param output: A path to write the new wheel to instead of next to the original
+        one, or ``-`` to write it to standard output. The wheel is written even if
+        its tags are unchanged, and may be the original wheel itself.
+    :param stats: Performance counters to fill in while reading and writing wheels
     """
-    with WheelFile(wheel, "r") as f:
+    with WheelFile(wheel, "r", stats=stats) as f:
         assert f.filename, f"{f.filename} must be available"
 
         wheel_info = f.read(f.dist_info_path + "/WHEEL")
@@ -129,7 +119,8 @@ def tags(
 
     final_wheel_name = "-".join(final_tags) + ".whl"
 
-    if original_wheel_name != final_wheel_name:
+    changed = original_wheel_name != final_wheel_name
+    if changed:
         del info["Tag"], info["Build"]
         for a, b, c in itertools.product(
             final_python_tags, final_abi_tags, final_plat_tags
@@ -138,28 +129,65 @@ def tags(
         if build:
             info["Build"] = build
 
+    if changed or output is not None or compression_level is not None:
         original_wheel_path = os.path.join(
             os.path.dirname(f.filename), original_wheel_name
         )
-        final_wheel_path = os.path.join(os.path.dirname(f.filename), final_wheel_name)
-
-        with (
-            WheelFile(original_wheel_path, "r") as fin,
-            WheelFile(final_wheel_path, "w") as fout,
-        ):
-            fout.comment = fin.comment  # preserve the comment
-            for item in fin.infolist():
-                if item.is_dir():
-                    continue
-                item.extra = _strip_zip64_extra(item.extra)
-                if item.filename == f.dist_info_path + "/RECORD":
-                    continue
-                if item.filename == f.dist_info_path + "/WHEEL":
-                    fout.writestr(item, info.as_bytes())
-                else:
-                    fout.writestr(item, fin.read(item))
-
-        if remove:
+        # Writing over the wheel being read goes through a temporary file, which
+        # replaces the wheel once it has been read in full
+        temp_path: str | None = None
+        if output == "-":
+            target: str | IO[bytes] = sys.stdout.buffer
+        else:
+            target = target_path = output or os.path.join(
+                os.path.dirname(f.filename), final_wheel_name
+            )
+            if os.path.exists(target_path) and os.path.samefile(
+                target_path, original_wheel_path
+            ):
+                fd, temp_path = mkstemp(
+                    dir=os.path.dirname(os.path.abspath(target_path)), suffix=".tmp"
+                )
+                os.close(fd)
+                shutil.copymode(original_wheel_path, temp_path)
+
+        try:
+            with (
+                WheelFile(original_wheel_path, "r", stats=stats) as fin,
+                WheelFile(
+                    temp_path or target,
+                    "w",
+                    compresslevel=compression_level,
+                    filename=final_wheel_name,
+                    stats=stats,
+                ) as fout,
+            ):
+                fout.comment = fin.comment  # preserve the comment
+                for item in fin.infolist():
+                    if item.is_dir():
+                        continue
+                    if item.filename == f.dist_info_path + "/RECORD":
+                        continue
+                    if item.filename == f.dist_info_path + "/WHEEL" and changed:
+                        item.extra = _strip_zip64_extra(item.extra)
+                        fout.writestr(item, info.as_bytes())
+                    elif compression_level is None:
+                        # The contents are unchanged, so copy them without
+                        # recompressing
+                        fout.copy_member_raw(fin, item)
+                    else:
+                        item.extra = _strip_zip64_extra(item.extra)
+                        fout.writestr(item, fin.read(item))
+        except BaseException:
+            if temp_path is not None:
+                os.remove(temp_path)
+
+            raise
+
+        if temp_path is not None:
+            # The new wheel is the original one, which must not be removed
+            os.replace(temp_path, target_path)
+        elif remove:
             os.remove(original_wheel_path)
 
     return final_wheel_name
@@ -1,20 +1,45 @@
 from __future__ import annotations
 
+import os
+import shutil
+import sys
+import tempfile
 from pathlib import Path
+from typing import BinaryIO
+from zipfile import BadZipFile, ZipInfo
 
-from ..wheelfile import WheelFile
+from ..wheelfile import (
+    VerificationCache,
+    WheelError,
+    WheelFile,
+    WheelStats,
+    WheelStreamReader,
+    _member_path,
+)
 
 
-def unpack(path: str, dest: str = ".") -> None:
+def unpack(
+    path: str,
+    dest: str = ".",
+    stats: WheelStats | None = None,
+    verification_cache: VerificationCache | None = None,
+) -> None:
     """Unpack a wheel.
 
     Wheel content will be unpacked to {dest}/{name}-{ver}, where {name}
     is the package name and {ver} its version.
 
-    :param path: The path to the wheel.
+    :param path: The path to the wheel, or ``-`` to read it from standard input.
     :param dest: Destination directory (default to current directory).
+    :param stats: Performance counters to fill in while reading the wheel.
+    :param verification_cache: Members verified before, which are not hashed
+        again. Not used when reading from standard input.
     """
-    with WheelFile(path) as wf:
+    if path == "-":
+        unpack_stream(sys.stdin.buffer, dest, stats)
+        return
+
+    with WheelFile(path, stats=stats, verification_cache=verification_cache) as wf:
         namever = wf.parsed_filename.group("namever")
         destination = Path(dest) / namever
         print(f"Unpacking to: {destination}...", end="", flush=True)
@@ -28,3 +53,72 @@ def unpack(path: str, dest: str = ".") -> None:
             target_path.chmod(permissions)
 
     print("OK")
+
+
+def unpack_stream(
+    stream: BinaryIO, dest: str = ".", stats: WheelStats | None = None
+) -> None:
+    """Unpack a wheel while it is being read from a stream.
+
+    Members are extracted as they arrive into a staging directory inside
+    ``dest``, which is renamed to {name}-{ver} once the whole wheel has been
+    verified, and removed if verification fails. The name and version are taken
+    from the .dist-info directory, as there is no wheel filename.
+
+    :param stream: A binary stream positioned at the start of the wheel.
+    :param dest: Destination directory (default to current directory).
+    :param stats: Performance counters to fill in while reading the wheel.
+    """
+    # Created like the path-based unpack does, as the staging directory goes in it
+    Path(dest).mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".unpack-", dir=dest))
+    try:
+        # Unlike the private staging directory, this is created with the usual
+        # permissions
+        root = staging / "wheel"
+        root.mkdir()
+        reader = WheelStreamReader(stream, stats)
+        extracted: list[tuple[ZipInfo, Path]] = []
+        try:
+            for zinfo, chunks in reader:
+                target_path = _target_path(root, zinfo.filename)
+                if target_path == root:
+                    continue
+
+                if zinfo.is_dir():
+                    target_path.mkdir(parents=True, exist_ok=True)
+                    continue
+
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                with target_path.open("wb") as f:
+                    for chunk in chunks:
+                        f.write(chunk)
+
+                extracted.append((zinfo, target_path))
+        except BadZipFile as exc:
+            raise WheelError(str(exc)) from exc
+
+        report = reader.verify()
+        if not report.ok:
+            raise WheelError("\n".join(report.errors.values()))
+
+        # Permissions are only known once the central directory has been read
+        for zinfo, target_path in extracted:
+            target_path.chmod(zinfo.external_attr >> 16 & 0o777)
+
+        assert reader.dist_info_path
+        namever = reader.dist_info_path[: -len(".dist-info")]
+        destination = Path(dest) / namever
+        if destination.exists():
+            raise WheelError(f"{destination} already exists")
+
+        os.rename(root, destination)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    print(f"Unpacking to: {destination}...OK")
+
+
+def _target_path(base: Path, name: str) -> Path:
+    """Map a member name to a path inside ``base``, like ZipFile.extract() does."""
+    return base / _member_path(name)
@@ -0,0 +1,63 @@
+"""
+Verify the integrity of wheel files.
+"""
+
+from __future__ import annotations
+
+import sys
+from zipfile import BadZipFile
+
+from ..wheelfile import (
+    VerificationCache,
+    VerificationReport,
+    WheelError,
+    WheelFile,
+    WheelStats,
+    WheelStreamReader,
+)
+
+
+def verify(
+    paths: list[str],
+    jobs: int | None = None,
+    stats: WheelStats | None = None,
+    verification_cache: VerificationCache | None = None,
+) -> None:
+    """Check every member of the given wheels against their RECORD files.
+
+    :param paths: The paths to the wheels, where ``-`` reads a wheel from
+        standard input
+    :param jobs: The number of worker threads to hash members with
+    :param stats: Performance counters to fill in while verifying the wheels
+    :param verification_cache: Members verified before, which are not hashed
+        again
+    """
+    failed = False
+    for path in paths:
+        if path == "-":
+            print("Verifying <stdin>...", end="", flush=True)
+            report = WheelStreamReader(sys.stdin.buffer, stats).verify()
+        else:
+            print(f"Verifying {path}...", end="", flush=True)
+            try:
+                with WheelFile(
+                    path,
+                    stats=stats,
+                    concurrent_reads=True,
+                    verification_cache=verification_cache,
+                ) as wf:
+                    report = wf.verify(jobs)
+            except (BadZipFile, OSError, WheelError) as exc:
+                # Report the wheel as broken and go on with the others
+                report = VerificationReport(errors={path: str(exc)})
+
+        if report.ok:
+            print("OK")
+        else:
+            failed = True
+            print("FAILED")
+            for error in report.errors.values():
+                print(f"  {error}")
+
+    if failed:
+        raise WheelError("One or more wheels failed verification")
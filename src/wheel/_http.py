@@ -0,0 +1,180 @@
+"""
+Reading remote files over HTTP with range requests.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import posixpath
+import re
+from collections import OrderedDict
+from urllib.parse import unquote, urlsplit
+from urllib.request import Request, urlopen
+
+from . import __version__
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+
+def is_url(path: str) -> bool:
+    return path.startswith(("http://", "https://"))
+
+
+class HTTPRangeReader(io.RawIOBase):
+    """A read-only, seekable binary file fetched over HTTP as it is read.
+
+    The file is fetched in blocks with ``Range`` requests. The first request
+    fetches the last block, which is where a ZIP archive keeps its central
+    directory, and gives the size of the file. Other blocks are only fetched once
+    they are read from, with a single request for each run of consecutive blocks,
+    and the most recently used ones are kept in memory. A server that does not
+    support range requests sends the whole file, which is then kept in memory.
+
+    This can be passed to :class:`~wheel.wheelfile.WheelFile`, which takes the
+    wheel filename from the last part of the URL path.
+
+    :param url: the URL of the file
+    :param block_size: the number of bytes fetched at a time
+    :param cache_blocks: the number of blocks kept in memory
+    :param timeout: the timeout for each request, in seconds
+    :ivar requests: the number of requests made so far
+    """
+
+    def __init__(
+        self,
+        url: str,
+        block_size: int = 64 * 1024,
+        cache_blocks: int = 256,
+        timeout: float = 30.0,
+    ):
+        super().__init__()
+        self.url = url
+        self.name = unquote(posixpath.basename(urlsplit(url).path))
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.timeout = timeout
+        self.requests = 0
+        self._blocks: OrderedDict[int, bytes] = OrderedDict()
+        self._whole: bytes | None = None
+        self._pos = 0
+
+        start, self.size, data = self._fetch(f"-{block_size}")
+        first = -(-start // block_size)  # the first block fully fetched
+        for index in range(first, (self.size + block_size - 1) // block_size):
+            offset = index * block_size - start
+            self._cache_block(index, data[offset : offset + block_size])
+
+    def _fetch(self, byte_range: str) -> tuple[int, int, bytes]:
+        """Fetch a range of bytes.
+
+        :return: the offset of the data fetched, the size of the file and the data
+        """
+        request = Request(
+            self.url,
+            headers={
+                "Range": f"bytes={byte_range}",
+                "User-Agent": f"wheel/{__version__}",
+            },
+        )
+        self.requests += 1
+        with urlopen(request, timeout=self.timeout) as response:
+            data = response.read()
+            if response.status != 206:
+                self._whole = data
+                return 0, len(data), data
+
+            content_range = response.headers.get("Content-Range", "")
+
+        match = _CONTENT_RANGE_RE.fullmatch(content_range)
+        if match is None:
+            raise OSError(f"Invalid Content-Range {content_range!r} from {self.url}")
+
+        start, end, size = map(int, match.groups())
+        if end - start + 1 != len(data):
+            raise OSError(f"Truncated response from {self.url}")
+
+        return start, size, data
+
+    def _cache_block(self, index: int, block: bytes) -> bytes:
+        self._blocks[index] = block
+        if len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+
+        return block
+
+    def _read_blocks(self, first: int, last: int) -> list[bytes]:
+        """Get blocks from the cache, fetching any missing runs of them."""
+        blocks: list[bytes] = []
+        index = first
+        while index <= last:
+            block = self._blocks.get(index)
+            if block is not None:
+                self._blocks.move_to_end(index)
+                blocks.append(block)
+                index += 1
+                continue
+
+            run_end = index
+            while run_end < last and run_end + 1 not in self._blocks:
+                run_end += 1
+
+            start = index * self.block_size
+            end = min((run_end + 1) * self.block_size, self.size)
+            data_start, _, data = self._fetch(f"{start}-{end - 1}")
+            if data_start > start or data_start + len(data) < end:
+                raise OSError(f"Truncated response from {self.url}")
+
+            for fetched in range(index, run_end + 1):
+                offset = fetched * self.block_size - data_start
+                blocks.append(
+                    self._cache_block(fetched, data[offset : offset + self.block_size])
+                )
+
+            index = run_end + 1
+
+        return blocks
+
+    def readinto(self, buffer: memoryview | bytearray) -> int:  # type: ignore[override]
+        view = memoryview(buffer).cast("B")
+        end = min(self._pos + len(view), self.size)
+        if end <= self._pos:
+            return 0
+
+        if self._whole is not None:
+            size = end - self._pos
+            view[:size] = self._whole[self._pos : end]
+        else:
+            first = self._pos // self.block_size
+            size = 0
+            for index, block in enumerate(
+                self._read_blocks(first, (end - 1) // self.block_size), first
+            ):
+                block_start = index * self.block_size
+                chunk = block[max(self._pos - block_start, 0) : end - block_start]
+                view[size : size + len(chunk)] = chunk
+                size += len(chunk)
+
+        self._pos = end
+        return size
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self.size
+
+        if offset < 0:
+            raise OSError(f"Negative seek position {offset}")
+
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
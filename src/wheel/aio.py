@@ -0,0 +1,279 @@
+"""
+An :mod:`asyncio` interface to :class:`~wheel.wheelfile.WheelFile`.
+"""
+
+from __future__ import annotations
+
+__all__ = ["AsyncMemberFile", "AsyncWheelFile"]
+
+import asyncio
+import os
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import TracebackType
+from typing import IO, TYPE_CHECKING, Literal, TypeVar
+from zipfile import ZipInfo
+
+from .wheelfile import (
+    _BATCH_LENGTH,
+    _PARALLEL_BUDGET,
+    VerificationReport,
+    WheelError,
+    WheelFile,
+    _CompressedMember,
+    _member_path,
+    log,
+)
+
+if TYPE_CHECKING:
+    from _typeshed import StrPath
+
+_T = TypeVar("_T")
+
+
+class AsyncMemberFile:
+    """A member of a wheel opened for reading by :meth:`AsyncWheelFile.open`.
+
+    The contents are read, decompressed and checked against RECORD on the thread
+    pool of the wheel, like :meth:`WheelFile.open` does.
+    """
+
+    def __init__(self, wheel: AsyncWheelFile, fileobj: IO[bytes]):
+        self._wheel = wheel
+        self._fileobj = fileobj
+
+    @property
+    def closed(self) -> bool:
+        return self._fileobj.closed
+
+    async def read(self, size: int = -1) -> bytes:
+        return await self._wheel._run(self._fileobj.read, size)
+
+    async def close(self) -> None:
+        await self._wheel._run(self._fileobj.close)
+
+    async def __aenter__(self) -> AsyncMemberFile:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+
+class AsyncWheelFile:
+    """Reads and writes a wheel without blocking the event loop.
+
+    The wheel is opened as a :class:`~wheel.wheelfile.WheelFile` with the given
+    arguments when entering ``async with``, and closed when leaving it. All file
+    I/O, decompression, compression and hashing then runs on a thread pool of
+    ``limit`` threads belonging to this wheel, so that no more than ``limit``
+    operations on it run at once however many coroutines use it.
+
+    Cancelling a coroutine cancels the operations it has queued on the thread
+    pool. An operation that has already started runs to completion in the
+    background, but :meth:`verify`, :meth:`extractall` and :meth:`write_files`
+    work in small steps, so they stop soon after being cancelled. A wheel that was
+    being written when a :meth:`write_files` call was cancelled still has the files
+    added before then when it is closed.
+
+    :param file: the wheel to open, as accepted by :class:`WheelFile`
+    :param mode: the mode to open the wheel in
+    :param limit: the number of threads to run operations on
+    :param kwargs: other arguments to pass to :class:`WheelFile`
+    """
+
+    def __init__(
+        self,
+        file: StrPath | IO[bytes] | bytes | bytearray | memoryview,
+        mode: Literal["r", "w", "x", "a"] = "r",
+        *,
+        limit: int = 4,
+        **kwargs: object,
+    ):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+
+        self.limit = limit
+        self._open_wheel = partial(WheelFile, file, mode, **kwargs)  # type: ignore[arg-type]
+        self._wheel: WheelFile | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def wheel(self) -> WheelFile:
+        """The underlying :class:`WheelFile`, once opened."""
+        if self._wheel is None:
+            raise WheelError("The wheel is not open")
+
+        return self._wheel
+
+    async def _run(self, func: Callable[..., _T], *args: object) -> _T:
+        """Run a function on the thread pool of the wheel."""
+        if self._executor is None:
+            raise WheelError("The wheel is not open")
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def __aenter__(self) -> AsyncWheelFile:
+        if self._executor is not None:
+            raise WheelError("The wheel is already open")
+
+        self._executor = ThreadPoolExecutor(self.limit, thread_name_prefix="wheel-aio")
+        try:
+            self._wheel = await self._run(self._open_wheel)
+        except BaseException:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            raise
+
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the wheel, once the operations that already started are done."""
+        executor, wheel = self._executor, self._wheel
+        if executor is None:
+            return
+
+        self._executor = self._wheel = None
+
+        def close() -> None:
+            executor.shutdown(cancel_futures=True)
+            if wheel is not None:
+                wheel.close()
+
+        # Shielded so that a cancelled close still finishes writing the wheel
+        await asyncio.shield(asyncio.get_running_loop().run_in_executor(None, close))
+
+    async def open(self, name_or_info: str | ZipInfo) -> AsyncMemberFile:
+        """Open a member for reading, like :meth:`WheelFile.open`."""
+        return AsyncMemberFile(self, await self._run(self.wheel.open, name_or_info))
+
+    async def read(self, name_or_info: str | ZipInfo) -> bytes:
+        """Return the contents of a member, checked against RECORD."""
+        return await self._run(self.wheel.read, name_or_info)
+
+    async def verify(self) -> VerificationReport:
+        """Check every member of the archive against RECORD, like
+        :meth:`WheelFile.verify`.
+
+        Members are checked in batches, with up to ``limit`` batches at once.
+        """
+        wheel = self.wheel
+        members = await self._run(wheel._members_to_verify)
+
+        def verify_batch(batch: list[ZipInfo]) -> list[str | None]:
+            return [wheel._verify_member(zinfo) for zinfo in batch]
+
+        results = await asyncio.gather(
+            *(
+                self._run(verify_batch, members[i : i + _BATCH_LENGTH])
+                for i in range(0, len(members), _BATCH_LENGTH)
+            )
+        )
+        errors = [error for batch in results for error in batch]
+        return await self._run(wheel._verification_report, members, errors)
+
+    async def extract(self, member: str | ZipInfo, path: StrPath | None = None) -> str:
+        """Extract a member, like :meth:`WheelFile.extract`.
+
+        :return: the path of the extracted file
+        """
+        return await self._run(self.wheel.extract, member, path)
+
+    async def extractall(
+        self,
+        path: StrPath | None = None,
+        members: Iterable[str | ZipInfo] | None = None,
+    ) -> None:
+        """Extract members, all of them by default, like :meth:`WheelFile.extractall`.
+
+        Members are extracted in batches, with up to ``limit`` batches at once.
+        """
+        wheel = self.wheel
+        root = os.getcwd() if path is None else os.fspath(path)
+        names = wheel.namelist() if members is None else list(members)
+
+        def make_directories() -> None:
+            # Done up front, as extracting members in parallel would race for them
+            for directory in {
+                os.path.dirname(_member_path(name)) for name in map(_filename, names)
+            }:
+                os.makedirs(os.path.join(root, directory), exist_ok=True)
+
+        def extract_batch(batch: list[str | ZipInfo]) -> None:
+            for member in batch:
+                wheel.extract(member, root)
+
+        await self._run(make_directories)
+        await asyncio.gather(
+            *(
+                self._run(extract_batch, names[i : i + _BATCH_LENGTH])
+                for i in range(0, len(names), _BATCH_LENGTH)
+            )
+        )
+
+    async def write_files(self, base_dir: str) -> None:
+        """Add the contents of a directory tree to the archive, like
+        :meth:`WheelFile.write_files`.
+
+        Up to ``limit`` files are read, hashed and compressed at once, with a
+        bounded number of bytes of them held in memory, and added to the archive
+        in order, so the archive is the same as one written by
+        :meth:`WheelFile.write_files`. Files too large to hold in memory are
+        streamed into the archive.
+        """
+        wheel = self.wheel
+        log.info("creating %r and adding %r to it", wheel.filename, base_dir)
+        files = await self._run(wheel._collect_files, base_dir)
+        pending: deque[tuple[int, asyncio.Future[_CompressedMember]]] = deque()
+        in_flight = 0
+
+        async def commit_oldest() -> None:
+            nonlocal in_flight
+            size, future = pending.popleft()
+            in_flight -= size
+            await self._run(wheel._write_compressed, await future)
+
+        try:
+            for source in files:
+                size = source.stat.st_size
+                if size > _PARALLEL_BUDGET:
+                    while pending:
+                        await commit_oldest()
+
+                    await self._run(wheel._write_file, source)
+                    continue
+
+                while pending and (
+                    len(pending) >= 2 * self.limit
+                    or in_flight + size > _PARALLEL_BUDGET
+                ):
+                    await commit_oldest()
+
+                future = asyncio.ensure_future(self._run(wheel._compress_file, source))
+                pending.append((size, future))
+                in_flight += size
+
+            while pending:
+                await commit_oldest()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _filename(member: str | ZipInfo) -> str:
+    return member.filename if isinstance(member, ZipInfo) else member
@@ -1,21 +1,84 @@
 from __future__ import annotations
 
-__all__ = ["WHEEL_INFO_RE", "WheelFile", "WheelError"]
+__all__ = [
+    "WHEEL_INFO_RE",
+    "ContentAwareCompression",
+    "VerificationCache",
+    "VerificationReport",
+    "WheelError",
+    "WheelFile",
+    "WheelFilePool",
+    "WheelIndexCache",
+    "WheelStats",
+    "WheelStreamReader",
+]
 
 import base64
+import codecs
 import csv
+import errno
 import hashlib
 import logging
+import mmap
 import os.path
 import re
+import shutil
 import stat
+import struct
+import sys
+import threading
 import time
-from io import StringIO, TextIOWrapper
-from typing import IO, TYPE_CHECKING, Literal
-from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cache, partial
+from heapq import nlargest
+from io import BytesIO, StringIO, TextIOWrapper
+from itertools import chain
+from tempfile import SpooledTemporaryFile, mkstemp
+from typing import IO, TYPE_CHECKING, Literal, NamedTuple, TypeVar, overload
+from zipfile import (
+    MAX_EXTRACT_VERSION,
+    ZIP64_LIMIT,
+    ZIP_DEFLATED,
+    ZIP_LZMA,
+    ZIP_STORED,
+    BadZipFile,
+    ZipFile,
+    ZipInfo,
+    _get_compressor,
+    sizeCentralDir,
+    sizeEndCentDir64,
+    sizeEndCentDir64Locator,
+    sizeFileHeader,
+    stringCentralDir,
+    stringEndArchive,
+    stringEndArchive64,
+    stringFileHeader,
+    structCentralDir,
+    structFileHeader,
+)
+from zlib import crc32
+
+try:
+    from zipfile import (  # type: ignore[attr-defined]
+        _ECD_COMMENT,
+        _ECD_LOCATION,
+        _ECD_OFFSET,
+        _ECD_SIGNATURE,
+        _ECD_SIZE,
+        _EndRecData,
+    )
+except ImportError:  # pragma: no cover
+    _EndRecData = None
 
 if TYPE_CHECKING:
-    from _typeshed import SizedBuffer, StrPath
+    from _typeshed import SizedBuffer, StrPath, WriteableBuffer
 
 
 # Non-greedy matching of an optional build number may be too clever (more
@@ -26,189 +89,2636 @@ WHEEL_INFO_RE = re.compile(
     re.VERBOSE,
 )
 MINIMUM_TIMESTAMP = 315532800  # 1980-01-01 00:00:00 UTC
+_CHUNK_SIZE = 1024 * 1024
+_RECORD_SPOOL_SIZE = 4 * 1024 * 1024
+# Upper bound on the size of source files being compressed in parallel at any one
+# time; larger files are streamed on the calling thread instead
+_PARALLEL_BUDGET = 64 * _CHUNK_SIZE
+# Amount of data from the start of each file that is passed to compression policies
+_PROBE_SIZE = 64 * 1024
+# Limits on the number and total size of files handed to a worker thread at once
+_BATCH_LENGTH = 64
+_BATCH_SIZE = 256 * 1024
+# Header ID of the ZIP64 extended information extra field
+_ZIP64_EXTRA_ID = 0x0001
+_DD_SIGNATURE = b"PK\x07\x08"
+_CENTRAL_DIRECTORY_ENTRY = struct.Struct(structCentralDir)
+# The fields of a central directory entry needed to index it: signature, version
+# needed to extract, flags, sizes, name, extra field and comment lengths, and the
+# offset of the local header
+_CENTRAL_DIRECTORY_INDEX = struct.Struct("<4s2xBxH10x2L3H8xL")
+# Value of central directory fields whose actual value is in the ZIP64 extra field
+_ZIP64_SENTINEL = 0xFFFFFFFF
+# Characters that ZipInfo removes from or replaces in member names
+_UNSAFE_NAME_CHARS = tuple(
+    char for char in ("\0", os.sep, os.altsep) if char is not None and char != "/"
+)
+# Python 3.12+ take member names from unicode path extra fields, which are checked
+# against the CRC-32 of the name in the central directory. Whether this guess is
+# right is checked by _lazy_index_supported() before the lazy index is used.
+_UNICODE_PATH_EXTRA = sys.version_info >= (3, 12)
+_UNICODE_PATH_EXTRA_ID = b"up"
+_INDEX_CACHE_MAGIC = f"wheel-index-1-{sys.byteorder}\n".encode("ascii")
+_INDEX_CACHE_SUFFIX = ".index"
+_VERIFICATION_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archives (
+    path TEXT PRIMARY KEY,
+    identity TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS members (
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (path, name)
+) WITHOUT ROWID;
+"""
+# Python 3.12+ and some earlier patch releases record where each member ends to
+# detect overlapping members
+_END_OFFSETS = hasattr(ZipInfo, "_end_offset")
+# Python versions whose zipfile internals the lazy index was checked against
+_LAZY_INDEX_VERSIONS = ((3, 9), (3, 14))
+# Member data is copied between file descriptors in the kernel on Linux, when
+# it needs neither compressing nor decompressing
+_ZERO_COPY = sys.platform.startswith("linux")
+# Errors with which copy_file_range() rejects a pair of files that sendfile() can
+# still copy between
+_COPY_FILE_RANGE_UNSUPPORTED = frozenset(
+    {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+)
 
 log = logging.getLogger("wheel")
 
+_T = TypeVar("_T")
+
+
+class WheelError(Exception):
+    pass
+
+
+@dataclass
+class VerificationReport:
+    """The outcome of :meth:`WheelFile.verify`.
+
+    :ivar verified: members whose contents matched the hash in RECORD
+    :ivar unhashed: members that RECORD deliberately lists without a hash (RECORD
+        itself and any signatures)
+    :ivar errors: a mapping of member name to the problem found with it
+    """
+
+    verified: list[str] = field(default_factory=list)
+    unhashed: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class ContentAwareCompression:
+    """A compression policy that only deflates files likely to get smaller.
+
+    A file is stored without compression if its extension indicates an already
+    compressed format, if it is too small to benefit, or if compressing its first
+    block with the fastest deflate level barely reduces its size. Everything else
+    is deflated.
+
+    Instances can be passed as the ``compression_policy`` argument of
+    :class:`WheelFile`. Any other callable with the same signature works too.
+
+    :param stored_extensions: file name extensions (lowercase, including the dot)
+        that are always stored
+    :param min_size: files smaller than this many bytes are stored
+    :param max_ratio: the largest compressed-to-original size ratio of the probed
+        block for which the file is still deflated
+    """
+
+    default_stored_extensions = frozenset(
+        {
+            ".7z",
+            ".bz2",
+            ".gif",
+            ".gz",
+            ".jar",
+            ".jpeg",
+            ".jpg",
+            ".mp3",
+            ".mp4",
+            ".npz",
+            ".png",
+            ".tgz",
+            ".webp",
+            ".whl",
+            ".woff",
+            ".woff2",
+            ".xz",
+            ".zip",
+            ".zst",
+        }
+    )
+
+    def __init__(
+        self,
+        stored_extensions: Iterable[str] | None = None,
+        min_size: int = 128,
+        max_ratio: float = 0.95,
+    ):
+        self.stored_extensions = (
+            self.default_stored_extensions
+            if stored_extensions is None
+            else frozenset(stored_extensions)
+        )
+        self.min_size = min_size
+        self.max_ratio = max_ratio
+
+    def __call__(self, arcname: str, size: int, head: bytes) -> int:
+        """Choose the compression method for a member.
+
+        :param arcname: the name of the member in the archive
+        :param size: the size of the file
+        :param head: up to the first 64 KiB of the file
+        :return: the compression method (``ZIP_STORED`` or ``ZIP_DEFLATED``)
+        """
+        if size < self.min_size:
+            return ZIP_STORED
+
+        extension = os.path.splitext(arcname)[1].lower()
+        if extension in self.stored_extensions:
+            return ZIP_STORED
+
+        if head and len(zlib.compress(head, 1)) > len(head) * self.max_ratio:
+            return ZIP_STORED
+
+        return ZIP_DEFLATED
+
+
+@dataclass
+class WheelStats:
+    """Performance counters for reading and writing wheels.
+
+    Pass an instance as the ``stats`` argument of :class:`WheelFile` or
+    :class:`WheelStreamReader` to have it filled in; without one, nothing is
+    measured. An instance can be shared by several wheels and threads, in which
+    case the counters add up.
+
+    I/O is measured on the archive file itself, after the central directory has
+    been read when opening an existing wheel. The time spent on a member runs
+    from when it is opened until it is closed, or covers the whole call for
+    members added with one of the ``write`` methods.
+
+    :ivar bytes_read: bytes read from the archive
+    :ivar bytes_written: bytes written to the archive
+    :ivar bytes_compressed: uncompressed bytes passed to a compressor
+    :ivar bytes_decompressed: uncompressed bytes returned by a decompressor
+    :ivar io_time: seconds spent reading from and writing to the archive
+    :ivar hash_time: seconds spent hashing member contents
+    :ivar compress_time: seconds spent compressing
+    :ivar decompress_time: seconds spent decompressing
+    :ivar member_times: seconds spent on each member, by name
+    """
+
+    bytes_read: int = 0
+    bytes_written: int = 0
+    bytes_compressed: int = 0
+    bytes_decompressed: int = 0
+    io_time: float = 0.0
+    hash_time: float = 0.0
+    compress_time: float = 0.0
+    decompress_time: float = 0.0
+    member_times: dict[str, float] = field(default_factory=dict)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def slowest_members(self, count: int = 5) -> list[tuple[str, float]]:
+        """Return the members that took the longest, slowest first.
+
+        :param count: the maximum number of members to return
+        :return: pairs of member name and seconds spent on it
+        """
+        with self._lock:
+            return nlargest(count, self.member_times.items(), key=lambda item: item[1])
+
+    def summary(self, count: int = 5) -> str:
+        """Format the counters and the slowest members as a human readable text.
+
+        :param count: the maximum number of slowest members to list
+        """
+        lines = [
+            f"Bytes read:         {self.bytes_read:>14,}",
+            f"Bytes written:      {self.bytes_written:>14,}",
+            f"Bytes compressed:   {self.bytes_compressed:>14,}",
+            f"Bytes decompressed: {self.bytes_decompressed:>14,}",
+            f"I/O time:           {self.io_time * 1000:>11.1f} ms",
+            f"Hashing time:       {self.hash_time * 1000:>11.1f} ms",
+            f"Compression time:   {self.compress_time * 1000:>11.1f} ms",
+            f"Decompression time: {self.decompress_time * 1000:>11.1f} ms",
+        ]
+        slowest = self.slowest_members(count)
+        if slowest:
+            lines.append("Slowest members:")
+            lines.extend(
+                f"  {seconds * 1000:>8.1f} ms  {name}" for name, seconds in slowest
+            )
+
+        return "\n".join(lines)
+
+    def _add_io(self, read: int, written: int, seconds: float) -> None:
+        with self._lock:
+            self.bytes_read += read
+            self.bytes_written += written
+            self.io_time += seconds
+
+    def _add_hash(self, seconds: float) -> None:
+        with self._lock:
+            self.hash_time += seconds
+
+    def _add_compress(self, size: int, seconds: float) -> None:
+        with self._lock:
+            self.bytes_compressed += size
+            self.compress_time += seconds
+
+    def _add_decompress(self, size: int, seconds: float) -> None:
+        with self._lock:
+            self.bytes_decompressed += size
+            self.decompress_time += seconds
+
+    def _add_member(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.member_times[name] = self.member_times.get(name, 0.0) + seconds
+
+
+@dataclass
+class _StreamedMember:
+    zinfo: ZipInfo
+    zip64: bool
+    digest: bytes = b""
+    error: str | None = None
+
+
+class _SourceFile(NamedTuple):
+    path: str
+    arcname: str
+    stat: os.stat_result
+    date_time: tuple[int, int, int, int, int, int]
+
+
+class _CompressedMember(NamedTuple):
+    zinfo: ZipInfo
+    chunks: list[bytes]
+    hash_: hashlib._Hash
+
+
+class _TimedFile:
+    """Wraps the archive file object to account for its I/O in a :class:`WheelStats`.
+
+    Other attributes are passed through to the wrapped file object.
+    """
+
+    def __init__(self, fileobj: IO[bytes], stats: WheelStats):
+        self._fileobj = fileobj
+        self._stats = stats
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._fileobj, name)
+
+    def read(self, size: int = -1) -> bytes:
+        start = time.perf_counter()
+        data = self._fileobj.read(size)
+        self._stats._add_io(len(data), 0, time.perf_counter() - start)
+        return data
+
+    def write(self, data: SizedBuffer) -> int:
+        start = time.perf_counter()
+        written = self._fileobj.write(data)
+        self._stats._add_io(0, len(data), time.perf_counter() - start)
+        return written
+
+    def flush(self) -> None:
+        start = time.perf_counter()
+        self._fileobj.flush()
+        self._stats._add_io(0, 0, time.perf_counter() - start)
+
+
+class _TimedCompressor:
+    """Wraps a compressor object to account for its work in a :class:`WheelStats`."""
+
+    def __init__(self, compressor: zlib._Compress, stats: WheelStats):
+        self._compressor = compressor
+        self._stats = stats
+
+    def compress(self, data: bytes) -> bytes:
+        start = time.perf_counter()
+        result = self._compressor.compress(data)
+        self._stats._add_compress(len(data), time.perf_counter() - start)
+        return result
+
+    def flush(self, *args: int) -> bytes:
+        start = time.perf_counter()
+        result = self._compressor.flush(*args)
+        self._stats._add_compress(0, time.perf_counter() - start)
+        return result
+
+
+class _TimedDecompressor:
+    """Wraps a decompressor object to account for its work in a :class:`WheelStats`.
+
+    Other attributes, such as ``eof`` and ``unused_data``, are passed through.
+    """
+
+    def __init__(self, decompressor: zlib._Decompress, stats: WheelStats):
+        self._decompressor = decompressor
+        self._stats = stats
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._decompressor, name)
+
+    def decompress(self, data: bytes, *args: int) -> bytes:
+        start = time.perf_counter()
+        result = self._decompressor.decompress(data, *args)
+        self._stats._add_decompress(len(result), time.perf_counter() - start)
+        return result
+
+    def flush(self, *args: int) -> bytes:
+        start = time.perf_counter()
+        result = self._decompressor.flush(*args)
+        self._stats._add_decompress(len(result), time.perf_counter() - start)
+        return result
+
+
+class _TimedHash:
+    """Wraps a hash object to account for its work in a :class:`WheelStats`."""
+
+    def __init__(self, hash_: hashlib._Hash, stats: WheelStats):
+        self._hash = hash_
+        self._stats = stats
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._hash, name)
+
+    def update(self, data: SizedBuffer) -> None:
+        start = time.perf_counter()
+        self._hash.update(data)
+        self._stats._add_hash(time.perf_counter() - start)
+
+
+def _timed_hash(hash_: hashlib._Hash, stats: WheelStats | None) -> hashlib._Hash:
+    """Wrap a hash object in a :class:`_TimedHash` if there is ``stats``."""
+    if stats is None:
+        return hash_
+
+    return _TimedHash(hash_, stats)  # type: ignore[return-value]
+
+
+class _PositionalFile:
+    """Reads a shared file descriptor at a position of its own with :func:`os.pread`.
+
+    This replaces the lock-protected file object that ZipFile gives each open
+    member, so that members can be read from several threads at the same time.
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        position: int,
+        close: Callable[[], None],
+        lock: threading.RLock,
+        stats: WheelStats | None,
+    ):
+        self._fd = fd
+        self._pos = position
+        self._close: Callable[[], None] | None = close
+        self._lock = lock
+        self._stats = stats
+
+    def read(self, n: int = -1) -> bytes:
+        if n < 0:
+            n = max(os.fstat(self._fd).st_size - self._pos, 0)
+
+        start = time.perf_counter()
+        data = os.pread(self._fd, n, self._pos)
+        self._pos += len(data)
+        if self._stats is not None:
+            self._stats._add_io(len(data), 0, time.perf_counter() - start)
+
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += os.fstat(self._fd).st_size
+
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        if self._close is not None:
+            close, self._close = self._close, None
+            # ZipFile does not guard its file reference counting with its lock
+            with self._lock:
+                close()
+
+
+class _BufferFile:
+    """A read-only binary file object over a buffer, which does not copy it.
+
+    :class:`io.BytesIO` makes a copy of any buffer other than :class:`bytes`, which
+    doubles the memory used by a large wheel held in a :class:`bytearray` or a
+    :class:`memoryview`.
+    """
+
+    def __init__(self, buffer: memoryview):
+        self.buffer = buffer
+        self._pos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        end = len(self.buffer) if n is None or n < 0 else self._pos + n
+        data = self.buffer[self._pos : end].tobytes()
+        self._pos += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += len(self.buffer)
+
+        if offset < 0:
+            raise OSError(errno.EINVAL, "Negative seek position")
+
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class _FileRange(NamedTuple):
+    """A span of bytes in an open file, to be copied without passing through Python."""
+
+    fd: int
+    offset: int
+    size: int
+
+
+def _fileno(fileobj: IO[bytes]) -> int | None:
+    try:
+        return fileobj.fileno()
+    except (AttributeError, OSError):
+        return None
+
+
+def _copy_file_range(source: _FileRange, dest_fd: int) -> int:
+    """Copy a span of a file to the current position of ``dest_fd`` in the kernel.
+
+    :func:`os.copy_file_range` is tried first, as it lets file systems that support
+    it share the data blocks instead of copying them, with :func:`os.sendfile` as
+    the fallback.
+
+    :return: the number of bytes copied, which is less than ``source.size`` if the
+        end of the source file was reached
+    """
+    copied = 0
+    use_copy_file_range = hasattr(os, "copy_file_range")
+    while copied < source.size:
+        if use_copy_file_range:
+            try:
+                count = os.copy_file_range(
+                    source.fd, dest_fd, source.size - copied, source.offset + copied
+                )
+            except OSError as exc:
+                if exc.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+                    raise
+
+                use_copy_file_range = False
+                continue
+        else:
+            count = os.sendfile(
+                dest_fd, source.fd, source.offset + copied, source.size - copied
+            )
+
+        if not count:
+            break
+
+        copied += count
+
+    return copied
+
+
+def _file_digest(fileobj: IO[bytes], algorithm: str) -> bytes:
+    """Hash the rest of a file, reading it into a single reused buffer if possible."""
+    if hasattr(hashlib, "file_digest"):  # Python 3.11+
+        return hashlib.file_digest(fileobj, algorithm).digest()
+
+    hash_ = hashlib.new(algorithm)
+    for chunk in iter(partial(fileobj.read, _CHUNK_SIZE), b""):
+        hash_.update(chunk)
+
+    return hash_.digest()
+
+
+def _file_crc32(fileobj: IO[bytes]) -> int:
+    """Compute the CRC-32 of the rest of a file."""
+    crc = 0
+    buffer = bytearray(_CHUNK_SIZE)
+    view = memoryview(buffer)
+    while size := fileobj.readinto(buffer):  # type: ignore[attr-defined]
+        crc = crc32(view[:size], crc)
+
+    return crc
+
+
+def _is_record_path(name: str) -> bool:
+    """Tell whether a member is the RECORD of a top-level ``.dist-info`` directory.
+
+    The directory name is matched ignoring case, as :class:`WheelFile` does when
+    looking for RECORD.
+    """
+    directory, _, basename = name.rpartition("/")
+    return (
+        basename == "RECORD"
+        and "/" not in directory
+        and directory.lower().endswith(".dist-info")
+    )
+
+
+def _member_path(name: str) -> str:
+    """Turn a member name into a relative path, the way ZipFile.extract() does.
+
+    Absolute paths, drive letters and ``..`` components are dropped, so the path
+    cannot point outside the directory the member is extracted to.
+    """
+    arcname = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+
+    arcname = os.path.splitdrive(arcname)[1]
+    invalid_path_parts = ("", os.path.curdir, os.path.pardir)
+    arcname = os.path.sep.join(
+        part for part in arcname.split(os.path.sep) if part not in invalid_path_parts
+    )
+    if os.path.sep == "\\":
+        arcname = ZipFile._sanitize_windows_name(arcname, os.path.sep)
+
+    return arcname
+
+
+class _RecordEntry:
+    """A view of a single row of RECORD."""
+
+    __slots__ = ("algorithm", "digest", "path", "size")
+
+    def __init__(
+        self, path: str, algorithm: str | None, digest: bytes, size: int | None
+    ):
+        self.path = path
+        self.algorithm = algorithm
+        self.digest = digest
+        self.size = size
+
+    @property
+    def hash(self) -> str:
+        """The hash as written in RECORD, such as ``sha256=...``."""
+        digest = urlsafe_b64encode(self.digest).decode("ascii")
+        return f"{self.algorithm}={digest}"
+
+
+class _RecordTable:
+    """Compact storage for the rows of RECORD.
+
+    Rather than keeping a tuple, a digest object and a size object per member,
+    the digests are packed into a single bytearray and the other columns are
+    stored in typed arrays, all indexed by the ordinal of the member. The distinct
+    algorithm names (usually just one) are interned in a small list.
+    """
+
+    __slots__ = (
+        "_algorithm_ids",
+        "_algorithms",
+        "_digest_lengths",
+        "_digest_offsets",
+        "_digests",
+        "_index",
+        "_sizes",
+    )
+
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self._algorithms: list[str | None] = []
+        self._algorithm_ids = array("B")
+        self._digest_offsets = array("Q")
+        self._digest_lengths = array("H")
+        self._digests = bytearray()
+        self._sizes = array("q")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._index
+
+    def __iter__(self) -> Iterator[_RecordEntry]:
+        for path, ordinal in self._index.items():
+            yield self._entry(path, ordinal)
+
+    def __getitem__(self, path: str) -> _RecordEntry:
+        return self._entry(path, self._index[path])
+
+    def _entry(self, path: str, ordinal: int) -> _RecordEntry:
+        offset = self._digest_offsets[ordinal]
+        digest = bytes(self._digests[offset : offset + self._digest_lengths[ordinal]])
+        size = self._sizes[ordinal]
+        return _RecordEntry(
+            path,
+            self._algorithms[self._algorithm_ids[ordinal]],
+            digest,
+            None if size < 0 else size,
+        )
+
+    def add(
+        self, path: str, algorithm: str | None, digest: bytes, size: int | None
+    ) -> None:
+        try:
+            algorithm_id = self._algorithms.index(algorithm)
+        except ValueError:
+            algorithm_id = len(self._algorithms)
+            self._algorithms.append(algorithm)
+
+        offset = len(self._digests)
+        self._digests += digest
+        size = -1 if size is None else size
+        ordinal = self._index.get(path)
+        if ordinal is None:
+            self._algorithm_ids.append(algorithm_id)
+            self._digest_offsets.append(offset)
+            self._digest_lengths.append(len(digest))
+            self._sizes.append(size)
+            # Published last, so that a path found in the table has a whole entry
+            self._index[path] = len(self._sizes) - 1
+        else:
+            # A duplicate entry replaces the earlier one but keeps its position
+            self._algorithm_ids[ordinal] = algorithm_id
+            self._digest_offsets[ordinal] = offset
+            self._digest_lengths[ordinal] = len(digest)
+            self._sizes[ordinal] = size
+
+
+class _CentralDirectory(Sequence[ZipInfo]):
+    """The members of a wheel opened for reading, as listed in its central directory.
+
+    ZipFile makes a ZipInfo object for every entry as it reads the central
+    directory, which dominates the time and memory needed to open a wheel with a
+    very large number of members. Instead, the directory is read in one go and
+    kept as is, and each entry is only decoded as far as needed to index it: its
+    position in the directory and the offset of its local header are stored in
+    typed arrays, and its name in a list. ZipInfo objects are made for the members
+    that are actually accessed, and then kept.
+
+    This stands in for ``ZipFile.filelist``, and its :attr:`members` mapping for
+    ``ZipFile.NameToInfo``.
+    """
+
+    __slots__ = (
+        "_concat",
+        "_data",
+        "_encoding",
+        "_end_offsets",
+        "_header_offsets",
+        "_infos",
+        "_positions",
+        "_start_dir",
+        "index",
+        "members",
+        "names",
+        "unusual",
+    )
+
+    def __init__(
+        self,
+        data: bytes,
+        start_dir: int,
+        concat: int,
+        metadata_encoding: str | None,
+    ):
+        self._data = data
+        self._start_dir = start_dir
+        self._concat = concat
+        self._encoding = metadata_encoding or "cp437"
+        self._positions = array("Q")
+        self._header_offsets = array("Q")
+        self._end_offsets: array[int] | None = None
+        self._infos: list[ZipInfo | None] = []
+        self.names: list[str] = []
+        self.index: dict[str, int] = {}
+        self.members = _MemberMap(self)
+        # Entries whose name or ZIP64 values only ZipInfo can work out
+        self.unusual = array("Q")
+
+    def parse(self, size: int) -> None:
+        """Index the first ``size`` bytes of the directory."""
+        data = self._data
+        concat = self._concat
+        encoding = self._encoding
+        unpack_entry = _CENTRAL_DIRECTORY_INDEX.unpack_from
+        entry_size = _CENTRAL_DIRECTORY_INDEX.size
+        add_position = self._positions.append
+        add_header_offset = self._header_offsets.append
+        add_name = self.names.append
+        unusual = self.unusual
+        position = 0
+        while position < size:
+            if position + entry_size > len(data):
+                raise BadZipFile("Truncated central directory")
+
+            (
+                signature,
+                extract_version,
+                flag_bits,
+                compress_size,
+                file_size,
+                name_length,
+                extra_length,
+                comment_length,
+                header_offset,
+            ) = unpack_entry(data, position)
+            if signature != stringCentralDir:
+                raise BadZipFile("Bad magic number for central directory")
+
+            if extract_version > MAX_EXTRACT_VERSION:
+                raise NotImplementedError(
+                    f"zip file version {extract_version / 10:.1f}"
+                )
+
+            name_start = position + entry_size
+            extra_start = name_start + name_length
+            if _ZIP64_SENTINEL in (compress_size, file_size, header_offset) or (
+                _UNICODE_PATH_EXTRA
+                and extra_length
+                and _UNICODE_PATH_EXTRA_ID
+                in data[extra_start : extra_start + extra_length]
+            ):
+                unusual.append(len(self._positions))
+
+            add_position(position)
+            add_header_offset(header_offset + concat)
+            add_name(
+                data[name_start:extra_start].decode(
+                    "utf-8" if flag_bits & 0x800 else encoding
+                )
+            )
+            position = extra_start + extra_length + comment_length
+
+        joined_names = "/".join(self.names)
+        if any(char in joined_names for char in _UNSAFE_NAME_CHARS):
+            unusual.extend(
+                ordinal
+                for ordinal, name in enumerate(self.names)
+                if any(char in name for char in _UNSAFE_NAME_CHARS)
+            )
+
+        self._index()
+
+    def restore(
+        self,
+        positions: array[int],
+        header_offsets: array[int],
+        names: list[str],
+        unusual: array[int],
+    ) -> None:
+        """Take the index of the directory from a previous :meth:`parse`."""
+        self._positions = positions
+        self._header_offsets = header_offsets
+        self.names = names
+        self.unusual = unusual
+        self._index()
+
+    def _index(self) -> None:
+        names = self.names
+        self._infos = [None] * len(names)
+        for ordinal in self.unusual:
+            position = self._positions[ordinal]
+            _, _, flag_bits, _, _, name_length, _, _, _ = (
+                _CENTRAL_DIRECTORY_INDEX.unpack_from(self._data, position)
+            )
+            name_start = position + _CENTRAL_DIRECTORY_INDEX.size
+            name = self._data[name_start : name_start + name_length].decode(
+                "utf-8" if flag_bits & 0x800 else self._encoding
+            )
+            zinfo = self._infos[ordinal] = self._make_info(ordinal, name)
+            names[ordinal] = zinfo.filename
+            self._header_offsets[ordinal] = zinfo.header_offset
+
+        if _END_OFFSETS:
+            for ordinal in self.unusual:
+                zinfo, end_offset = self._infos[ordinal], self._end_offset(ordinal)
+                zinfo._end_offset = end_offset  # type: ignore[union-attr]
+
+        # Later entries with the same name take precedence, as with ZipFile
+        self.index = dict(zip(names, range(len(names))))
+
+    def __len__(self) -> int:
+        return len(self._infos)
+
+    @overload
+    def __getitem__(self, index: int) -> ZipInfo: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ZipInfo]: ...
+
+    def __getitem__(self, index: int | slice) -> ZipInfo | list[ZipInfo]:
+        if isinstance(index, slice):
+            return [self._info(ordinal) for ordinal in range(len(self))[index]]
+
+        return self._info(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[ZipInfo]:
+        for ordinal in range(len(self)):
+            yield self._info(ordinal)
+
+    def _info(self, ordinal: int) -> ZipInfo:
+        zinfo = self._infos[ordinal]
+        if zinfo is None:
+            zinfo = self._make_info(ordinal, self.names[ordinal])
+            if _END_OFFSETS:
+                end_offset = self._end_offset(ordinal)
+                zinfo._end_offset = end_offset  # type: ignore[attr-defined]
+
+            self._infos[ordinal] = zinfo
+
+        return zinfo
+
+    def _make_info(self, ordinal: int, name: str) -> ZipInfo:
+        """Decode an entry the same way as ``ZipFile._RealGetContents()``."""
+        position = self._positions[ordinal]
+        (
+            _,
+            create_version,
+            create_system,
+            extract_version,
+            reserved,
+            flag_bits,
+            compress_type,
+            raw_time,
+            raw_date,
+            crc,
+            compress_size,
+            file_size,
+            name_length,
+            extra_length,
+            comment_length,
+            volume,
+            internal_attr,
+            external_attr,
+            header_offset,
+        ) = _CENTRAL_DIRECTORY_ENTRY.unpack_from(self._data, position)
+        name_start = position + _CENTRAL_DIRECTORY_ENTRY.size
+        extra_start = name_start + name_length
+        comment_start = extra_start + extra_length
+        zinfo = ZipInfo(name)
+        zinfo.extra = self._data[extra_start:comment_start]
+        zinfo.comment = self._data[comment_start : comment_start + comment_length]
+        zinfo.header_offset = header_offset
+        zinfo.create_version = create_version
+        zinfo.create_system = create_system
+        zinfo.extract_version = extract_version
+        zinfo.reserved = reserved
+        zinfo.flag_bits = flag_bits
+        zinfo.compress_type = compress_type
+        zinfo.CRC = crc
+        zinfo.compress_size = compress_size
+        zinfo.file_size = file_size
+        zinfo.volume = volume
+        zinfo.internal_attr = internal_attr
+        zinfo.external_attr = external_attr
+        zinfo._raw_time = raw_time  # type: ignore[attr-defined]
+        zinfo.date_time = (
+            (raw_date >> 9) + 1980,
+            (raw_date >> 5) & 0xF,
+            raw_date & 0x1F,
+            raw_time >> 11,
+            (raw_time >> 5) & 0x3F,
+            (raw_time & 0x1F) * 2,
+        )
+        if _UNICODE_PATH_EXTRA:
+            name_crc = crc32(self._data[name_start:extra_start])
+            zinfo._decodeExtra(name_crc)  # type: ignore[attr-defined]
+        else:
+            zinfo._decodeExtra()  # type: ignore[attr-defined]
+
+        zinfo.header_offset += self._concat
+        return zinfo
+
+    def _end_offset(self, ordinal: int) -> int:
+        """Find where a member ends: at the next local header or the directory."""
+        if self._end_offsets is None:
+            header_offsets = self._header_offsets
+            end_offsets = array("Q", header_offsets)
+            end_offset = self._start_dir
+            for other in sorted(
+                range(len(header_offsets)),
+                key=header_offsets.__getitem__,
+                reverse=True,
+            ):
+                end_offsets[other] = end_offset
+                end_offset = header_offsets[other]
+
+            self._end_offsets = end_offsets
+
+        return self._end_offsets[ordinal]
+
+
+class _MemberMap(Mapping[str, ZipInfo]):
+    """Maps member names to ZipInfo objects made on demand by a central directory."""
+
+    __slots__ = ("_directory",)
+
+    def __init__(self, directory: _CentralDirectory):
+        self._directory = directory
+
+    def __len__(self) -> int:
+        return len(self._directory.index)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._directory.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._directory.index)
+
+    def __getitem__(self, name: str) -> ZipInfo:
+        return self._directory._info(self._directory.index[name])
+
+
+def _read_central_directory(
+    fp: IO[bytes], metadata_encoding: str | None
+) -> tuple[_CentralDirectory, bytes]:
+    """Read the central directory of an archive into a :class:`_CentralDirectory`.
+
+    :return: the directory and the comment of the archive
+    """
+    try:
+        endrec = _EndRecData(fp)
+    except OSError:
+        raise BadZipFile("File is not a zip file") from None
+
+    if not endrec:
+        raise BadZipFile("File is not a zip file")
+
+    size_cd = endrec[_ECD_SIZE]
+    offset_cd = endrec[_ECD_OFFSET]
+
+    # "concat" is zero, unless the wheel was appended to another file
+    concat = endrec[_ECD_LOCATION] - size_cd - offset_cd
+    if endrec[_ECD_SIGNATURE] == stringEndArchive64:
+        concat -= sizeEndCentDir64 + sizeEndCentDir64Locator
+
+    start_dir = offset_cd + concat
+    if start_dir < 0:
+        raise BadZipFile("Bad offset for central directory")
+
+    fp.seek(start_dir)
+    directory = _CentralDirectory(
+        fp.read(size_cd), start_dir, concat, metadata_encoding
+    )
+    directory.parse(size_cd)
+    return directory, endrec[_ECD_COMMENT]
+
+
+def _lazy_index_sample() -> bytes:
+    """Make an archive with the kinds of entries that :class:`_CentralDirectory`
+    decodes itself or leaves to ZipInfo."""
+    buffer = BytesIO()
+    with ZipFile(buffer, "w", ZIP_DEFLATED) as zf:
+        zf.writestr("test-1.0.dist-info/RECORD", "")
+        info = ZipInfo("test/h\u00e9llo.py", (2020, 5, 17, 10, 20, 30))
+        info.comment = b"a comment"
+        info.extra = struct.pack("<HHB4s", 0x5455, 5, 1, b"\x00" * 4)
+        info.external_attr = 0o100644 << 16
+        zf.writestr(info, b"print('hello')\n")
+        info = ZipInfo("test/alias.py")
+        unicode_name = "test/\u00fcber.py".encode()
+        info.extra = (
+            struct.pack(
+                "<2sHBL",
+                _UNICODE_PATH_EXTRA_ID,
+                5 + len(unicode_name),
+                1,
+                crc32(b"test/alias.py"),
+            )
+            + unicode_name
+        )
+        zf.writestr(info, b"")
+        zf.writestr("test/nul_x.py", b"", ZIP_STORED)
+
+    # A member name with a null byte, in a wheel appended to another file
+    return b"#!/bin/sh\n" + buffer.getvalue().replace(b"nul_x", b"nul\x00x")
+
+
+@cache
+def _lazy_index_supported() -> bool:
+    """Check whether :class:`_CentralDirectory` can stand in for ZipFile here.
+
+    It relies on private parts of :mod:`zipfile`, so it is only used on Python
+    versions it is known to work with, and only if it decodes a sample archive
+    exactly like ZipFile does on the running interpreter.
+    """
+    if _EndRecData is None or not (
+        _LAZY_INDEX_VERSIONS[0] <= sys.version_info[:2] <= _LAZY_INDEX_VERSIONS[1]
+    ):
+        log.debug("lazy wheel index is not supported on this Python version")
+        return False
+
+    data = _lazy_index_sample()
+    try:
+        with ZipFile(BytesIO(data)) as zf:
+            directory, comment = _read_central_directory(BytesIO(data), None)
+            supported = (
+                directory.names == zf.namelist()
+                and list(directory.members) == list(zf.NameToInfo)
+                and comment == zf.comment
+                and directory._start_dir == zf.start_dir
+                and len(directory) == len(zf.filelist)
+                and all(
+                    getattr(actual, attr, None) == getattr(expected, attr, None)
+                    for expected, actual in zip(zf.filelist, directory)
+                    for attr in ZipInfo.__slots__
+                )
+            )
+    except Exception as exc:
+        log.debug("lazy wheel index failed its self-check: %s", exc)
+        return False
+
+    if not supported:
+        log.debug("lazy wheel index does not match ZipFile; not using it")
+
+    return supported
+
+
+def urlsafe_b64encode(data: bytes) -> bytes:
+    """urlsafe_b64encode without padding"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def urlsafe_b64decode(data: bytes) -> bytes:
+    """urlsafe_b64decode without padding"""
+    pad = b"=" * (4 - (len(data) & 3))
+    return base64.urlsafe_b64decode(data + pad)
+
+
+def _check_hash_algorithm(algorithm: str) -> None:
+    try:
+        hashlib.new(algorithm)
+    except ValueError:
+        raise WheelError(f"Unsupported hash algorithm: {algorithm}") from None
+
+    if algorithm.lower() in {"md5", "sha1"}:
+        raise WheelError(
+            f"Weak hash algorithm ({algorithm}) is not permitted by PEP 427"
+        )
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """Drop the ZIP64 extra field copied from a central-directory entry.
+
+    The ZIP64 field encodes the local-header offset, which is meaningful only
+    in the central directory. Keeping it in a local header produces an invalid
+    archive; removing it lets zipfile regenerate a correct field when needed.
+    """
+    kept: list[bytes] = []
+    while len(extra) >= 4:
+        field_id, field_size = struct.unpack("<HH", extra[:4])
+        field_end = 4 + field_size
+        if field_id != _ZIP64_EXTRA_ID:
+            kept.append(extra[:field_end])
+
+        extra = extra[field_end:]
+
+    kept.append(extra)
+    return b"".join(kept)
+
+
+def _zip64_extra(extra: bytes) -> list[int] | None:
+    """Return the values in the ZIP64 extra field, or ``None`` if there is none."""
+    while len(extra) >= 4:
+        field_id, field_size = struct.unpack("<HH", extra[:4])
+        if field_id == _ZIP64_EXTRA_ID:
+            count = min(field_size, len(extra) - 4) // 8
+            return list(struct.unpack(f"<{count}Q", extra[4 : 4 + count * 8]))
+
+        extra = extra[4 + field_size :]
+
+    return None
+
+
+def get_zipinfo_datetime(
+    timestamp: float | None = None,
+) -> tuple[int, int, int, int, int, int]:
+    # Some applications need reproducible .whl files, but they can't do this without
+    # forcing the timestamp of the individual ZipInfo objects. See issue #143.
+    return _zipinfo_datetime(
+        os.environ.get("SOURCE_DATE_EPOCH", timestamp or time.time())
+    )
+
+
+def _zipinfo_datetime(timestamp: float | str) -> tuple[int, int, int, int, int, int]:
+    timestamp = max(int(timestamp), MINIMUM_TIMESTAMP)
+    return time.gmtime(timestamp)[0:6]
+
+
+def _file_identity(fd: int) -> str:
+    """Identify the current version of a file by its inode, size and mtime."""
+    return _stat_identity(os.fstat(fd))
+
+
+def _stat_identity(st: os.stat_result) -> str:
+    return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+
+class _CachedIndex(NamedTuple):
+    """The parsed central directory and RECORD of a wheel."""
+
+    directory: _CentralDirectory
+    comment: bytes
+    dist_info_path: str
+    record_path: str
+    record: _RecordTable
+
+
+def _join_strings(strings: Iterable[str]) -> bytes:
+    # Member names cannot contain null bytes, as ZipInfo cuts them off there
+    return "\0".join(strings).encode("utf-8", "surrogatepass")
+
+
+def _split_strings(data: bytes) -> list[str]:
+    return data.decode("utf-8", "surrogatepass").split("\0") if data else []
+
+
+def _encode_index(key: str, wf: WheelFile) -> bytes:
+    directory = wf.filelist
+    record = wf._record
+    assert isinstance(directory, _CentralDirectory)
+    sections = [
+        key.encode("utf-8", "surrogatepass"),
+        struct.pack("<Qq", directory._start_dir, directory._concat),
+        directory._encoding.encode("ascii"),
+        wf.comment,
+        directory._data,
+        directory._positions.tobytes(),
+        directory._header_offsets.tobytes(),
+        _join_strings(directory.names),
+        directory.unusual.tobytes(),
+        _join_strings([wf.dist_info_path, wf.record_path]),
+        _join_strings(record._index),
+        _join_strings(algorithm or "" for algorithm in record._algorithms),
+        record._algorithm_ids.tobytes(),
+        record._digest_offsets.tobytes(),
+        record._digest_lengths.tobytes(),
+        bytes(record._digests),
+        record._sizes.tobytes(),
+    ]
+    return b"".join(
+        [
+            _INDEX_CACHE_MAGIC,
+            struct.pack(f"<{len(sections) + 1}Q", len(sections), *map(len, sections)),
+            *sections,
+        ]
+    )
+
+
+def _decode_index(data: bytes, key: str) -> _CachedIndex:
+    """Decode an entry of a :class:`WheelIndexCache`.
+
+    :raises ValueError: if the entry is not in the expected format or belongs to
+        another key
+    """
+    if not data.startswith(_INDEX_CACHE_MAGIC):
+        raise ValueError("Unknown cache entry format")
+
+    position = len(_INDEX_CACHE_MAGIC)
+    (count,) = struct.unpack_from("<Q", data, position)
+    lengths = struct.unpack_from(f"<{count}Q", data, position + 8)
+    position += 8 * (count + 1)
+    sections: list[bytes] = []
+    for length in lengths:
+        sections.append(data[position : position + length])
+        position += length
+
+    if position != len(data) or count != 17:
+        raise ValueError("Truncated cache entry")
+
+    if sections[0].decode("utf-8", "surrogatepass") != key:
+        raise ValueError("Cache entry is for another wheel")
+
+    start_dir, concat = struct.unpack("<Qq", sections[1])
+    directory = _CentralDirectory(
+        sections[4], start_dir, concat, sections[2].decode("ascii")
+    )
+    directory.restore(
+        array("Q", sections[5]),
+        array("Q", sections[6]),
+        _split_strings(sections[7]),
+        array("Q", sections[8]),
+    )
+    dist_info_path, record_path = _split_strings(sections[9])
+
+    record = _RecordTable()
+    names, index = directory.names, directory.index
+    for ordinal, path in enumerate(_split_strings(sections[10])):
+        # Share the name string with the central directory entry
+        if (member := index.get(path)) is not None:
+            path = names[member]
+
+        record._index[path] = ordinal
+
+    record._algorithms = [
+        algorithm or None for algorithm in _split_strings(sections[11])
+    ]
+    record._algorithm_ids = array("B", sections[12])
+    record._digest_offsets = array("Q", sections[13])
+    record._digest_lengths = array("H", sections[14])
+    record._digests = bytearray(sections[15])
+    record._sizes = array("q", sections[16])
+    if not (
+        len(record._index)
+        == len(record._algorithm_ids)
+        == len(record._digest_offsets)
+        == len(record._digest_lengths)
+        == len(record._sizes)
+    ):
+        raise ValueError("Inconsistent cache entry")
+
+    return _CachedIndex(directory, sections[3], dist_info_path, record_path, record)
+
+
+class WheelIndexCache:
+    """An on-disk cache of the parsed central directories and RECORD files of wheels.
+
+    Wheels opened by :class:`WheelFile` with this as ``index_cache`` are parsed
+    once; when they are opened again, their member table and RECORD digests are
+    loaded from the cache and members can be read right away. Entries are keyed by
+    the path, device, inode, size and modification time of the wheel, so a wheel
+    that is replaced or modified is parsed afresh.
+
+    When the entries take up more than ``max_size`` bytes, the least recently used
+    ones are removed. Entries are written atomically, so the cache can be shared by
+    several processes.
+
+    :param directory: the directory to keep the entries in; it is created if it
+        does not exist
+    :param max_size: the most bytes that the entries may take up
+    """
+
+    def __init__(self, directory: StrPath, max_size: int = 256 * 1024 * 1024):
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _key(self, path: str, fd: int) -> str:
+        return f"{os.path.realpath(path)}\0{_file_identity(fd)}"
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.directory, digest + _INDEX_CACHE_SUFFIX)
+
+    def _entries(self) -> list[tuple[str, int, int]]:
+        """List the path, size and last use of each entry."""
+        entries: list[tuple[str, int, int]] = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(_INDEX_CACHE_SUFFIX):
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue  # removed by another process
+
+                    entries.append((entry.path, st.st_size, st.st_mtime_ns))
+
+        return entries
+
+    def _load(self, key: str) -> _CachedIndex | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                cached = _decode_index(f.read(), key)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as exc:
+            log.debug("ignoring wheel index cache entry %s: %s", path, exc)
+            return None
+
+        # The modification time of an entry records when it was last used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return cached
+
+    def _store(self, key: str, wf: WheelFile) -> None:
+        path = self._path(key)
+        fd, temp_path = mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_encode_index(key, wf))
+
+            os.replace(temp_path, path)
+        except OSError as exc:
+            log.debug("cannot write wheel index cache entry %s: %s", path, exc)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+            return
+
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for entry_path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_size:
+                break
+
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+
+            total -= size
+
+
+class VerificationCache:
+    """A local database of the wheel members found to match their hash in RECORD.
+
+    Wheels opened by :class:`WheelFile` with this as ``verification_cache`` skip
+    hashing members that were verified before, as long as neither the wheel nor
+    the member's RECORD entry has changed since; the CRC-32 of their contents is
+    still checked as they are read. Wheels are identified by their path, device,
+    inode, size and modification time. Members verified while a wheel is open are
+    recorded when it is closed.
+
+    The database is a SQLite file, which can be shared by several processes.
+
+    :param path: the path to the database; it is created if it does not exist
+    :param reverify: hash all members again, still recording those that match
+    """
+
+    def __init__(self, path: StrPath, *, reverify: bool = False):
+        import sqlite3
+
+        self.path = os.fspath(path)
+        self.reverify = reverify
+        self._lock = threading.Lock()
+        try:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            try:
+                self._db.executescript(_VERIFICATION_CACHE_SCHEMA)
+            except BaseException:
+                self._db.close()
+                raise
+        except sqlite3.Error as exc:
+            raise WheelError(
+                f"Cannot open verification cache {self.path}: {exc}"
+            ) from exc
+
+    def __enter__(self) -> VerificationCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def clear(self) -> None:
+        """Forget all verified members."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM members")
+            self._db.execute("DELETE FROM archives")
+
+    def _load(self, path: str, identity: str) -> dict[str, str]:
+        """Return the hashes that the members of a wheel were verified against."""
+        if self.reverify:
+            return {}
+
+        import sqlite3
+
+        try:
+            with self._lock:
+                return dict(
+                    self._db.execute(
+                        "SELECT name, hash FROM members JOIN archives USING (path) "
+                        "WHERE path = ? AND identity = ?",
+                        (path, identity),
+                    )
+                )
+        except sqlite3.Error as exc:
+            log.warning("cannot read verification cache %s: %s", self.path, exc)
+            return {}
+
+    def _add(self, path: str, identity: str, members: list[tuple[str, str]]) -> None:
+        """Record the hashes that members of a wheel were verified against."""
+        import sqlite3
+
+        try:
+            with self._lock, self._db:
+                row = self._db.execute(
+                    "SELECT identity FROM archives WHERE path = ?", (path,)
+                ).fetchone()
+                if row is None or row[0] != identity:
+                    # Anything verified before belongs to a previous file
+                    self._db.execute("DELETE FROM members WHERE path = ?", (path,))
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO archives VALUES (?, ?)",
+                        (path, identity),
+                    )
+
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO members VALUES (?, ?, ?)",
+                    [(path, name, hash_) for name, hash_ in members],
+                )
+        except sqlite3.Error as exc:
+            log.warning("cannot write verification cache %s: %s", self.path, exc)
+
+
+class WheelFile(ZipFile):
+    """A ZipFile derivative class that also reads SHA-256 hashes from
+    .dist-info/RECORD and checks any read files against those.
+
+    Besides a path, ``file`` can be a binary file object, in which case the wheel
+    filename must be passed as ``filename`` unless the file object has a ``name``
+    that is one. A wheel can also be read straight from memory by passing it as
+    :class:`bytes`, a :class:`bytearray` or a :class:`memoryview`, together with
+    its ``filename``; the buffer is not copied. Wheels can be written to file
+    objects that cannot seek, such as pipes or standard output; members are then
+    followed by data descriptors.
+
+    Pass a :class:`WheelStats` instance as ``stats`` to collect performance
+    counters while the wheel is read or written.
+
+    With ``concurrent_reads``, members opened for reading each read the archive
+    at their own position with :func:`os.pread` instead of sharing the file
+    pointer under a lock, so that several threads reading members at once do not
+    wait for each other. This has no effect where :func:`os.pread` is missing or
+    the wheel is not backed by a file descriptor.
+
+    With ``lazy_index``, the central directory of a wheel opened for reading is
+    indexed in compact arrays instead of being turned into a ZipInfo object per
+    member, which makes opening wheels with very many members much faster.
+    ``filelist`` and ``NameToInfo`` are then read-only and make ZipInfo objects on
+    demand. As this relies on internals of :mod:`zipfile`, it is only done on
+    Python versions where it decodes a sample archive exactly like ZipFile; the
+    wheel is read by ZipFile itself otherwise.
+
+    Wheels opened for reading from a file with a :class:`WheelIndexCache` as
+    ``index_cache`` take their member table and RECORD digests from the cache if
+    they were opened through it before, and are added to it otherwise. This
+    implies ``lazy_index``, and the cache is not used where that is unavailable.
+    Likewise, with a :class:`VerificationCache` as ``verification_cache``, members
+    that were verified before are not hashed again.
+    """
+
+    _default_algorithm = hashlib.sha256
+
+    def __init__(
+        self,
+        file: StrPath | IO[bytes] | bytes | bytearray | memoryview,
+        mode: Literal["r", "w", "x", "a"] = "r",
+        compression: int = ZIP_DEFLATED,
+        compresslevel: int | None = None,
+        *,
+        jobs: int | None = None,
+        compression_policy: Callable[[str, int, bytes], int] | None = None,
+        filename: StrPath | None = None,
+        stats: WheelStats | None = None,
+        concurrent_reads: bool = False,
+        lazy_index: bool = False,
+        index_cache: WheelIndexCache | None = None,
+        verification_cache: VerificationCache | None = None,
+    ):
+        # Set first, as close() is called from __del__ even if opening fails
+        self.fp = None
+        self._record_spool: IO[bytes] | None = None
+        self._mmap: mmap.mmap | None = None
+        self._views: dict[str, memoryview] = {}
+        self._newly_verified: list[tuple[str, str]] = []
+        if filename is None:
+            filename = (
+                file
+                if isinstance(file, (str, os.PathLike))
+                else getattr(file, "name", None)
+            )
+            if not isinstance(filename, (str, os.PathLike)):
+                raise WheelError(
+                    "The wheel filename is required for file objects and buffers"
+                )
+
+        basename = os.path.basename(filename)
+        self.parsed_filename = WHEEL_INFO_RE.match(basename)
+        if not basename.endswith(".whl") or self.parsed_filename is None:
+            raise WheelError(f"Bad wheel filename {basename!r}")
+
+        self._buffer: memoryview | None = None
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            if mode != "r":
+                raise WheelError("Wheels in memory buffers can only be read")
+
+            self._buffer = memoryview(file).cast("B")
+            file = _BufferFile(self._buffer)  # type: ignore[assignment]
+
+        # Used while ZipFile reads the central directory
+        self._lazy_index = (
+            (lazy_index or index_cache is not None)
+            and mode == "r"
+            and _lazy_index_supported()
+        )
+        self._index_cache = index_cache if self._lazy_index else None
+        self._index_key: str | None = None
+        self._cached_index: _CachedIndex | None = None
+        ZipFile.__init__(
+            self,
+            file,
+            mode,
+            compression=compression,
+            allowZip64=True,
+            compresslevel=compresslevel,
+        )
+
+        self.jobs = jobs
+        self.compression_policy = compression_policy
+        self.stats = stats
+        self.concurrent_reads = concurrent_reads and hasattr(os, "pread")
+        self._verification_cache: VerificationCache | None = None
+        self._verification_key: tuple[str, str] | None = None
+        self._verified: dict[str, str] | None = None
+        fd = _fileno(self.fp)
+        if (
+            verification_cache is not None
+            and mode == "r"
+            and fd is not None
+            and isinstance(self.filename, str)
+        ):
+            self._verification_cache = verification_cache
+            self._verification_key = (
+                os.path.realpath(self.filename),
+                _file_identity(fd),
+            )
+
+        if stats is not None:
+            self.fp = _TimedFile(self.fp, stats)  # type: ignore[assignment]
+
+        self.dist_info_path = "{}.dist-info".format(
+            self.parsed_filename.group("namever")
+        )
+        self.record_path = self.dist_info_path + "/RECORD"
+        self._record = _RecordTable()
+        self._record_loaded = mode != "r"
+        if mode == "w":
+            # RECORD rows are spooled as members are written, so the memory used
+            # does not grow with the number of members
+            self._open_record_spool()
+            self._record_names: set[str] = set()
+            # The last rows of members written more than once
+            self._record_updates: dict[str, tuple[str, str, int]] = {}
+
+        self._sorted_names: tuple[int, list[str]] | None = None
+        self._lowercase_names: tuple[int, dict[str, str]] | None = None
+        if self._cached_index is not None:
+            self.dist_info_path = self._cached_index.dist_info_path
+            self.record_path = self._cached_index.record_path
+            self._record = self._cached_index.record
+            self._record_loaded = True
+            self._cached_index = None
+        elif mode == "r":
+            # The .dist-info directory inside the wheel may use normalized
+            # (lowercase) naming even when the filename does not. Resolve the
+            # actual path case-insensitively.
+            if self.record_path not in self.NameToInfo:
+                name = self._find_name_ignoring_case(self.record_path)
+                if name is None or not name.endswith("/RECORD"):
+                    raise WheelError(f"Missing {self.record_path} file")
+
+                self.dist_info_path = name.rsplit("/RECORD", 1)[0]
+                self.record_path = name
+
+            # Ignore RECORD and any embedded wheel signatures
+            self._record.add(self.record_path, None, b"", None)
+            self._record.add(self.record_path + ".jws", None, b"", None)
+            self._record.add(self.record_path + ".p7s", None, b"", None)
+            if self._index_cache is not None and self._index_key is not None:
+                try:
+                    self._load_record()
+                except (WheelError, ValueError):
+                    pass  # raised again on the first verified read
+                else:
+                    self._index_cache._store(self._index_key, self)
+
+    def _RealGetContents(self) -> None:
+        """Read the central directory into a :class:`_CentralDirectory` if the
+        wheel was opened with ``lazy_index``, or as ZipFile does otherwise.
+
+        Wheels opened for appending always get regular lists of ZipInfo objects,
+        as those are extended when members are written.
+        """
+        if not self._lazy_index:
+            ZipFile._RealGetContents(self)  # type: ignore[attr-defined]
+            return
+
+        fd = _fileno(self.fp)
+        if (
+            self._index_cache is not None
+            and fd is not None
+            and isinstance(self.filename, str)
+        ):
+            self._index_key = self._index_cache._key(self.filename, fd)
+            self._cached_index = self._index_cache._load(self._index_key)
+            if self._cached_index is not None:
+                directory = self._cached_index.directory
+                self.start_dir = directory._start_dir
+                self._comment = self._cached_index.comment
+                self.filelist = directory  # type: ignore[assignment]
+                self.NameToInfo = directory.members  # type: ignore[assignment]
+                return
+
+        directory, self._comment = _read_central_directory(
+            self.fp,  # type: ignore[arg-type]
+            getattr(self, "metadata_encoding", None),
+        )
+        self.start_dir = directory._start_dir
+        self.filelist = directory  # type: ignore[assignment]
+        self.NameToInfo = directory.members  # type: ignore[assignment]
+
+    def namelist(self) -> list[str]:
+        if isinstance(self.filelist, _CentralDirectory):
+            return self.filelist.names.copy()
+
+        return ZipFile.namelist(self)
+
+    def infolist(self) -> list[ZipInfo]:
+        if isinstance(self.filelist, _CentralDirectory):
+            return list(self.filelist)
+
+        return ZipFile.infolist(self)
+
+    def _find_name_ignoring_case(self, name: str) -> str | None:
+        """Look up the actual name of a member, ignoring case differences.
+
+        The lowercase name map is built on first use and reused until members
+        are added to the archive.
+        """
+        if self._lowercase_names is None or self._lowercase_names[0] != len(
+            self.filelist
+        ):
+            lowercase_names: dict[str, str] = {}
+            for member_name in self.NameToInfo:
+                lowercase_names.setdefault(member_name.lower(), member_name)
+
+            self._lowercase_names = len(self.filelist), lowercase_names
+
+        return self._lowercase_names[1].get(name.lower())
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        """Iterate over the names of all members starting with ``prefix``.
+
+        This makes it cheap to list a package subtree (``"pkg/sub/"``), the
+        ``.dist-info`` directory or a ``.data`` scheme directory (such as
+        ``"name-1.0.data/scripts/"``) of a wheel with a large number of members.
+        The names are yielded in sorted order.
+
+        :param prefix: the leading part of the member names to look for
+        """
+        if self._sorted_names is None or self._sorted_names[0] != len(self.filelist):
+            self._sorted_names = len(self.filelist), sorted(self.NameToInfo)
+
+        names = self._sorted_names[1]
+        for index in range(bisect_left(names, prefix), len(names)):
+            if not names[index].startswith(prefix):
+                break
+
+            yield names[index]
+
+    def _load_record(self) -> None:
+        """Fill in the expected hashes by reading them from RECORD.
+
+        This is deferred until the first verified read of a member, so that
+        listing the archive or reading RECORD itself does not pay for it.
+        """
+        if self._record_loaded:
+            return
+
+        with self._lock:
+            if self._record_loaded:
+                return
+
+            checked_algorithms: set[str] = set()
+            directory = (
+                self.filelist if isinstance(self.filelist, _CentralDirectory) else None
+            )
+            with ZipFile.open(self, self.record_path) as record:
+                for line in csv.reader(
+                    TextIOWrapper(record, newline="", encoding="utf-8")
+                ):
+                    path, hash_sum, size = line
+                    if not hash_sum:
+                        continue
+
+                    algorithm, hash_sum = hash_sum.split("=")
+                    if algorithm not in checked_algorithms:
+                        _check_hash_algorithm(algorithm)
+                        checked_algorithms.add(algorithm)
+
+                    # Share the name string with the central directory entry
+                    if directory is not None:
+                        ordinal = directory.index.get(path)
+                        if ordinal is not None:
+                            path = directory.names[ordinal]
+                    elif zinfo := self.NameToInfo.get(path):
+                        path = zinfo.filename
+
+                    try:
+                        file_size = int(size) if size else None
+                    except ValueError:
+                        raise WheelError(
+                            f"Invalid size for '{path}' in RECORD"
+                        ) from None
+
+                    self._record.add(
+                        path,
+                        algorithm,
+                        urlsafe_b64decode(hash_sum.encode("ascii")),
+                        file_size,
+                    )
+
+            self._record_loaded = True
+
+    def _require_record(self, name: str) -> None:
+        """Load RECORD, unless the member is RECORD itself or one of its
+        signatures, which are never hashed.
+
+        Members are not looked up in RECORD before it is fully loaded, as another
+        thread may still be filling it in, or a previous attempt may have failed
+        partway through.
+        """
+        if not self._record_loaded and name not in (
+            self.record_path,
+            self.record_path + ".jws",
+            self.record_path + ".p7s",
+        ):
+            self._load_record()
+
+    def open(
+        self,
+        name_or_info: str | ZipInfo,
+        mode: Literal["r", "w"] = "r",
+        pwd: bytes | None = None,
+    ) -> IO[bytes]:
+        def _update_crc(newdata: bytes) -> None:
+            eof = ef._eof
+            update_crc_orig(newdata)
+            running_hash.update(newdata)
+            if eof:
+                if running_hash.digest() != entry.digest:
+                    raise WheelError(f"Hash mismatch for file '{ef_name}'")
+
+                self._add_verified(entry)
+
+        def _close() -> None:
+            closed = ef.closed
+            try:
+                close_orig()
+            finally:
+                if stats is not None and not closed:
+                    stats._add_member(ef_name, time.perf_counter() - start)
+
+        ef_name = (
+            name_or_info.filename if isinstance(name_or_info, ZipInfo) else name_or_info
+        )
+        if mode == "r" and not ef_name.endswith("/"):
+            self._require_record(ef_name)
+            if ef_name not in self._record:
+                raise WheelError(f"No hash found for file '{ef_name}'")
+
+        stats = self.stats
+        start = time.perf_counter()
+        ef = self._instrument(self._open_member(name_or_info, mode, pwd))
+        if mode == "r" and not ef_name.endswith("/"):
+            entry = self._record[ef_name]
+            if entry.algorithm is not None and not self._is_verified(entry):
+                # Monkey patch the _update_crc method to also check for the hash from
+                # RECORD
+                running_hash = _timed_hash(hashlib.new(entry.algorithm), stats)
+                update_crc_orig, ef._update_crc = ef._update_crc, _update_crc
+
+            if stats is not None:
+                close_orig, ef.close = ef.close, _close
+
+        return ef
+
+    def _open_member(
+        self,
+        name_or_info: str | ZipInfo,
+        mode: Literal["r", "w"] = "r",
+        pwd: bytes | None = None,
+    ) -> IO[bytes]:
+        """Open a member, with a position of its own if reading concurrently."""
+        # ZipFile does not guard its file reference counting with its lock
+        with self._lock:
+            ef = ZipFile.open(self, name_or_info, mode, pwd)
+
+        if mode == "r" and self.concurrent_reads:
+            fd = _fileno(self.fp)
+            if fd is not None:
+                # The local header has been read, so continue from where it ends
+                shared = ef._fileobj
+                ef._fileobj = _PositionalFile(
+                    fd, shared.tell(), shared.close, self._lock, self.stats
+                )
+
+        return ef
+
+    def _instrument(self, ef: IO[bytes]) -> IO[bytes]:
+        """Account for the (de)compression done by a member handle in :attr:`stats`."""
+        if self.stats is not None:
+            if getattr(ef, "_compressor", None) is not None:
+                ef._compressor = _TimedCompressor(ef._compressor, self.stats)
+            if getattr(ef, "_decompressor", None) is not None:
+                ef._decompressor = _TimedDecompressor(ef._decompressor, self.stats)
+
+        return ef
+
+    def read_view(
+        self, name_or_info: str | ZipInfo, buffer: WriteableBuffer | None = None
+    ) -> memoryview:
+        """Return the contents of a member as a :class:`memoryview`.
+
+        For stored members of a wheel opened from a file or a buffer, this is a
+        read-only view of a memory map of the archive or of the buffer, so no copy
+        of the contents is made. The contents are checked against RECORD on first
+        access, and the view is then cached and returned again on later calls.
+        Views remain usable after the wheel is closed, as long as they are
+        referenced.
+
+        Other members are decompressed into ``buffer``, or into a new
+        :class:`bytearray` if no buffer is given, and a view of the part of the
+        buffer holding the contents is returned.
+
+        :param name_or_info: the name or :class:`~zipfile.ZipInfo` of the member
+        :param buffer: a writable buffer, at least as large as the member, to
+            decompress into
+        :raises WheelError: if the contents do not match the hash in RECORD
+        """
+        zinfo = (
+            name_or_info
+            if isinstance(name_or_info, ZipInfo)
+            else self.getinfo(name_or_info)
+        )
+        with self._lock:
+            view = self._views.get(zinfo.filename)
+
+        if view is None:
+            view = self._map_member(zinfo)
+            if view is None:
+                return self._read_into(zinfo, buffer)
+
+            with self._lock:
+                view = self._views.setdefault(zinfo.filename, view)
+
+        return view
+
+    def _map_member(self, zinfo: ZipInfo) -> memoryview | None:
+        """Map a stored member and check its contents.
+
+        :return: a read-only view of the contents, or ``None`` if the member cannot
+            be mapped
+        """
+        if (
+            self.mode != "r"
+            or zinfo.compress_type != ZIP_STORED
+            or zinfo.compress_size != zinfo.file_size
+            or zinfo.flag_bits & 0x01
+        ):
+            return None
+
+        with self._lock:
+            if self._buffer is not None:
+                archive: mmap.mmap | memoryview = self._buffer.toreadonly()
+            else:
+                if self._mmap is None:
+                    fd = _fileno(self.fp)
+                    if fd is None:
+                        return None
+
+                    try:
+                        self._mmap = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+                    except (OSError, ValueError):
+                        return None
+
+                archive = self._mmap
+
+        self._require_record(zinfo.filename)
+        if zinfo.filename not in self._record:
+            raise WheelError(f"No hash found for file '{zinfo.filename}'")
+
+        start = time.perf_counter()
+        offset = self._data_offset(zinfo)
+        view = memoryview(archive)[offset : offset + zinfo.file_size]
+        if len(view) != zinfo.file_size:
+            raise BadZipFile(f"Truncated data for file '{zinfo.filename}'")
+
+        entry = self._record[zinfo.filename]
+        if entry.algorithm is None or self._is_verified(entry):
+            if crc32(view) != zinfo.CRC:
+                raise BadZipFile(f"Bad CRC-32 for file '{zinfo.filename}'")
+        else:
+            hash_ = _timed_hash(hashlib.new(entry.algorithm), self.stats)
+            hash_.update(view)
+            if hash_.digest() != entry.digest:
+                raise WheelError(f"Hash mismatch for file '{zinfo.filename}'")
+
+            self._add_verified(entry)
+
+        if self.stats is not None:
+            self.stats._add_member(zinfo.filename, time.perf_counter() - start)
+
+        return view
+
+    def _read_into(self, zinfo: ZipInfo, buffer: WriteableBuffer | None) -> memoryview:
+        """Decompress a member into a buffer, checking it like :meth:`open` does."""
+        if buffer is None:
+            buffer = bytearray(zinfo.file_size)
+
+        view = memoryview(buffer).cast("B")
+        if len(view) < zinfo.file_size:
+            raise ValueError(
+                f"Buffer of {len(view)} bytes is too small for file "
+                f"'{zinfo.filename}' of {zinfo.file_size} bytes"
+            )
+
+        view = view[: zinfo.file_size]
+        filled = 0
+        with self.open(zinfo) as ef:
+            while filled < len(view):
+                count = ef.readinto(view[filled:])
+                if not count:
+                    raise BadZipFile(f"Truncated data for file '{zinfo.filename}'")
+
+                filled += count
+
+            # Reading past the end makes ZipFile check the CRC and the hash
+            if ef.read(1):
+                raise BadZipFile(f"Bad size for file '{zinfo.filename}'")
+
+        return view
+
+    def _extract_member(
+        self, member: str | ZipInfo, targetpath: StrPath, pwd: bytes | None
+    ) -> str:
+        """Extract a member, copying stored ones in the kernel where possible.
+
+        The contents of a stored member are copied straight from the archive to
+        the target file, which is then hashed to check it against RECORD. Other
+        members are decompressed by :class:`~zipfile.ZipFile` as usual.
+        """
+        if not isinstance(member, ZipInfo):
+            member = self.getinfo(member)
+
+        source = None
+        if (
+            member.compress_type == ZIP_STORED
+            and member.compress_size == member.file_size
+            and not member.is_dir()
+            and not member.flag_bits & 0x01
+        ):
+            self._require_record(member.filename)
+            if member.filename in self._record:
+                entry = self._record[member.filename]
+                if entry.algorithm is not None:
+                    source = self._raw_range(member)
+
+        if source is None:
+            return ZipFile._extract_member(self, member, targetpath, pwd)
+
+        start = time.perf_counter()
+        path = os.path.normpath(os.path.join(targetpath, _member_path(member.filename)))
+        upperdirs = os.path.dirname(path)
+        if upperdirs and not os.path.exists(upperdirs):
+            os.makedirs(upperdirs)
+
+        with open(path, "w+b") as target:
+            copy_start = time.perf_counter()
+            copied = _copy_file_range(source, target.fileno())
+            hash_start = time.perf_counter()
+            if copied != source.size:
+                raise BadZipFile(f"Truncated data for file '{member.filename}'")
+
+            target.seek(0)
+            if self._is_verified(entry):
+                digest = None
+                crc = _file_crc32(target)
+            else:
+                digest = _file_digest(target, entry.algorithm)
+
+        if self.stats is not None:
+            end = time.perf_counter()
+            self.stats._add_io(copied, 0, hash_start - copy_start)
+            if digest is not None:
+                self.stats._add_hash(end - hash_start)
+
+            self.stats._add_member(member.filename, end - start)
+
+        if digest is None:
+            if crc != member.CRC:
+                raise BadZipFile(f"Bad CRC-32 for file '{member.filename}'")
+        elif digest != entry.digest:
+            raise WheelError(f"Hash mismatch for file '{member.filename}'")
+        else:
+            self._add_verified(entry)
+
+        return path
+
+    def verify(self, jobs: int | None = None) -> VerificationReport:
+        """Check every member of the archive against RECORD.
+
+        Members are decompressed and hashed on a thread pool. Besides hash
+        mismatches, this also reports members missing from RECORD and RECORD
+        entries missing from the archive.
+
+        :param jobs: the maximum number of worker threads (defaults to the
+            :class:`~concurrent.futures.ThreadPoolExecutor` default)
+        :return: a report of verified members and any errors found
+        """
+        members = self._members_to_verify()
+        with ThreadPoolExecutor(jobs) as executor:
+            errors = list(executor.map(self._verify_member, members))
+
+        return self._verification_report(members, errors)
+
+    def _members_to_verify(self) -> list[ZipInfo]:
+        """Load RECORD and list the members that :meth:`verify` checks."""
+        self._load_record()
+        return [zinfo for zinfo in self.infolist() if not zinfo.is_dir()]
+
+    def _verification_report(
+        self, members: list[ZipInfo], errors: list[str | None]
+    ) -> VerificationReport:
+        """Assemble the results of :meth:`_verify_member` into a report."""
+        report = VerificationReport()
+        for zinfo, error in zip(members, errors):
+            if error:
+                report.errors[zinfo.filename] = error
+            elif self._record[zinfo.filename].algorithm is None:
+                report.unhashed.append(zinfo.filename)
+            else:
+                report.verified.append(zinfo.filename)
+
+        for entry in self._record:
+            if entry.algorithm is not None and entry.path not in self.NameToInfo:
+                report.errors[entry.path] = (
+                    f"File '{entry.path}' listed in RECORD is missing"
+                )
+
+        return report
+
+    def _verify_member(self, zinfo: ZipInfo) -> str | None:
+        try:
+            entry = self._record[zinfo.filename]
+        except KeyError:
+            return f"No hash found for file '{zinfo.filename}'"
+
+        # Members verified before are still read through the CRC-32 check
+        running_hash = (
+            _timed_hash(hashlib.new(entry.algorithm), self.stats)
+            if entry.algorithm and not self._is_verified(entry)
+            else None
+        )
+        start = time.perf_counter()
+        try:
+            ef = self._instrument(self._open_member(zinfo))
+
+            try:
+                while chunk := ef.read(_CHUNK_SIZE):
+                    if running_hash:
+                        running_hash.update(chunk)
+            finally:
+                with self._lock:
+                    ef.close()
+        except BadZipFile as exc:
+            return str(exc)
+        except (zlib.error, EOFError, NotImplementedError) as exc:
+            return f"Cannot read file '{zinfo.filename}': {exc}"
+        finally:
+            if self.stats is not None:
+                self.stats._add_member(zinfo.filename, time.perf_counter() - start)
+
+        if running_hash:
+            if running_hash.digest() != entry.digest:
+                return f"Hash mismatch for file '{zinfo.filename}'"
+
+            self._add_verified(entry)
+
+        return None
+
+    def _is_verified(self, entry: _RecordEntry) -> bool:
+        """Tell whether the verification cache has a member down as verified."""
+        if self._verification_key is None:
+            return False
+
+        if self._verified is None:
+            with self._lock:
+                if self._verified is None:
+                    assert self._verification_cache
+                    self._verified = self._verification_cache._load(
+                        *self._verification_key
+                    )
+
+        return self._verified.get(entry.path) == entry.hash
+
+    def _add_verified(self, entry: _RecordEntry) -> None:
+        """Record a member whose contents matched RECORD in the verification cache."""
+        if self._verification_key is not None:
+            self._newly_verified.append((entry.path, entry.hash))
+
+    def write_files(self, base_dir: str, jobs: int | None = None) -> None:
+        """Add the contents of a directory tree to the archive.
+
+        Files are added in sorted order, with the contents of the ``.dist-info``
+        directory last. With more than one job, files are compressed and hashed
+        on a thread pool but still added in the same order, producing the same
+        archive as a serial run. Otherwise small files are read ahead on a
+        background thread while earlier ones are being compressed.
+
+        :param base_dir: the root directory of the wheel contents
+        :param jobs: the number of threads to compress files with (defaults to the
+            ``jobs`` value the wheel was opened with)
+        """
+        log.info("creating %r and adding %r to it", self.filename, base_dir)
+        jobs = self.jobs if jobs is None else jobs
+        files = self._collect_files(base_dir)
+        if jobs is not None and jobs > 1:
+            self._write_files_ahead(
+                files,
+                jobs,
+                _PARALLEL_BUDGET,
+                self._compress_file,
+                self._write_compressed,
+            )
+        else:
+            # Files that fit in one chunk are compressed exactly as when streamed
+            self._write_files_ahead(
+                files, 1, _CHUNK_SIZE, self._read_file, self._write_read_file
+            )
+
+    def _collect_files(self, base_dir: str) -> list[_SourceFile]:
+        """List the files to add from a directory tree, in the order to add them.
+
+        The tree is walked like :func:`os.walk` does, without following symbolic
+        links to directories, but the ``stat`` result of each file is gathered
+        along the way and ``SOURCE_DATE_EPOCH`` is only looked up once.
+        """
+        files: list[_SourceFile] = []
+        deferred: list[_SourceFile] = []
+        fixed_date_time = (
+            get_zipinfo_datetime() if "SOURCE_DATE_EPOCH" in os.environ else None
+        )
+        directories = [(base_dir, "")]
+        while directories:
+            path, prefix = directories.pop()
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
+                continue
+
+            subdirectories: list[tuple[str, str]] = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if not entry.is_symlink():
+                        subdirectories.append((entry.path, f"{prefix}{entry.name}/"))
+                elif entry.is_file():
+                    arcname = prefix + entry.name
+                    if arcname == self.record_path:
+                        continue
+
+                    st = entry.stat()
+                    source = _SourceFile(
+                        entry.path,
+                        arcname,
+                        st,
+                        fixed_date_time or _zipinfo_datetime(st.st_mtime),
+                    )
+                    if path.endswith(".dist-info"):
+                        deferred.append(source)
+                    else:
+                        files.append(source)
+
+            # Visit the subdirectories in sorted order, depth first
+            directories.extend(reversed(subdirectories))
+
+        deferred.sort()
+        files.extend(deferred)
+        return files
+
+    def _write_files_ahead(
+        self,
+        files: list[_SourceFile],
+        jobs: int,
+        max_size: int,
+        prepare: Callable[[_SourceFile], _T],
+        commit: Callable[[_T], None],
+    ) -> None:
+        """Add files in order while preparing upcoming ones on a thread pool.
+
+        Files of up to ``max_size`` bytes are passed to ``prepare`` on the pool, in
+        batches to keep the per-task overhead low with many small files, and the
+        results to ``commit`` in their original order, with at most
+        :data:`_PARALLEL_BUDGET` bytes worth of files in flight. Larger files are
+        streamed into the archive on the calling thread when their turn comes.
+        """
+        pending: deque[tuple[list[_SourceFile], int, Future[list[_T]] | None]] = deque()
+        in_flight = 0
+        batch: list[_SourceFile] = []
+        batch_size = 0
+
+        def prepare_batch(batch: list[_SourceFile]) -> list[_T]:
+            return [prepare(source) for source in batch]
+
+        def commit_oldest() -> None:
+            nonlocal in_flight
+            sources, size, future = pending.popleft()
+            if future is None:
+                self._write_file(sources[0])
+            else:
+                in_flight -= size
+                for result in future.result():
+                    commit(result)
+
+        def submit_batch() -> None:
+            nonlocal batch, batch_size, in_flight
+            if batch:
+                while pending and in_flight + batch_size > _PARALLEL_BUDGET:
+                    commit_oldest()
+
+                future = executor.submit(prepare_batch, batch)
+                pending.append((batch, batch_size, future))
+                in_flight += batch_size
+                batch, batch_size = [], 0
+
+        with ThreadPoolExecutor(jobs) as executor:
+            try:
+                for source in files:
+                    size = source.stat.st_size
+                    if size > max_size:
+                        submit_batch()
+                        pending.append(([source], size, None))
+                        continue
+
+                    batch.append(source)
+                    batch_size += size
+                    if len(batch) >= _BATCH_LENGTH or batch_size >= _BATCH_SIZE:
+                        submit_batch()
+
+                submit_batch()
+                while pending:
+                    commit_oldest()
+            finally:
+                for *_, future in pending:
+                    if future is not None:
+                        future.cancel()
+
+    def write(
+        self,
+        filename: str,
+        arcname: str | None = None,
+        compress_type: int | None = None,
+        compresslevel: int | None = None,
+    ) -> None:
+        with open(filename, "rb") as f:
+            st = os.fstat(f.fileno())
+            zinfo = self._file_zipinfo(
+                arcname or filename,
+                st,
+                get_zipinfo_datetime(st.st_mtime),
+                self._probe(f, compress_type),
+                compress_type,
+                compresslevel,
+            )
+            self._write_stream(zinfo, f)
+
+    def _write_file(self, source: _SourceFile) -> None:
+        with open(source.path, "rb") as f:
+            zinfo = self._file_zipinfo(
+                source.arcname, source.stat, source.date_time, self._probe(f)
+            )
+            self._write_stream(zinfo, f)
+
+    def _probe(self, f: IO[bytes], compress_type: int | None = None) -> bytes:
+        """Read the start of a file for the compression policy, if there is one."""
+        if compress_type is not None or self.compression_policy is None:
+            return b""
+
+        head = f.read(_PROBE_SIZE)
+        f.seek(0)
+        return head
+
+    def _file_zipinfo(
+        self,
+        arcname: str,
+        st: os.stat_result,
+        date_time: tuple[int, int, int, int, int, int],
+        head: bytes,
+        compress_type: int | None = None,
+        compresslevel: int | None = None,
+    ) -> ZipInfo:
+        if compress_type is None:
+            if self.compression_policy is not None:
+                compress_type = self.compression_policy(arcname, st.st_size, head)
+            else:
+                compress_type = self.compression
+
+        zinfo = ZipInfo(arcname, date_time=date_time)
+        zinfo.external_attr = (stat.S_IMODE(st.st_mode) | stat.S_IFMT(st.st_mode)) << 16
+        zinfo.compress_type = compress_type
+        zinfo._compresslevel = (
+            self.compresslevel if compresslevel is None else compresslevel
+        )
+        zinfo.file_size = st.st_size
+        return zinfo
+
+    def _read_file(self, source: _SourceFile) -> tuple[ZipInfo, bytes]:
+        """Read a small file ahead of adding it. This runs on a worker thread."""
+        with open(source.path, "rb") as f:
+            data = f.read()
+
+        head = data[:_PROBE_SIZE] if self.compression_policy is not None else b""
+        zinfo = self._file_zipinfo(source.arcname, source.stat, source.date_time, head)
+        return zinfo, data
+
+    def _write_read_file(self, member: tuple[ZipInfo, bytes]) -> None:
+        zinfo, data = member
+        self._write_compressed(self._compress_chunks(zinfo, (data,)))
+
+    def _compress_file(self, source: _SourceFile) -> _CompressedMember:
+        """Read, hash and compress a file in memory, without touching the archive.
+
+        This runs on worker threads. The compressor is fed the same chunks as in
+        :meth:`_write_stream`, so the compressed bytes are identical.
+        """
+        with open(source.path, "rb") as f:
+            zinfo = self._file_zipinfo(
+                source.arcname, source.stat, source.date_time, self._probe(f)
+            )
+            return self._compress_chunks(zinfo, iter(partial(f.read, _CHUNK_SIZE), b""))
+
+    def _compress_chunks(
+        self, zinfo: ZipInfo, data: Iterable[bytes]
+    ) -> _CompressedMember:
+        """Hash and compress the contents of a member in memory."""
+        start = time.perf_counter()
+        compressor = _get_compressor(zinfo.compress_type, zinfo._compresslevel)
+        if compressor and self.stats is not None:
+            compressor = _TimedCompressor(compressor, self.stats)
+
+        hash_ = _timed_hash(self._default_algorithm(), self.stats)
+        chunks: list[bytes] = []
+        crc = size = 0
+        for chunk in data:
+            hash_.update(chunk)
+            crc = crc32(chunk, crc)
+            size += len(chunk)
+            chunks.append(compressor.compress(chunk) if compressor else chunk)
+
+        if compressor:
+            chunks.append(compressor.flush())
+
+        zinfo.CRC = crc
+        zinfo.file_size = size
+        zinfo.compress_size = sum(len(chunk) for chunk in chunks)
+        if self.stats is not None:
+            self.stats._add_member(zinfo.filename, time.perf_counter() - start)
+
+        return _CompressedMember(zinfo, chunks, hash_)
+
+    def _write_compressed(self, member: _CompressedMember) -> None:
+        self._write_raw_timed(member.zinfo, member.chunks)
+        log.info("adding %r", member.zinfo.filename)
+        if member.zinfo.filename != self.record_path:
+            self._add_record_row(
+                member.zinfo.filename,
+                member.hash_.name,
+                member.hash_.digest(),
+                member.zinfo.file_size,
+            )
 
-class WheelError(Exception):
-    pass
+    def _write_raw_timed(
+        self, zinfo: ZipInfo, chunks: Iterable[bytes] | _FileRange
+    ) -> None:
+        """Call :meth:`_write_raw`, accounting for the time taken in :attr:`stats`."""
+        start = time.perf_counter()
+        self._write_raw(zinfo, chunks)
+        if self.stats is not None:
+            self.stats._add_member(zinfo.filename, time.perf_counter() - start)
 
+    def _write_raw(self, zinfo: ZipInfo, chunks: Iterable[bytes] | _FileRange) -> None:
+        """Add a member from already compressed data.
 
-def urlsafe_b64encode(data: bytes) -> bytes:
-    """urlsafe_b64encode without padding"""
-    return base64.urlsafe_b64encode(data).rstrip(b"=")
+        This mirrors what :class:`~zipfile.ZipFile` does when writing a member
+        through :meth:`~zipfile.ZipFile.open`, except that the CRC and sizes in
+        ``zinfo`` are known beforehand, so the local header is written only once.
 
+        :param zinfo: the member to add, with ``CRC``, ``file_size`` and
+            ``compress_size`` filled in
+        :param chunks: the compressed contents of the member, or a range of a file
+            to copy them from in the kernel (see :meth:`_can_write_range`)
+        """
+        if self._writing:
+            raise ValueError(
+                "Can't write to the ZIP file while there is another write handle "
+                "open on it. Close the first handle before opening another."
+            )
 
-def urlsafe_b64decode(data: bytes) -> bytes:
-    """urlsafe_b64decode without padding"""
-    pad = b"=" * (4 - (len(data) & 3))
-    return base64.urlsafe_b64decode(data + pad)
+        # Compressed data includes an end-of-stream (EOS) marker with LZMA
+        zinfo.flag_bits = 0x02 if zinfo.compress_type == ZIP_LZMA else 0x00
+        if not zinfo.external_attr:
+            zinfo.external_attr = 0o600 << 16  # permissions: ?rw-------
 
+        # Use the same criteria as ZipFile.open() to keep the output identical
+        zip64 = (
+            zinfo.file_size * 1.05 > ZIP64_LIMIT or zinfo.compress_size > ZIP64_LIMIT
+        )
+        with self._lock:
+            if self._seekable:
+                self.fp.seek(self.start_dir)
 
-def get_zipinfo_datetime(
-    timestamp: float | None = None,
-) -> tuple[int, int, int, int, int]:
-    # Some applications need reproducible .whl files, but they can't do this without
-    # forcing the timestamp of the individual ZipInfo objects. See issue #143.
-    timestamp = int(os.environ.get("SOURCE_DATE_EPOCH", timestamp or time.time()))
-    timestamp = max(timestamp, MINIMUM_TIMESTAMP)
-    return time.gmtime(timestamp)[0:6]
+            zinfo.header_offset = self.fp.tell()
+            self._writecheck(zinfo)
+            self._didModify = True
+            self.fp.write(zinfo.FileHeader(zip64))
+            if isinstance(chunks, _FileRange):
+                self._write_file_range(zinfo, chunks)
+            else:
+                for chunk in chunks:
+                    self.fp.write(chunk)
 
+            self.start_dir = self.fp.tell()
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
 
-class WheelFile(ZipFile):
-    """A ZipFile derivative class that also reads SHA-256 hashes from
-    .dist-info/RECORD and checks any read files against those.
-    """
+    def _can_write_range(self) -> bool:
+        """Tell whether member data can be copied into the archive in the kernel."""
+        return _ZERO_COPY and self._seekable and _fileno(self.fp) is not None
 
-    _default_algorithm = hashlib.sha256
+    def _write_file_range(self, zinfo: ZipInfo, source: _FileRange) -> None:
+        """Copy member data from another file to the current archive position.
 
-    def __init__(
-        self,
-        file: StrPath,
-        mode: Literal["r", "w", "x", "a"] = "r",
-        compression: int = ZIP_DEFLATED,
-    ):
-        basename = os.path.basename(file)
-        self.parsed_filename = WHEEL_INFO_RE.match(basename)
-        if not basename.endswith(".whl") or self.parsed_filename is None:
-            raise WheelError(f"Bad wheel filename {basename!r}")
+        This must be called with the lock held.
+        """
+        self.fp.flush()
+        position = self.fp.tell()
+        fd = self.fp.fileno()
+        os.lseek(fd, position, os.SEEK_SET)
+        start = time.perf_counter()
+        copied = _copy_file_range(source, fd)
+        if self.stats is not None:
+            self.stats._add_io(0, copied, time.perf_counter() - start)
 
-        ZipFile.__init__(self, file, mode, compression=compression, allowZip64=True)
+        # Bring the buffered file object back in sync with the file descriptor
+        self.fp.seek(position + copied)
+        if copied != source.size:
+            raise WheelError(f"Unexpected end of data for file '{zinfo.filename}'")
 
-        self.dist_info_path = "{}.dist-info".format(
-            self.parsed_filename.group("namever")
-        )
-        self.record_path = self.dist_info_path + "/RECORD"
-        self._file_hashes: dict[str, tuple[None, None] | tuple[int, bytes]] = {}
-        self._file_sizes = {}
-        if mode == "r":
-            # The .dist-info directory inside the wheel may use normalized
-            # (lowercase) naming even when the filename does not. Resolve the
-            # actual path case-insensitively.
-            if self.record_path not in self.namelist():
-                lowered = self.dist_info_path.lower() + "/record"
-                for name in self.namelist():
-                    if name.lower() == lowered:
-                        self.dist_info_path = name.rsplit("/RECORD", 1)[0]
-                        self.record_path = name
-                        break
+    def _write_stream(self, zinfo: ZipInfo, source: IO[bytes]) -> None:
+        """Add a member by reading its contents from ``source`` in chunks.
 
-            # Ignore RECORD and any embedded wheel signatures
-            self._file_hashes[self.record_path] = None, None
-            self._file_hashes[self.record_path + ".jws"] = None, None
-            self._file_hashes[self.record_path + ".p7s"] = None, None
+        The contents are hashed while they are written, so at most one chunk of
+        the member is held in memory at a time.
 
-            # Fill in the expected hashes by reading them from RECORD
-            try:
-                record = self.open(self.record_path)
-            except KeyError:
-                raise WheelError(f"Missing {self.record_path} file") from None
+        :param zinfo: the member to add, with ``file_size`` set to the expected
+            size (used to decide whether ZIP64 extensions are needed)
+        :param source: a binary file object positioned at the start of the contents
+        """
+        self._write_chunks(zinfo, iter(partial(source.read, _CHUNK_SIZE), b""))
 
-            with record:
-                for line in csv.reader(
-                    TextIOWrapper(record, newline="", encoding="utf-8")
-                ):
-                    path, hash_sum, size = line
-                    if not hash_sum:
-                        continue
+    def _write_chunks(
+        self, zinfo: ZipInfo, chunks: Iterable[bytes], force_zip64: bool = False
+    ) -> None:
+        """Add a member from an iterable of uncompressed chunks.
 
-                    algorithm, hash_sum = hash_sum.split("=")
-                    try:
-                        hashlib.new(algorithm)
-                    except ValueError:
-                        raise WheelError(
-                            f"Unsupported hash algorithm: {algorithm}"
-                        ) from None
+        :param zinfo: the member to add, with ``file_size`` set to the expected
+            size (used to decide whether ZIP64 extensions are needed)
+        :param chunks: the contents of the member
+        :param force_zip64: use ZIP64 extensions regardless of ``file_size``
+        """
+        start = time.perf_counter()
+        hash_ = _timed_hash(self._default_algorithm(), self.stats)
+        size = 0
+        with self._instrument(
+            ZipFile.open(self, zinfo, "w", force_zip64=force_zip64)
+        ) as dest:
+            for chunk in chunks:
+                hash_.update(chunk)
+                dest.write(chunk)
+                size += len(chunk)
 
-                    if algorithm.lower() in {"md5", "sha1"}:
-                        raise WheelError(
-                            f"Weak hash algorithm ({algorithm}) is not permitted by "
-                            f"PEP 427"
-                        )
+        if self.stats is not None:
+            self.stats._add_member(zinfo.filename, time.perf_counter() - start)
 
-                    self._file_hashes[path] = (
-                        algorithm,
-                        urlsafe_b64decode(hash_sum.encode("ascii")),
-                    )
+        log.info("adding %r", zinfo.filename)
+        if zinfo.filename != self.record_path:
+            self._add_record_row(zinfo.filename, hash_.name, hash_.digest(), size)
 
-    def open(
+    def write_iter(
         self,
-        name_or_info: str | ZipInfo,
-        mode: Literal["r", "w"] = "r",
-        pwd: bytes | None = None,
-    ) -> IO[bytes]:
-        def _update_crc(newdata: bytes) -> None:
-            eof = ef._eof
-            update_crc_orig(newdata)
-            running_hash.update(newdata)
-            if eof and running_hash.digest() != expected_hash:
-                raise WheelError(f"Hash mismatch for file '{ef_name}'")
+        items: Iterable[tuple[str | ZipInfo, IO[bytes] | Iterable[bytes] | bytes]],
+        buffer_size: int = _PARALLEL_BUDGET,
+    ) -> None:
+        """Add members whose contents are produced incrementally.
 
-        ef_name = (
-            name_or_info.filename if isinstance(name_or_info, ZipInfo) else name_or_info
-        )
-        if (
-            mode == "r"
-            and not ef_name.endswith("/")
-            and ef_name not in self._file_hashes
-        ):
-            raise WheelError(f"No hash found for file '{ef_name}'")
+        Each payload is consumed chunk by chunk while it is compressed into the
+        archive, and the next item is only requested once the previous member has
+        been written, so producers can generate arbitrarily large members without
+        holding them in memory.
 
-        ef = ZipFile.open(self, name_or_info, mode, pwd)
-        if mode == "r" and not ef_name.endswith("/"):
-            algorithm, expected_hash = self._file_hashes[ef_name]
-            if expected_hash is not None:
-                # Monkey patch the _update_crc method to also check for the hash from
-                # RECORD
-                running_hash = hashlib.new(algorithm)
-                update_crc_orig, ef._update_crc = ef._update_crc, _update_crc
+        When the size of a member is not known up front (from the ``file_size``
+        of a :class:`~zipfile.ZipInfo`), up to ``buffer_size`` bytes of it are
+        held back to find out whether it needs ZIP64 extensions. Payloads that
+        turn out to be larger than that are written with ZIP64 extensions.
 
-        return ef
+        :param items: pairs of a member name or :class:`~zipfile.ZipInfo` and its
+            contents, given as a binary file object, an iterable of chunks or
+            :class:`bytes`
+        :param buffer_size: the maximum number of bytes of a member to hold in
+            memory at a time
+        """
+        for zinfo_or_arcname, payload in items:
+            if isinstance(zinfo_or_arcname, str):
+                zinfo = ZipInfo(zinfo_or_arcname, date_time=get_zipinfo_datetime())
+                zinfo.compress_type = self.compression
+                zinfo.external_attr = (0o664 | stat.S_IFREG) << 16
+            else:
+                zinfo = zinfo_or_arcname
 
-    def write_files(self, base_dir: str) -> None:
-        log.info("creating %r and adding %r to it", self.filename, base_dir)
-        deferred: list[tuple[str, str]] = []
-        for root, dirnames, filenames in os.walk(base_dir):
-            # Sort the directory names so that `os.walk` will walk them in a
-            # defined order on the next iteration.
-            dirnames.sort()
-            for name in sorted(filenames):
-                path = os.path.normpath(os.path.join(root, name))
-                if os.path.isfile(path):
-                    arcname = os.path.relpath(path, base_dir).replace(os.path.sep, "/")
-                    if arcname == self.record_path:
-                        pass
-                    elif root.endswith(".dist-info"):
-                        deferred.append((path, arcname))
-                    else:
-                        self.write(path, arcname)
+            if zinfo._compresslevel is None:
+                zinfo._compresslevel = self.compresslevel
 
-        deferred.sort()
-        for path, arcname in deferred:
-            self.write(path, arcname)
+            if isinstance(payload, (bytes, bytearray, memoryview)):
+                chunks: Iterator[bytes] = iter((payload,))
+            elif hasattr(payload, "read"):
+                chunks = iter(partial(payload.read, _CHUNK_SIZE), b"")
+            else:
+                chunks = iter(payload)
 
-    def write(
-        self,
-        filename: str,
-        arcname: str | None = None,
-        compress_type: int | None = None,
-    ) -> None:
-        with open(filename, "rb") as f:
-            st = os.fstat(f.fileno())
-            data = f.read()
+            if zinfo.file_size:
+                self._write_chunks(zinfo, chunks)
+                continue
 
-        zinfo = ZipInfo(
-            arcname or filename, date_time=get_zipinfo_datetime(st.st_mtime)
-        )
-        zinfo.external_attr = (stat.S_IMODE(st.st_mode) | stat.S_IFMT(st.st_mode)) << 16
-        zinfo.compress_type = compress_type or self.compression
-        self.writestr(zinfo, data, compress_type)
+            # Buffer the start of the contents to learn the size of small members
+            head: list[bytes] = []
+            head_size = 0
+            for chunk in chunks:
+                head.append(chunk)
+                head_size += len(chunk)
+                if head_size > buffer_size:
+                    self._write_chunks(zinfo, chain(head, chunks), force_zip64=True)
+                    break
+            else:
+                zinfo.file_size = head_size
+                self._write_chunks(zinfo, head)
 
     def writestr(
         self,
         zinfo_or_arcname: str | ZipInfo,
         data: SizedBuffer | str,
         compress_type: int | None = None,
+        compresslevel: int | None = None,
     ) -> None:
         if isinstance(zinfo_or_arcname, str):
             zinfo_or_arcname = ZipInfo(
@@ -217,10 +2727,14 @@ class WheelFile(ZipFile):
             zinfo_or_arcname.compress_type = self.compression
             zinfo_or_arcname.external_attr = (0o664 | stat.S_IFREG) << 16
 
+        if zinfo_or_arcname._compresslevel is None:
+            zinfo_or_arcname._compresslevel = self.compresslevel
+
         if isinstance(data, str):
             data = data.encode("utf-8")
 
-        ZipFile.writestr(self, zinfo_or_arcname, data, compress_type)
+        start = time.perf_counter()
+        ZipFile.writestr(self, zinfo_or_arcname, data, compress_type, compresslevel)
         fname = (
             zinfo_or_arcname.filename
             if isinstance(zinfo_or_arcname, ZipInfo)
@@ -228,25 +2742,832 @@ class WheelFile(ZipFile):
         )
         log.info("adding %r", fname)
         if fname != self.record_path:
-            hash_ = self._default_algorithm(data)
-            self._file_hashes[fname] = (
-                hash_.name,
-                urlsafe_b64encode(hash_.digest()).decode("ascii"),
+            hash_ = _timed_hash(self._default_algorithm(), self.stats)
+            hash_.update(data)
+            self._add_record_row(fname, hash_.name, hash_.digest(), len(data))
+
+        if self.stats is not None:
+            self.stats._add_member(fname, time.perf_counter() - start)
+
+    def writestr_precompressed(
+        self, zinfo: ZipInfo, data: bytes | Iterable[bytes], record_hash: str
+    ) -> None:
+        """Add a member from data that has already been compressed.
+
+        The data is written as is, without being decompressed or hashed, so this
+        costs little more than the I/O.
+
+        :param zinfo: the member to add, with ``compress_type``, ``CRC``,
+            ``file_size`` and ``compress_size`` describing ``data``
+        :param data: the compressed contents of the member, either as a whole or
+            as an iterable of chunks
+        :param record_hash: the hash of the uncompressed contents, in the
+            ``algorithm=digest`` form used in RECORD
+        """
+        algorithm, _, digest = record_hash.partition("=")
+        _check_hash_algorithm(algorithm)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = (data,)
+
+        zinfo.extra = _strip_zip64_extra(zinfo.extra)
+        self._write_raw_timed(zinfo, data)
+        log.info("adding %r", zinfo.filename)
+        if zinfo.filename != self.record_path:
+            self._add_record_row(
+                zinfo.filename,
+                algorithm,
+                urlsafe_b64decode(digest.encode("ascii")),
+                zinfo.file_size,
+            )
+
+    def copy_member_raw(self, source: WheelFile, zinfo: str | ZipInfo) -> None:
+        """Copy a member from another wheel without recompressing it.
+
+        The compressed bytes, CRC and sizes are copied verbatim, and the hash is
+        carried over from the RECORD of ``source``. The contents are not checked
+        against that hash; use :meth:`verify` on the source for that. Members that
+        RECORD deliberately lists without a hash, such as signatures, are read and
+        written again instead, so that they get one.
+
+        :param source: the wheel to copy from, opened for reading
+        :param zinfo: the name or :class:`~zipfile.ZipInfo` of the member in
+            ``source``
+        :raises WheelError: if RECORD in ``source`` does not list the member
+        """
+        if isinstance(zinfo, str):
+            zinfo = source.getinfo(zinfo)
+
+        if zinfo.flag_bits & 0x01:
+            raise WheelError(f"Cannot copy encrypted file '{zinfo.filename}'")
+
+        source._load_record()
+        if zinfo.filename not in source._record:
+            raise WheelError(f"No hash found for file '{zinfo.filename}'")
+
+        entry = source._record[zinfo.filename]
+        new_zinfo = ZipInfo(zinfo.filename, zinfo.date_time)
+        new_zinfo.compress_type = zinfo.compress_type
+        new_zinfo.comment = zinfo.comment
+        new_zinfo.extra = _strip_zip64_extra(zinfo.extra)
+        new_zinfo.create_system = zinfo.create_system
+        new_zinfo.internal_attr = zinfo.internal_attr
+        new_zinfo.external_attr = zinfo.external_attr
+        if entry.algorithm is None:
+            self.writestr(new_zinfo, source.read(zinfo))
+            return
+
+        new_zinfo.CRC = zinfo.CRC
+        new_zinfo.file_size = zinfo.file_size
+        new_zinfo.compress_size = zinfo.compress_size
+        source_range = source._raw_range(zinfo) if self._can_write_range() else None
+        self._write_raw_timed(
+            new_zinfo, source._iter_raw(zinfo) if source_range is None else source_range
+        )
+        log.info("adding %r", new_zinfo.filename)
+        self._add_record_row(
+            new_zinfo.filename, entry.algorithm, entry.digest, new_zinfo.file_size
+        )
+
+    def _data_offset(self, zinfo: ZipInfo) -> int:
+        """Find where the compressed contents of a member start in the archive.
+
+        The local header is checked the same way as by ``ZipFile.open()``, as the
+        contents are then read without it.
+        """
+        with self._lock:
+            self.fp.seek(zinfo.header_offset)
+            header = self.fp.read(sizeFileHeader)
+            if len(header) != sizeFileHeader:
+                raise BadZipFile("Truncated file header")
+
+            fields = struct.unpack(structFileHeader, header)
+            if fields[0] != stringFileHeader:
+                raise BadZipFile("Bad magic number for file header")
+
+            # The filename and extra field lengths are the last two header fields
+            raw_name = self.fp.read(fields[-2])
+
+        if fields[3] & 0x800:
+            name = raw_name.decode("utf-8")
+        else:
+            name = raw_name.decode(getattr(self, "metadata_encoding", None) or "cp437")
+
+        if name != zinfo.orig_filename:
+            raise BadZipFile(
+                f"File name in directory {zinfo.orig_filename!r} and header "
+                f"{raw_name!r} differ."
             )
-            self._file_sizes[fname] = len(data)
+
+        offset = zinfo.header_offset + sizeFileHeader + fields[-2] + fields[-1]
+        end_offset = getattr(zinfo, "_end_offset", None)
+        if end_offset is not None and offset + zinfo.compress_size > end_offset:
+            raise BadZipFile(
+                f"Overlapped entries: {zinfo.orig_filename!r} (possible zip bomb)"
+            )
+
+        return offset
+
+    def _raw_range(self, zinfo: ZipInfo) -> _FileRange | None:
+        """Locate the compressed contents of a member for copying them in the kernel.
+
+        :return: the range of the archive file holding them, or ``None`` if the
+            archive is not a file that can be copied from that way
+        """
+        fd = _fileno(self.fp) if _ZERO_COPY else None
+        if fd is None:
+            return None
+
+        return _FileRange(fd, self._data_offset(zinfo), zinfo.compress_size)
+
+    def _iter_raw(self, zinfo: ZipInfo) -> Iterator[bytes]:
+        """Iterate over the compressed contents of a member in chunks."""
+        position = self._data_offset(zinfo)
+        remaining = zinfo.compress_size
+        while remaining:
+            with self._lock:
+                self.fp.seek(position)
+                chunk = self.fp.read(min(remaining, _CHUNK_SIZE))
+
+            if not chunk:
+                raise BadZipFile(f"Truncated data for file '{zinfo.filename}'")
+
+            position += len(chunk)
+            remaining -= len(chunk)
+            yield chunk
+
+    def _add_record_row(
+        self, fname: str, algorithm: str, digest: bytes, size: int
+    ) -> None:
+        if self._record_spool is not None:
+            encoded_digest = urlsafe_b64encode(digest).decode("ascii")
+            row = (fname, f"{algorithm}={encoded_digest}", size)
+            if fname in self._record_names:
+                self._record_updates[fname] = row
+            else:
+                self._record_names.add(fname)
+                self._record_writer.writerow(row)
+
+    def _open_record_spool(self) -> None:
+        """Start a temporary file to write RECORD rows to."""
+        self._record_spool = SpooledTemporaryFile(max_size=_RECORD_SPOOL_SIZE)
+        self._record_writer = csv.writer(
+            codecs.getwriter("utf-8")(self._record_spool),
+            delimiter=",",
+            quotechar='"',
+            lineterminator="\n",
+        )
+
+    def _apply_record_updates(self) -> None:
+        """Replace the spooled RECORD rows of members written more than once with
+        their last row, so that RECORD lists each member once, with the hash of
+        the contents it was last written with."""
+        old_spool = self._record_spool
+        assert old_spool is not None
+        self._open_record_spool()
+        old_spool.seek(0)
+        for row in csv.reader(codecs.getreader("utf-8")(old_spool)):
+            self._record_writer.writerow(self._record_updates.get(row[0], row))
+
+        old_spool.close()
+        self._record_updates.clear()
+
+    def close(self) -> None:
+        try:
+            # Write RECORD
+            if self._record_spool is not None and self._record_updates:
+                self._apply_record_updates()
+
+            spool = self._record_spool
+            if self.fp is not None and spool is not None and spool.tell():
+                self._record_writer.writerow((self.record_path, "", ""))
+                zinfo = ZipInfo(self.record_path, date_time=get_zipinfo_datetime())
+                zinfo.compress_type = self.compression
+                zinfo._compresslevel = self.compresslevel
+                zinfo.external_attr = (0o664 | stat.S_IFREG) << 16
+                zinfo.file_size = spool.tell()
+                spool.seek(0)
+                start = time.perf_counter()
+                with self._instrument(ZipFile.open(self, zinfo, "w")) as dest:
+                    shutil.copyfileobj(spool, dest, _CHUNK_SIZE)
+
+                if self.stats is not None:
+                    self.stats._add_member(zinfo.filename, time.perf_counter() - start)
+
+                log.info("adding %r", self.record_path)
+        finally:
+            if self._record_spool is not None:
+                self._record_spool.close()
+                self._record_spool = None
+
+            self._views.clear()
+            if self._mmap is not None:
+                try:
+                    self._mmap.close()
+                except BufferError:
+                    pass  # views handed out keep the mapping alive until released
+
+                self._mmap = None
+
+            if self._newly_verified:
+                assert self._verification_cache and self._verification_key
+                self._verification_cache._add(
+                    *self._verification_key, self._newly_verified
+                )
+                self._newly_verified = []
+
+            ZipFile.close(self)
+
+
+class _PooledWheel:
+    """A wheel kept open by :class:`WheelFilePool`, and how many are using it."""
+
+    __slots__ = ("identity", "pooled", "users", "wheel")
+
+    def __init__(self, wheel: WheelFile, identity: str):
+        self.wheel = wheel
+        self.identity = identity
+        self.users = 1
+        self.pooled = True
+
+
+class WheelFilePool:
+    """A bounded pool of wheels kept open for reading.
+
+    Services that read members from many wheels can borrow them from the pool
+    with :meth:`open` instead of opening them on every request, which saves
+    reading the central directory and RECORD again for wheels used recently. Up to
+    ``max_open`` wheels are kept open, and the least recently used ones are closed
+    to make room for others.
+
+    Wheels are reference counted while borrowed and are never closed under a
+    user: when all of them are in use, the pool holds more than ``max_open`` until
+    some are given back. A wheel that was modified or replaced since it was
+    opened is opened afresh. The pool can be shared by several threads; pass
+    ``concurrent_reads=True`` for threads reading from the same wheel not to wait
+    for each other.
+
+    :param max_open: the most wheels to keep open
+    :param kwargs: other arguments to pass to :class:`WheelFile`, such as
+        ``index_cache`` or ``concurrent_reads``
+    :ivar hits: the number of times a wheel was borrowed while already open
+    :ivar misses: the number of times a wheel had to be opened
+    :ivar evictions: the number of wheels closed to make room for others or
+        because they changed
+    """
+
+    def __init__(self, max_open: int = 64, **kwargs: object):
+        if max_open < 1:
+            raise ValueError("max_open must be at least 1")
+
+        self.max_open = max_open
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._wheels: OrderedDict[str, _PooledWheel] = OrderedDict()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._wheels)
+
+    def __enter__(self) -> WheelFilePool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @contextmanager
+    def open(self, path: StrPath) -> Iterator[WheelFile]:
+        """Borrow a wheel for reading, opening it if it is not open yet.
+
+        The wheel must not be closed by the caller, and must not be used after
+        leaving the ``with`` block.
+        """
+        pooled = self._acquire(os.path.abspath(path))
+        try:
+            yield pooled.wheel
+        finally:
+            self._release(pooled)
 
     def close(self) -> None:
-        # Write RECORD
-        if self.fp is not None and self.mode == "w" and self._file_hashes:
-            data = StringIO()
-            writer = csv.writer(data, delimiter=",", quotechar='"', lineterminator="\n")
-            writer.writerows(
-                (
-                    (fname, algorithm + "=" + hash_, self._file_sizes[fname])
-                    for fname, (algorithm, hash_) in self._file_hashes.items()
+        """Close the wheels that are not in use, and the others once given back.
+
+        The pool cannot be used afterwards.
+        """
+        with self._lock:
+            self._closed = True
+            unused = [
+                self._detach(path)
+                for path, pooled in list(self._wheels.items())
+                if not pooled.users
+            ]
+            for pooled in self._wheels.values():
+                pooled.pooled = False
+
+            self._wheels.clear()
+
+        for pooled in unused:
+            pooled.wheel.close()
+
+    def _acquire(self, path: str) -> _PooledWheel:
+        identity = _stat_identity(os.stat(path))
+        stale = None
+        with self._lock:
+            if self._closed:
+                raise WheelError("The pool is closed")
+
+            pooled = self._wheels.get(path)
+            if pooled is not None:
+                if pooled.identity == identity:
+                    self.hits += 1
+                    pooled.users += 1
+                    self._wheels.move_to_end(path)
+                    return pooled
+
+                self.evictions += 1
+                stale = self._detach(path)
+
+            self.misses += 1
+
+        if stale is not None and not stale.users:
+            stale.wheel.close()
+
+        # Opened without holding the lock, so that other wheels can be borrowed
+        # in the meantime
+        pooled = _PooledWheel(WheelFile(path, **self._kwargs), identity)  # type: ignore[arg-type]
+        evicted: list[_PooledWheel] = []
+        with self._lock:
+            if self._closed or path in self._wheels:
+                # The pool was closed, or another thread opened the wheel first, so
+                # this copy is closed once given back
+                pooled.pooled = False
+            else:
+                self._wheels[path] = pooled
+                evicted = self._evict()
+
+        for unused in evicted:
+            unused.wheel.close()
+
+        return pooled
+
+    def _release(self, pooled: _PooledWheel) -> None:
+        with self._lock:
+            pooled.users -= 1
+            evicted = self._evict() if pooled.pooled else []
+
+        if not pooled.pooled and not pooled.users:
+            pooled.wheel.close()
+
+        for unused in evicted:
+            unused.wheel.close()
+
+    def _detach(self, path: str) -> _PooledWheel:
+        """Take a wheel out of the pool, to be closed once no longer in use."""
+        pooled = self._wheels.pop(path)
+        pooled.pooled = False
+        return pooled
+
+    def _evict(self) -> list[_PooledWheel]:
+        """Take the least recently used wheels not in use out of the pool, until
+        there are no more than ``max_open`` of them or all are in use."""
+        evicted: list[_PooledWheel] = []
+        excess = len(self._wheels) - self.max_open
+        if excess > 0:
+            for path, pooled in list(self._wheels.items()):
+                if not pooled.users:
+                    evicted.append(self._detach(path))
+                    if len(evicted) == excess:
+                        break
+
+        self.evictions += len(evicted)
+        return evicted
+
+
+class WheelStreamReader:
+    """Read and verify a wheel sequentially, without seeking.
+
+    This walks the local file headers of a wheel arriving over a pipe or socket,
+    decompressing and hashing each member as it goes, so the wheel never has to
+    be stored first. As the hashes in RECORD and the central directory only come
+    at the end of the archive, everything is reconciled by :meth:`verify`:
+    members against RECORD, and the local headers against the central directory
+    that a random access reader such as :class:`WheelFile` would rely on.
+
+    Members are hashed with SHA-256, so RECORD entries using other algorithms are
+    reported as errors. Only stored and deflated members are supported.
+
+    :param fileobj: a binary file object positioned at the start of the wheel
+    :param stats: a :class:`WheelStats` instance to collect performance counters in
+    """
+
+    _default_algorithm = hashlib.sha256
+
+    def __init__(self, fileobj: IO[bytes], stats: WheelStats | None = None):
+        self.stats = stats
+        self._fp = fileobj if stats is None else _TimedFile(fileobj, stats)
+        self._buffer = bytearray()
+        self._offset = 0
+        self._members: dict[str, _StreamedMember] = {}
+        self._record: bytes | None = None
+        self.record_path: str | None = None
+        self._central_directory_reached = False
+
+    @property
+    def dist_info_path(self) -> str | None:
+        """The path of the ``.dist-info`` directory, once RECORD has been read."""
+        return self.record_path.rsplit("/", 1)[0] if self.record_path else None
+
+    def _fill(self, size: int) -> bool:
+        """Make sure that at least ``size`` bytes are buffered, unless at EOF."""
+        while len(self._buffer) < size:
+            data = self._fp.read(max(size - len(self._buffer), _CHUNK_SIZE))
+            if not data:
+                return False
+
+            self._buffer += data
+
+        return True
+
+    def _read(self, size: int) -> bytes:
+        if not self._fill(size):
+            raise BadZipFile("Unexpected end of wheel data")
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._offset += size
+        return data
+
+    def _read_chunk(self, limit: int = _CHUNK_SIZE) -> bytes:
+        if not self._buffer and not self._fill(1):
+            raise BadZipFile("Unexpected end of wheel data")
+
+        data = bytes(self._buffer[:limit])
+        del self._buffer[: len(data)]
+        self._offset += len(data)
+        return data
+
+    def _unread(self, data: bytes) -> None:
+        self._buffer[:0] = data
+        self._offset -= len(data)
+
+    def _skip(self, size: int) -> None:
+        while size:
+            size -= len(self._read_chunk(min(size, _CHUNK_SIZE)))
+
+    def __iter__(self) -> Iterator[tuple[ZipInfo, Iterator[bytes]]]:
+        """Iterate over the members of the wheel as they arrive.
+
+        Each member is yielded as its :class:`~zipfile.ZipInfo`, built from the
+        local header, and an iterator over its decompressed contents. Any contents
+        not consumed before advancing to the next member are still hashed.
+        Attributes only found in the central directory, such as permissions, are
+        not known until :meth:`verify` has been called.
+        """
+        while not self._central_directory_reached:
+            signature = self._read(4)
+            if signature != stringFileHeader:
+                self._unread(signature)
+                self._central_directory_reached = True
+                break
+
+            member = self._read_header()
+            chunks = self._iter_member(member)
+            yield member.zinfo, chunks
+            for _ in chunks:
+                pass
+
+    def _read_header(self) -> _StreamedMember:
+        """Read a local file header, after its signature."""
+        header_offset = self._offset - 4
+        fields = struct.unpack(structFileHeader, stringFileHeader + self._read(26))
+        (
+            flag_bits,
+            compress_type,
+            dos_time,
+            dos_date,
+            crc,
+            compress_size,
+            file_size,
+            name_length,
+            extra_length,
+        ) = fields[3:]
+        raw_name = self._read(name_length)
+        extra = self._read(extra_length)
+        filename = raw_name.decode("utf-8" if flag_bits & 0x800 else "cp437")
+        if flag_bits & 0x01:
+            raise WheelError(f"Encrypted file '{filename}' is not supported")
+
+        if compress_type not in (ZIP_STORED, ZIP_DEFLATED):
+            raise WheelError(
+                f"Unsupported compression method {compress_type} for file '{filename}'"
+            )
+
+        if filename in self._members:
+            raise WheelError(f"Duplicate file '{filename}' in wheel")
+
+        zip64 = _zip64_extra(extra)
+        if zip64 is not None:
+            if file_size == 0xFFFFFFFF and zip64:
+                file_size = zip64.pop(0)
+            if compress_size == 0xFFFFFFFF and zip64:
+                compress_size = zip64.pop(0)
+
+        zinfo = ZipInfo(
+            filename,
+            (
+                (dos_date >> 9) + 1980,
+                (dos_date >> 5) & 0xF,
+                dos_date & 0x1F,
+                dos_time >> 11,
+                (dos_time >> 5) & 0x3F,
+                (dos_time & 0x1F) * 2,
+            ),
+        )
+        zinfo.flag_bits = flag_bits
+        zinfo.compress_type = compress_type
+        zinfo.header_offset = header_offset
+        zinfo.extra = extra
+        zinfo.CRC = crc
+        zinfo.compress_size = compress_size
+        zinfo.file_size = file_size
+        member = _StreamedMember(zinfo, zip64 is not None)
+        self._members[filename] = member
+        return member
+
+    def _iter_member(self, member: _StreamedMember) -> Iterator[bytes]:
+        start = time.perf_counter()
+        zinfo = member.zinfo
+        hash_ = _timed_hash(self._default_algorithm(), self.stats)
+        is_record = _is_record_path(zinfo.filename)
+        record_chunks: list[bytes] = []
+        crc = size = 0
+        if zinfo.compress_type == ZIP_DEFLATED:
+            chunks = self._iter_deflated(member)
+        elif zinfo.flag_bits & 0x08:
+            chunks = self._iter_stored_with_descriptor(member)
+        else:
+            chunks = self._iter_stored(member)
+
+        for chunk in chunks:
+            hash_.update(chunk)
+            crc = crc32(chunk, crc)
+            size += len(chunk)
+            if is_record:
+                record_chunks.append(chunk)
+
+            yield chunk
+
+        if zinfo.flag_bits & 0x08 and zinfo.compress_type == ZIP_DEFLATED:
+            self._read_descriptor(member)
+
+        member.digest = hash_.digest()
+        if self.stats is not None:
+            self.stats._add_member(zinfo.filename, time.perf_counter() - start)
+
+        if not member.error and (crc != zinfo.CRC or size != zinfo.file_size):
+            member.error = f"Bad CRC-32 or size for file '{zinfo.filename}'"
+
+        if is_record:
+            if self.record_path is not None:
+                raise WheelError("Multiple .dist-info directories found in wheel")
+
+            self.record_path = zinfo.filename
+            self._record = b"".join(record_chunks)
+
+    def _iter_stored(self, member: _StreamedMember) -> Iterator[bytes]:
+        remaining = member.zinfo.compress_size
+        while remaining:
+            chunk = self._read_chunk(min(remaining, _CHUNK_SIZE))
+            remaining -= len(chunk)
+            yield chunk
+
+    def _iter_deflated(self, member: _StreamedMember) -> Iterator[bytes]:
+        decompressor = zlib.decompressobj(-15)
+        if self.stats is not None:
+            decompressor = _TimedDecompressor(decompressor, self.stats)  # type: ignore[assignment]
+
+        known_size = not member.zinfo.flag_bits & 0x08
+        remaining = member.zinfo.compress_size
+        consumed = 0
+        while not decompressor.eof:
+            if known_size and not remaining:
+                raise BadZipFile(f"Truncated data for file '{member.zinfo.filename}'")
+
+            chunk = self._read_chunk(
+                min(remaining, _CHUNK_SIZE) if known_size else _CHUNK_SIZE
+            )
+            remaining -= len(chunk)
+            consumed += len(chunk)
+            try:
+                data = decompressor.decompress(chunk)
+            except zlib.error as exc:
+                message = (
+                    f"Bad compressed data for file '{member.zinfo.filename}': {exc}"
+                )
+                if not known_size:
+                    # The end of the member cannot be found without decompressing it
+                    raise BadZipFile(message) from None
+
+                # Skip to the next member, whose position is known
+                member.error = message
+                self._skip(remaining)
+                return
+
+            if data:
+                yield data
+
+        if known_size:
+            if remaining or decompressor.unused_data:
+                member.error = f"Bad compressed data for file '{member.zinfo.filename}'"
+                self._skip(remaining)
+        else:
+            self._unread(decompressor.unused_data)
+            member.zinfo.compress_size = consumed - len(decompressor.unused_data)
+
+    def _iter_stored_with_descriptor(self, member: _StreamedMember) -> Iterator[bytes]:
+        # Without a size in the header, the end of the data can only be found by
+        # looking for a data descriptor that matches the data preceding it
+        descriptor_size = 20 if member.zip64 else 12
+        crc = size = 0
+        pending = bytearray()
+        while True:
+            index = pending.find(_DD_SIGNATURE)
+            while index >= 0 and index + 4 + descriptor_size <= len(pending):
+                expected_crc, compress_size, file_size = struct.unpack(
+                    "<LQQ" if member.zip64 else "<LLL",
+                    pending[index + 4 : index + 4 + descriptor_size],
+                )
+                if (
+                    compress_size == file_size == size + index
+                    and crc32(pending[:index], crc) == expected_crc
+                ):
+                    if index:
+                        yield bytes(pending[:index])
+
+                    self._unread(bytes(pending[index + 4 + descriptor_size :]))
+                    member.zinfo.CRC = expected_crc
+                    member.zinfo.compress_size = compress_size
+                    member.zinfo.file_size = file_size
+                    return
+
+                index = pending.find(_DD_SIGNATURE, index + 1)
+
+            # Pass on everything that cannot be the start of the data descriptor
+            keep = len(pending) - 3 if index < 0 else index
+            if keep > 0:
+                chunk = bytes(pending[:keep])
+                del pending[:keep]
+                crc = crc32(chunk, crc)
+                size += len(chunk)
+                yield chunk
+
+            pending += self._read_chunk()
+
+    def _read_descriptor(self, member: _StreamedMember) -> None:
+        signature = self._read(4)
+        if signature != _DD_SIGNATURE:
+            self._unread(signature)
+
+        crc, compress_size, file_size = struct.unpack(
+            "<LQQ" if member.zip64 else "<LLL", self._read(20 if member.zip64 else 12)
+        )
+        if compress_size != member.zinfo.compress_size:
+            member.error = f"Bad data descriptor for file '{member.zinfo.filename}'"
+
+        member.zinfo.CRC = crc
+        member.zinfo.file_size = file_size
+
+    def verify(self) -> VerificationReport:
+        """Read the rest of the wheel and check all of it.
+
+        Any members not yet read are hashed first. Then the central directory is
+        read and compared against the local headers, and the hashes of all members
+        against RECORD. The :class:`~zipfile.ZipInfo` objects of the members are
+        updated with the attributes from the central directory.
+
+        If the wheel data is so damaged that the rest of it cannot be read, the
+        report has that error under an empty name, and nothing else is checked.
+
+        :return: a report of verified members and any errors found
+        """
+        report = VerificationReport()
+        try:
+            for _ in self:
+                pass
+
+            self._check_central_directory(report)
+        except BadZipFile as exc:
+            report.errors[""] = str(exc)
+            return report
+
+        if self._record is None:
+            raise WheelError("Missing .dist-info/RECORD file")
+
+        hashes: dict[str, tuple[str, str]] = {}
+        for row in csv.reader(StringIO(self._record.decode("utf-8"))):
+            if not row:
+                continue
+
+            if len(row) < 2:
+                report.errors[self.record_path] = (
+                    f"Malformed RECORD row for file '{row[0]}'"
+                )
+                continue
+
+            path, hash_sum = row[0], row[1]
+            if hash_sum:
+                algorithm, _, digest = hash_sum.partition("=")
+                _check_hash_algorithm(algorithm)
+                hashes[path] = algorithm, digest
+
+        unhashed = {
+            self.record_path,
+            f"{self.record_path}.jws",
+            f"{self.record_path}.p7s",
+        }
+        for name, member in self._members.items():
+            if name.endswith("/") or name in report.errors:
+                continue
+            elif member.error:
+                report.errors[name] = member.error
+            elif name in unhashed:
+                report.unhashed.append(name)
+            elif name not in hashes:
+                report.errors[name] = f"No hash found for file '{name}'"
+            elif hashes[name][0] != self._default_algorithm().name:
+                report.errors[name] = (
+                    f"Hash algorithm {hashes[name][0]} of file '{name}' cannot be "
+                    f"checked while streaming"
                 )
+            elif urlsafe_b64decode(hashes[name][1].encode("ascii")) != member.digest:
+                report.errors[name] = f"Hash mismatch for file '{name}'"
+            else:
+                report.verified.append(name)
+
+        for path in hashes:
+            if path not in self._members:
+                report.errors[path] = f"File '{path}' listed in RECORD is missing"
+
+        return report
+
+    def _check_central_directory(self, report: VerificationReport) -> None:
+        # The central directory and end records are small, so read them whole
+        data = bytes(self._buffer) + self._fp.read()
+        self._buffer.clear()
+        position = 0
+        seen: set[str] = set()
+        while data[position : position + 4] == stringCentralDir:
+            fields = struct.unpack(
+                structCentralDir, data[position : position + sizeCentralDir]
+            )
+            flag_bits, compress_type = fields[5], fields[6]
+            crc, compress_size, file_size = fields[9:12]
+            name_length, extra_length, comment_length = fields[12:15]
+            external_attr, header_offset = fields[17], fields[18]
+            position += sizeCentralDir
+            name = data[position : position + name_length].decode(
+                "utf-8" if flag_bits & 0x800 else "cp437"
             )
-            writer.writerow((format(self.record_path), "", ""))
-            self.writestr(self.record_path, data.getvalue())
+            position += name_length
+            zip64 = _zip64_extra(data[position : position + extra_length]) or []
+            position += extra_length + comment_length
+            if file_size == 0xFFFFFFFF and zip64:
+                file_size = zip64.pop(0)
+            if compress_size == 0xFFFFFFFF and zip64:
+                compress_size = zip64.pop(0)
+            if header_offset == 0xFFFFFFFF and zip64:
+                header_offset = zip64.pop(0)
+
+            name = ZipInfo(name).filename
+            member = self._members.get(name)
+            if member is None:
+                report.errors[name] = (
+                    f"File '{name}' in the central directory has no local header"
+                )
+                continue
+
+            seen.add(name)
+            zinfo = member.zinfo
+            if (
+                header_offset != zinfo.header_offset
+                or compress_type != zinfo.compress_type
+                or crc != zinfo.CRC
+                or compress_size != zinfo.compress_size
+                or file_size != zinfo.file_size
+            ):
+                member.error = (
+                    f"Central directory entry for file '{name}' does not match its "
+                    f"local header"
+                )
+
+            zinfo.create_system = fields[2]
+            zinfo.internal_attr = fields[16]
+            zinfo.external_attr = external_attr
+
+        if stringEndArchive not in data[position:]:
+            raise BadZipFile("Missing end of central directory record")
 
-        ZipFile.close(self)
+        for name, member in self._members.items():
+            if name not in seen and not member.error:
+                member.error = f"File '{name}' is missing from the central directory"
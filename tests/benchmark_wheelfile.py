@@ -0,0 +1,151 @@
+"""Benchmark opening, building and unpacking wheels.
+
+The ``open`` benchmark opens a wheel with a very large number of members. It
+compares :class:`zipfile.ZipFile`, which makes a ZipInfo object for every member
+up front, against :class:`~wheel.wheelfile.WheelFile`, which does the same by
+default and only makes them for the members that are accessed when opened with
+``lazy_index=True``.
+
+The ``compression`` benchmark builds a wheel from a mix of small source files
+and already compressed payloads, and unpacks it again, once with every member
+deflated and once with :class:`~wheel.wheelfile.ContentAwareCompression`.
+
+It is not collected by pytest; run it directly::
+
+    python tests/benchmark_wheelfile.py [open] [--members COUNT]
+    python tests/benchmark_wheelfile.py compression [--payload-mib SIZE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from zipfile import ZIP_STORED, ZipFile
+
+from wheel.wheelfile import ContentAwareCompression, WheelFile
+
+
+def build_wheel(path: str, count: int) -> None:
+    with ZipFile(path, "w", ZIP_STORED) as zf:
+        for i in range(count):
+            zf.writestr(f"huge/sub{i % 1000}/module{i}.py", b"")
+
+        zf.writestr("huge-1.0.dist-info/RECORD", b"")
+
+
+def measure(open_wheel: Callable[[], ZipFile], repeat: int) -> tuple[float, int]:
+    """Return the best time taken to open the wheel and look up one member, and
+    the memory held by the open wheel."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        with open_wheel() as zf:
+            zf.getinfo("huge/sub0/module0.py")
+
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        zf = open_wheel()
+        zf.getinfo("huge/sub0/module0.py")
+        memory = tracemalloc.get_traced_memory()[0]
+        zf.close()
+    finally:
+        tracemalloc.stop()
+
+    return best, memory
+
+
+def benchmark_open(tmp_dir: str, args: argparse.Namespace) -> None:
+    path = os.path.join(tmp_dir, "huge-1.0-py3-none-any.whl")
+    print(f"Building a wheel with {args.members:,} members...")
+    build_wheel(path, args.members)
+    for label, open_wheel in [
+        ("ZipFile", lambda: ZipFile(path)),
+        ("WheelFile", lambda: WheelFile(path)),
+        ("lazy index", lambda: WheelFile(path, lazy_index=True)),
+    ]:
+        seconds, memory = measure(open_wheel, args.repeat)
+        print(f"{label:10} {seconds * 1000:10.1f} ms {memory / 2**20:10.1f} MiB")
+
+
+def make_build_dir(path: str, payload_size: int) -> None:
+    """Fill a build directory with random payloads in already compressed formats
+    and a few thousand small, compressible source files."""
+    for i in range(3000):
+        module_path = os.path.join(path, "mixed", f"sub{i % 30}", f"module{i}.py")
+        os.makedirs(os.path.dirname(module_path), exist_ok=True)
+        with open(module_path, "w") as f:
+            f.write(f"def function_{i}():\n    return {i}\n" * (i % 50 + 1))
+
+    payload_dir = os.path.join(path, "mixed", "data")
+    os.makedirs(payload_dir)
+    for i, extension in enumerate([".npz", ".png", ".gz", ".jpg"] * 4):
+        with open(os.path.join(payload_dir, f"payload{i}{extension}"), "wb") as f:
+            f.write(os.urandom(payload_size // 16))
+
+    dist_info = os.path.join(path, "mixed-1.0.dist-info")
+    os.makedirs(dist_info)
+    with open(os.path.join(dist_info, "METADATA"), "w") as f:
+        f.write("Metadata-Version: 2.1\nName: mixed\nVersion: 1.0\n")
+
+
+def benchmark_compression(tmp_dir: str, args: argparse.Namespace) -> None:
+    build_dir = os.path.join(tmp_dir, "build")
+    print(f"Creating a build directory with {args.payload_mib} MiB of payloads...")
+    make_build_dir(build_dir, args.payload_mib * 2**20)
+    path = os.path.join(tmp_dir, "mixed-1.0-py3-none-any.whl")
+    unpack_dir = os.path.join(tmp_dir, "unpacked")
+    print(f"{'':10} {'build':>10} {'unpack':>10} {'size':>10}")
+    for label, policy in [
+        ("deflate", None),
+        ("auto", ContentAwareCompression()),
+    ]:
+        build_time = unpack_time = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            with WheelFile(path, "w", compression_policy=policy) as wf:
+                wf.write_files(build_dir)
+
+            build_time = min(build_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            with WheelFile(path) as wf:
+                wf.extractall(unpack_dir)
+
+            unpack_time = min(unpack_time, time.perf_counter() - start)
+            shutil.rmtree(unpack_dir)
+
+        size = os.path.getsize(path) / 2**20
+        print(
+            f"{label:10} {build_time * 1000:7.1f} ms {unpack_time * 1000:7.1f} ms "
+            f"{size:6.1f} MiB"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "benchmark", nargs="?", choices=["open", "compression"], default="open"
+    )
+    parser.add_argument("--members", type=int, default=500_000)
+    parser.add_argument("--payload-mib", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.benchmark == "open":
+            benchmark_open(tmp_dir, args)
+        else:
+            benchmark_compression(tmp_dir, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -324,3 +324,35 @@ def test_convert_rejects_egginfo_path_traversal(tmp_path: Path) -> None:
 
     assert outside.exists() is False or not any(outside.iterdir())
     assert dest_dir.is_dir() and not any(dest_dir.iterdir())
+
+
+@pytest.mark.parametrize("directory", [False, True], ids=["file", "directory"])
+def test_convert_sizes_known(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, directory: bool
+) -> None:
+    # Members are passed on with their sizes, so they are neither held back in
+    # memory nor written with ZIP64 extensions for lack of a size
+    write_iter = WheelFile.write_iter
+    monkeypatch.setattr(
+        WheelFile,
+        "write_iter",
+        lambda self, items: write_iter(self, items, buffer_size=0),
+    )
+    egg_path = tmp_path / "Sampledist-1.0.0.egg"
+    with zipfile.ZipFile(egg_path, "w") as zf:
+        zf.writestr("sampledist/__init__.py", b"print('hello')\n" * 100)
+        zf.writestr("EGG-INFO/PKG-INFO", PKG_INFO)
+
+    if directory:
+        with zipfile.ZipFile(egg_path) as zf:
+            egg_path.unlink()
+            zf.extractall(egg_path)
+
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    convert([str(egg_path)], str(dest_dir), verbose=False)
+    with WheelFile(dest_dir / "sampledist-1.0.0-py2.py3-none-any.whl") as wf:
+        zinfo = wf.getinfo("sampledist/__init__.py")
+        assert zinfo.file_size == 1500
+        assert zinfo.extract_version < zipfile.ZIP64_VERSION
+        assert wf.verify().ok
@@ -10,7 +10,9 @@ from io import StringIO
 from unittest.mock import patch
 
 import pytest
+from conftest import RangeHTTPServer
 
+from wheel._commands import main
 from wheel._commands.info import info
 
 from .util import run_command
@@ -198,3 +200,22 @@ def test_info_short_verbose_flag() -> None:
     # Should include file listing like --verbose
     assert "File listing:" in output
     assert "hello/hello.py" in output
+
+
+def test_info_url(http_server: RangeHTTPServer) -> None:
+    """Test that a wheel can be read over HTTP with range requests."""
+    shutil.copy(TESTWHEEL_PATH, http_server.directory)
+    output = run_command("info", f"{http_server.url}/{TESTWHEEL_NAME}")
+    assert output == run_command("info", TESTWHEEL_PATH)
+    assert http_server.requests == ["bytes=-65536"]
+
+
+def test_info_url_not_found(
+    http_server: RangeHTTPServer,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    url = f"{http_server.url}/{TESTWHEEL_NAME}"
+    monkeypatch.setattr(sys, "argv", ["wheel", "info", url])
+    assert main() == 1
+    assert capsys.readouterr().err == "HTTP Error 404: File not found\n"
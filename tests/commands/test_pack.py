@@ -6,13 +6,15 @@ import sys
 from email.generator import BytesGenerator
 from email.message import Message
 from email.parser import BytesParser
-from io import StringIO
-from zipfile import Path, ZipFile
+from io import BytesIO, StringIO, TextIOWrapper
+from zipfile import ZIP_DEFLATED, ZIP_STORED, Path, ZipFile
 
 import pytest
+from conftest import UnseekableBytesIO
 from pytest import TempPathFactory
 
 from wheel._commands import main
+from wheel.wheelfile import WheelFile
 
 from .util import run_command
 
@@ -224,3 +226,74 @@ def test_pack_local_version_rejects_invalid(
 
     assert returncode == 1
     assert "!invalid" in stderr.getvalue()
+
+
+@pytest.mark.parametrize(
+    "compression, expected",
+    [
+        pytest.param("stored", {ZIP_STORED}, id="stored"),
+        pytest.param("deflated", {ZIP_DEFLATED}, id="deflated"),
+        pytest.param("auto", {ZIP_STORED, ZIP_DEFLATED}, id="auto"),
+    ],
+)
+def test_pack_compression(
+    tmp_path_factory: TempPathFactory, compression: str, expected: set[int]
+) -> None:
+    unpack_dir = tmp_path_factory.mktemp("wheeldir")
+    with ZipFile(TESTWHEEL_PATH) as zf:
+        zf.extractall(unpack_dir)
+
+    unpack_dir.joinpath("hello", "image.png").write_bytes(b"\x89PNG" * 100)
+    dest_dir = tmp_path_factory.mktemp("dist")
+    run_command("pack", "--compression", compression, "-d", dest_dir, unpack_dir)
+    with ZipFile(dest_dir / TESTWHEEL_NAME) as zf:
+        assert {info.compress_type for info in zf.infolist()} == expected
+        if compression == "auto":
+            assert zf.getinfo("hello/image.png").compress_type == ZIP_STORED
+            assert zf.getinfo("hello/hello.py").compress_type == ZIP_STORED
+            assert zf.getinfo("hello.pyd").compress_type == ZIP_DEFLATED
+
+
+def test_pack_compression_level(tmp_path_factory: TempPathFactory) -> None:
+    unpack_dir = tmp_path_factory.mktemp("wheeldir")
+    with ZipFile(TESTWHEEL_PATH) as zf:
+        zf.extractall(unpack_dir)
+
+    dest_dir = tmp_path_factory.mktemp("dist")
+    run_command("pack", "--compression-level", "0", "-d", dest_dir, unpack_dir)
+    with ZipFile(dest_dir / TESTWHEEL_NAME) as zf:
+        info = zf.getinfo("hello.pyd")
+        assert info.compress_type == ZIP_DEFLATED
+        assert info.compress_size > info.file_size
+
+
+def test_pack_to_stdout(
+    tmp_path_factory: TempPathFactory, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    unpack_dir = tmp_path_factory.mktemp("wheeldir")
+    with ZipFile(TESTWHEEL_PATH) as zf:
+        zf.extractall(unpack_dir)
+
+    stdout = TextIOWrapper(UnseekableBytesIO())
+    stderr = StringIO()
+    monkeypatch.setattr(sys, "argv", ["wheel", "pack", str(unpack_dir), "-o", "-"])
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(sys, "stderr", stderr)
+    assert main() == 0
+    assert stderr.getvalue() == f"Repacking wheel as {TESTWHEEL_NAME}...OK\n"
+    assert not os.listdir()
+    wheel_data = BytesIO(stdout.buffer.getvalue())
+    with WheelFile(wheel_data, filename=TESTWHEEL_NAME) as wf:
+        assert wf.verify().ok
+
+
+def test_pack_to_file(tmp_path_factory: TempPathFactory) -> None:
+    unpack_dir = tmp_path_factory.mktemp("wheeldir")
+    with ZipFile(TESTWHEEL_PATH) as zf:
+        zf.extractall(unpack_dir)
+
+    output = tmp_path_factory.mktemp("dist") / "custom.whl"
+    run_command("pack", "-o", output, unpack_dir)
+    with WheelFile(output, filename=TESTWHEEL_NAME) as wf:
+        assert wf.verify().ok
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import shutil
+import stat
 import struct
+import sys
 import zipfile
+from io import BytesIO, StringIO, TextIOWrapper
 from pathlib import Path
 from subprocess import CalledProcessError
 from zipfile import ZIP_STORED, ZipFile, ZipInfo
 
 import pytest
+from conftest import UnseekableBytesIO
 
+from wheel._commands import main
 from wheel._commands.tags import tags
 from wheel.wheelfile import WheelFile
 
@@ -148,6 +153,78 @@ def test_invalid_build_tag(wheelpath: Path, build_tag: str, error: str) -> None:
     assert f"error: argument --build: {error}" in exc.stderr
 
 
+def test_invalid_compression_level(wheelpath: Path) -> None:
+    with pytest.raises(CalledProcessError) as exc_info:
+        run_command(
+            "tags", "--compression-level", "10", wheelpath, catch_systemexit=False
+        )
+
+    exc = exc_info.value
+    assert exc.returncode == 2
+    assert (
+        "error: argument --compression-level: compression level must be an integer "
+        "from 0 to 9" in exc.stderr
+    )
+
+
+@pytest.mark.parametrize(
+    ("compression_level", "recompressed"),
+    [pytest.param(None, False, id="copied"), pytest.param(9, True, id="recompressed")],
+)
+def test_members_copied_raw(
+    tmp_path: Path, compression_level: int | None, recompressed: bool
+) -> None:
+    wheelpath = tmp_path / "test-1.0-py3-none-any.whl"
+    with WheelFile(wheelpath, "w", compresslevel=1) as wheel_file:
+        wheel_file.writestr(
+            "test/module.py",
+            "".join(f"value_{i % 97} = {i * 7 % 1013}\n" for i in range(5000)),
+        )
+        wheel_file.writestr(
+            "test-1.0.dist-info/WHEEL",
+            "Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+
+    newname = tags(
+        str(wheelpath),
+        platform_tags="linux_x86_64",
+        compression_level=compression_level,
+    )
+    with ZipFile(wheelpath) as original, WheelFile(tmp_path / newname) as retagged:
+        assert retagged.verify().ok
+        original_size = original.getinfo("test/module.py").compress_size
+        retagged_size = retagged.getinfo("test/module.py").compress_size
+        assert (retagged_size < original_size) is recompressed
+
+
+@pytest.mark.parametrize(
+    "compression_level", [pytest.param(None, id="copied"), pytest.param(9, id="9")]
+)
+def test_signed_wheel(tmp_path: Path, compression_level: int | None) -> None:
+    # RECORD lists the signature without a hash
+    wheelpath = tmp_path / "test-1.0-py3-none-any.whl"
+    with ZipFile(wheelpath, "w") as zf:
+        zf.writestr(
+            "test-1.0.dist-info/WHEEL",
+            "Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+        )
+        zf.writestr("test-1.0.dist-info/RECORD.jws", '{"signatures": []}')
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "test-1.0.dist-info/WHEEL,sha256=JCVX9z8V-js2aV5qmQR2E3fiCs-Yu3vPO91cCBmO1JM,"
+            "59\ntest-1.0.dist-info/RECORD.jws,,\ntest-1.0.dist-info/RECORD,,\n",
+        )
+
+    newname = tags(
+        str(wheelpath),
+        platform_tags="linux_x86_64",
+        compression_level=compression_level,
+    )
+    with WheelFile(tmp_path / newname) as retagged:
+        assert retagged.verify().ok
+        assert retagged.read("test-1.0.dist-info/RECORD.jws") == b'{"signatures": []}'
+
+
 def test_multi_tags(wheelpath: Path) -> None:
     newname = run_command(
         "tags",
@@ -287,3 +364,73 @@ def test_retag_does_not_leak_zip64_into_local_headers(
                 )
 
     output_file.unlink()
+
+
+def test_tags_to_stdout(wheelpath: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    stdout = TextIOWrapper(UnseekableBytesIO())
+    stderr = StringIO()
+    argv = ["wheel", "tags", "--python-tag", "py3", "-o", "-", str(wheelpath)]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(sys, "stderr", stderr)
+    assert main() == 0
+
+    newname = TESTWHEEL_NAME.replace("py2.py3", "py3")
+    assert stderr.getvalue() == newname + "\n"
+    assert sorted(path.name for path in wheelpath.parent.iterdir()) == [TESTWHEEL_NAME]
+    wheel_data = BytesIO(stdout.buffer.getvalue())
+    with WheelFile(wheel_data, filename=newname) as f:
+        assert f.verify().ok
+        assert b"Tag: py3-none-any" in f.read(f.dist_info_path + "/WHEEL")
+
+
+def test_tags_output_unchanged(wheelpath: Path) -> None:
+    # With an explicit output, the wheel is written even if no tags change
+    output = wheelpath.parent / "copy.whl"
+    newname = run_command("tags", "-o", output, wheelpath).strip()
+    assert newname == TESTWHEEL_NAME
+    with WheelFile(output, filename=TESTWHEEL_NAME) as f:
+        assert f.verify().ok
+
+
+def test_tags_output_multiple_wheels(wheelpath: Path) -> None:
+    stderr = StringIO()
+    argv = ["wheel", "tags", "-o", "-", str(wheelpath), str(wheelpath)]
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(sys, "argv", argv)
+        m.setattr(sys, "stderr", stderr)
+        assert main() == 1
+
+    assert stderr.getvalue() == "--output can only be used with a single wheel\n"
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        pytest.param(["--python-tag", "py3"], id="retag"),
+        pytest.param(["--remove", "--python-tag", "py3"], id="remove"),
+        pytest.param(["--compression-level", "9"], id="recompress"),
+    ],
+)
+def test_tags_output_is_input(wheelpath: Path, args: list[str]) -> None:
+    # The wheel is only replaced once it has been read, and is never removed
+    wheelpath.chmod(0o640)
+    output = wheelpath.parent / "." / wheelpath.name
+    newname = run_command("tags", *args, "-o", output, wheelpath).strip()
+    assert sorted(path.name for path in wheelpath.parent.iterdir()) == [TESTWHEEL_NAME]
+    assert stat.S_IMODE(wheelpath.stat().st_mode) == 0o640
+    with WheelFile(wheelpath, filename=newname) as f, ZipFile(TESTWHEEL_PATH) as zf:
+        assert f.verify().ok
+        assert f.read("hello.pyd") == zf.read("hello.pyd")
+
+
+def test_tags_recompress_unchanged(wheelpath: Path) -> None:
+    # A compression level alone rewrites the wheel in place
+    newname = run_command("tags", "--compression-level", "0", wheelpath).strip()
+    assert newname == TESTWHEEL_NAME
+    assert sorted(path.name for path in wheelpath.parent.iterdir()) == [TESTWHEEL_NAME]
+    with WheelFile(wheelpath) as f:
+        assert f.verify().ok
+        metadata = f.getinfo("test-1.0.dist-info/METADATA")
+        assert metadata.compress_type == zipfile.ZIP_DEFLATED
+        assert metadata.compress_size > metadata.file_size
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import platform
 import stat
+import sys
+from io import TextIOWrapper
 from pathlib import Path
+from zipfile import ZipFile
 
 import pytest
 from pytest import TempPathFactory
 
-from wheel.wheelfile import WheelFile
+from wheel._commands.unpack import unpack
+from wheel.wheelfile import WheelError, WheelFile
 
 from .util import run_command
 
@@ -77,3 +81,66 @@ def test_chmod_outside_unpack_tree(tmp_path_factory: TempPathFactory) -> None:
 
     assert system_file.read_bytes() == b"important data"
     assert stat.S_IMODE(system_file.stat().st_mode) == 0o755
+
+
+def test_unpack_stdin(
+    tmp_path_factory: TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wheel_path = tmp_path_factory.mktemp("build") / "test-1.0-py3-none-any.whl"
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr(
+            "test-1.0.dist-info/METADATA",
+            "Metadata-Version: 2.4\nName: test\nVersion: 1.0\n",
+        )
+        wf.writestr("package/module.py", "print('hello world')\n")
+        wf.writestr("../../outside.py", "")
+
+    extract_path = tmp_path_factory.mktemp("extract")
+    with wheel_path.open("rb") as f:
+        monkeypatch.setattr(sys, "stdin", TextIOWrapper(f))
+        output = run_command("unpack", "--dest", extract_path, "-")
+
+    assert output == f"Unpacking to: {extract_path / 'test-1.0'}...OK\n"
+    assert sorted(path.name for path in extract_path.iterdir()) == ["test-1.0"]
+    extract_path /= "test-1.0"
+    assert extract_path.joinpath("package", "module.py").read_text("utf-8") == (
+        "print('hello world')\n"
+    )
+    assert extract_path.joinpath("outside.py").exists()
+    if platform.system() != "Windows":
+        assert stat.S_IMODE(extract_path.joinpath("outside.py").stat().st_mode) == 0o664
+
+
+def test_unpack_stdin_bad_hash(
+    tmp_path_factory: TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wheel_path = tmp_path_factory.mktemp("build") / "test-1.0-py3-none-any.whl"
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello.py", 'print("Hello, w0rld!")\n')
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n",
+        )
+
+    extract_path = tmp_path_factory.mktemp("extract")
+    with wheel_path.open("rb") as f:
+        monkeypatch.setattr(sys, "stdin", TextIOWrapper(f))
+        with pytest.raises(WheelError, match="^Hash mismatch for file 'hello.py'$"):
+            unpack("-", str(extract_path))
+
+    assert not list(extract_path.iterdir())
+
+
+def test_unpack_stdin_missing_dest(
+    tmp_path_factory: TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    wheel_path = tmp_path_factory.mktemp("build") / "test-1.0-py3-none-any.whl"
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("package/module.py", "print('hello world')\n")
+
+    extract_path = tmp_path_factory.mktemp("extract") / "missing" / "dir"
+    with wheel_path.open("rb") as f:
+        monkeypatch.setattr(sys, "stdin", TextIOWrapper(f))
+        unpack("-", str(extract_path))
+
+    assert extract_path.joinpath("test-1.0", "package", "module.py").exists()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import sys
+from io import BytesIO, TextIOWrapper
+from pathlib import Path
+from subprocess import CalledProcessError
+from zipfile import ZipFile
+
+import pytest
+
+from wheel._commands import main
+from wheel._commands.verify import verify
+from wheel.wheelfile import WheelError, WheelFile
+
+from .util import run_command
+
+TESTWHEEL_NAME = "test-1.0-py2.py3-none-any.whl"
+TESTWHEEL_PATH = Path(__file__).parent.parent / "testdata" / TESTWHEEL_NAME
+
+
+def test_verify() -> None:
+    output = run_command("verify", "--jobs", "2", TESTWHEEL_PATH)
+    assert output == f"Verifying {TESTWHEEL_PATH}...OK\n"
+
+
+def test_verify_bad_hash(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    wheel_path = tmp_path / "test-1.0-py3-none-any.whl"
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello.py", 'print("Hello, w0rld!")\n')
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n"
+            "missing.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n",
+        )
+
+    with pytest.raises(WheelError, match="^One or more wheels failed verification$"):
+        verify([str(wheel_path)])
+
+    assert capsys.readouterr().out == (
+        f"Verifying {wheel_path}...FAILED\n"
+        "  Hash mismatch for file 'hello.py'\n"
+        "  File 'missing.py' listed in RECORD is missing\n"
+    )
+
+
+def test_verify_invalid_jobs() -> None:
+    with pytest.raises(CalledProcessError) as exc_info:
+        run_command("verify", "-j", "0", TESTWHEEL_PATH, catch_systemexit=False)
+
+    exc = exc_info.value
+    assert exc.returncode == 2
+    assert "error: argument --jobs/-j: number of jobs must be at least 1" in exc.stderr
+
+
+def test_verify_stdin(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with TESTWHEEL_PATH.open("rb") as f:
+        monkeypatch.setattr(sys, "stdin", TextIOWrapper(f))
+        verify(["-"])
+
+    assert capsys.readouterr().out == "Verifying <stdin>...OK\n"
+
+
+def test_verify_stdin_bad_hash(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    wheel_path = tmp_path / "test-1.0-py3-none-any.whl"
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello.py", 'print("Hello, w0rld!")\n')
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n",
+        )
+
+    with wheel_path.open("rb") as f:
+        monkeypatch.setattr(sys, "stdin", TextIOWrapper(f))
+        with pytest.raises(WheelError):
+            verify(["-"])
+
+    assert capsys.readouterr().out == (
+        "Verifying <stdin>...FAILED\n  Hash mismatch for file 'hello.py'\n"
+    )
+
+
+def test_verify_stats(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(
+        sys, "argv", ["wheel", "verify", "--stats", str(TESTWHEEL_PATH)]
+    )
+    assert main() == 0
+    out, err = capsys.readouterr()
+    assert out == f"Verifying {TESTWHEEL_PATH}...OK\n"
+    assert "Bytes decompressed:" in err
+    assert "Slowest members:\n" in err
+
+
+def test_verify_cache(tmp_path: Path) -> None:
+    cache_path = tmp_path / "verified.db"
+    for _ in range(2):
+        output = run_command("verify", "--verify-cache", cache_path, TESTWHEEL_PATH)
+        assert output == f"Verifying {TESTWHEEL_PATH}...OK\n"
+
+    output = run_command(
+        "verify", "--verify-cache", cache_path, "--reverify", TESTWHEEL_PATH
+    )
+    assert output == f"Verifying {TESTWHEEL_PATH}...OK\n"
+
+
+def test_reverify_without_cache() -> None:
+    with pytest.raises(CalledProcessError) as exc_info:
+        run_command("verify", "--reverify", TESTWHEEL_PATH, catch_systemexit=False)
+
+    exc = exc_info.value
+    assert exc.returncode == 2
+    assert "error: --reverify requires --verify-cache" in exc.stderr
+
+
+def test_verify_broken_wheels(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # Wheels that cannot be read are reported, and the others still verified
+    not_zip = tmp_path / "notzip-1.0-py3-none-any.whl"
+    not_zip.write_bytes(b"not a zip file")
+    missing = tmp_path / "missing-1.0-py3-none-any.whl"
+    corrupt = tmp_path / "test-1.0-py3-none-any.whl"
+    with WheelFile(corrupt, "w") as wf:
+        wf.writestr("hello.py", "print('hello')\n" * 100)
+
+    with ZipFile(corrupt) as zf:
+        offset = zf.getinfo("hello.py").header_offset + 30 + len("hello.py")
+
+    with corrupt.open("r+b") as f:
+        f.seek(offset)
+        f.write(b"\xff" * 8)
+
+    paths = [str(not_zip), str(missing), str(corrupt), str(TESTWHEEL_PATH)]
+    with pytest.raises(WheelError, match="^One or more wheels failed verification$"):
+        verify(paths)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == f"Verifying {not_zip}...FAILED"
+    assert lines[1] == "  File is not a zip file"
+    assert lines[2] == f"Verifying {missing}...FAILED"
+    assert lines[3].startswith("  [Errno 2] No such file or directory")
+    assert lines[4] == f"Verifying {corrupt}...FAILED"
+    assert lines[5].startswith("  Cannot read file 'hello.py': Error -3")
+    assert lines[6] == f"Verifying {TESTWHEEL_PATH}...OK"
+
+
+def test_verify_stdin_truncated(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(
+        sys, "stdin", TextIOWrapper(BytesIO(TESTWHEEL_PATH.read_bytes()[:1000]))
+    )
+    with pytest.raises(WheelError):
+        verify(["-"])
+
+    assert capsys.readouterr().out == (
+        "Verifying <stdin>...FAILED\n  Unexpected end of wheel data\n"
+    )
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections.abc import Iterator
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+class UnseekableBytesIO(BytesIO):
+    """An in-memory stand-in for a pipe."""
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        raise OSError("Illegal seek")
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Serves files from the server's directory, honouring ``Range`` headers."""
+
+    server: RangeHTTPServer
+
+    def do_GET(self) -> None:
+        byte_range = self.headers.get("Range")
+        self.server.requests.append(byte_range)
+        match = _RANGE_RE.fullmatch(byte_range or "")
+        path = self.translate_path(self.path)
+        if not self.server.ranges or match is None or not os.path.isfile(path):
+            super().do_GET()
+            return
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        start, end = match.groups()
+        if not start:
+            start = max(len(data) - int(end), 0)
+            end = len(data) - 1
+        else:
+            start = int(start)
+            end = min(int(end), len(data) - 1) if end else len(data) - 1
+
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self.wfile.write(data[start : end + 1])
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class RangeHTTPServer(ThreadingHTTPServer):
+    def __init__(self, directory: str) -> None:
+        super().__init__(
+            ("127.0.0.1", 0), partial(RangeRequestHandler, directory=directory)
+        )
+        self.directory = directory
+        self.requests: list[str | None] = []
+        self.ranges = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture
+def http_server(tmp_path_factory: pytest.TempPathFactory) -> Iterator[RangeHTTPServer]:
+    """An HTTP server on localhost serving files from a temporary directory, with
+    support for range requests that can be turned off through ``ranges``."""
+    server = RangeHTTPServer(str(tmp_path_factory.mktemp("www")))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
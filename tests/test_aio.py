@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from zipfile import ZipFile, ZipInfo
+
+import pytest
+from pytest import MonkeyPatch, TempPathFactory
+
+from wheel.aio import AsyncWheelFile
+from wheel.wheelfile import WheelError, WheelFile
+
+
+@pytest.fixture
+def wheel_path(tmp_path: Path) -> Path:
+    path = tmp_path / "test-1.0-py3-none-any.whl"
+    with WheelFile(path, "w") as wf:
+        for i in range(200):
+            wf.writestr(f"test/module{i}.py", f"print({i})\n" * 100)
+
+    return path
+
+
+def test_read(wheel_path: Path) -> None:
+    async def main() -> None:
+        async with AsyncWheelFile(wheel_path, limit=2) as wf:
+            contents = await asyncio.gather(
+                *(wf.read(f"test/module{i}.py") for i in range(20))
+            )
+            assert contents == [f"print({i})\n".encode() * 100 for i in range(20)]
+
+            async with await wf.open("test/module1.py") as member:
+                assert await member.read(9) == b"print(1)\n"
+                assert len(await member.read()) == 891
+
+            assert member.closed
+            assert wf.wheel.parsed_filename.group("name") == "test"
+
+        with pytest.raises(WheelError, match="^The wheel is not open$"):
+            await wf.read("test/module1.py")
+
+    asyncio.run(main())
+
+
+def test_read_hash_mismatch(tmp_path: Path) -> None:
+    wheel_path = tmp_path / "test-1.0-py3-none-any.whl"
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello.py", 'print("Hello, w0rld!")\n')
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n",
+        )
+
+    async def main() -> None:
+        async with AsyncWheelFile(wheel_path) as wf:
+            with pytest.raises(WheelError, match="^Hash mismatch for file 'hello.py'$"):
+                await wf.read("hello.py")
+
+            report = await wf.verify()
+            assert report.errors == {"hello.py": "Hash mismatch for file 'hello.py'"}
+
+    asyncio.run(main())
+
+
+def test_limit(wheel_path: Path, monkeypatch: MonkeyPatch) -> None:
+    running = peak = 0
+    lock = threading.Lock()
+    read = WheelFile.read
+
+    def counting_read(self: WheelFile, name: str) -> bytes:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+
+        try:
+            return read(self, name)
+        finally:
+            with lock:
+                running -= 1
+
+    monkeypatch.setattr(WheelFile, "read", counting_read)
+
+    async def main() -> None:
+        async with AsyncWheelFile(wheel_path, limit=3) as wf:
+            await asyncio.gather(*(wf.read(f"test/module{i}.py") for i in range(200)))
+
+    asyncio.run(main())
+    assert 1 <= peak <= 3
+
+    with pytest.raises(ValueError, match="^limit must be at least 1$"):
+        AsyncWheelFile(wheel_path, limit=0)
+
+
+def test_verify(wheel_path: Path) -> None:
+    async def main() -> None:
+        async with AsyncWheelFile(wheel_path) as wf:
+            report = await wf.verify()
+
+        assert report.ok
+        assert report.verified == [f"test/module{i}.py" for i in range(200)]
+        assert report.unhashed == ["test-1.0.dist-info/RECORD"]
+
+    asyncio.run(main())
+
+
+def test_verify_cancel(wheel_path: Path, monkeypatch: MonkeyPatch) -> None:
+    started = threading.Event()
+    release = threading.Event()
+    verified: list[str] = []
+    verify_member = WheelFile._verify_member
+
+    def blocking_verify_member(self: WheelFile, zinfo: ZipInfo) -> str | None:
+        started.set()
+        release.wait()
+        verified.append(zinfo.filename)
+        return verify_member(self, zinfo)
+
+    monkeypatch.setattr(WheelFile, "_verify_member", blocking_verify_member)
+
+    async def main() -> None:
+        async with AsyncWheelFile(wheel_path, limit=1) as wf:
+            task = asyncio.ensure_future(wf.verify())
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+
+            # The queued batches are dropped before the running one can finish
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            release.set()
+
+    asyncio.run(main())
+
+    assert verified == [f"test/module{i}.py" for i in range(64)]
+
+
+def test_extract(wheel_path: Path, tmp_path: Path) -> None:
+    async def main() -> None:
+        async with AsyncWheelFile(wheel_path) as wf:
+            path = await wf.extract("test/module3.py", tmp_path / "one")
+            assert Path(path).read_text() == "print(3)\n" * 100
+
+            await wf.extractall(tmp_path / "all")
+
+    asyncio.run(main())
+    with WheelFile(wheel_path) as wf:
+        for name in wf.namelist():
+            assert tmp_path.joinpath("all", name).read_bytes() == wf.read(name)
+
+
+@pytest.mark.parametrize("budget", [1024 * 1024, 50000], ids=["small", "tiny"])
+def test_write_files(
+    tmp_path_factory: TempPathFactory, monkeypatch: MonkeyPatch, budget: int
+) -> None:
+    # Files larger than the budget are streamed in between compressed ones
+    monkeypatch.setattr("wheel.aio._PARALLEL_BUDGET", budget)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "315576060")
+    build_dir = tmp_path_factory.mktemp("build")
+    build_dir.joinpath("test-1.0.dist-info").mkdir()
+    build_dir.joinpath("test-1.0.dist-info", "METADATA").write_text("Name: test\n")
+    for i in range(20):
+        path = build_dir.joinpath("pkg", f"sub{i % 3}", f"module{i}.py")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"print('%d')\n" % i * (i * 400))
+
+    build_dir.joinpath("pkg", "random.bin").write_bytes(os.urandom(60000))
+
+    dist_dir = tmp_path_factory.mktemp("dist")
+    sync_path = dist_dir / "sync" / "test-1.0-py3-none-any.whl"
+    async_path = dist_dir / "async" / "test-1.0-py3-none-any.whl"
+    sync_path.parent.mkdir()
+    async_path.parent.mkdir()
+    with WheelFile(sync_path, "w") as wf:
+        wf.write_files(str(build_dir))
+
+    async def main() -> None:
+        async with AsyncWheelFile(async_path, "w") as wf:
+            await wf.write_files(str(build_dir))
+
+    asyncio.run(main())
+    assert async_path.read_bytes() == sync_path.read_bytes()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+from conftest import RangeHTTPServer
+
+from wheel._http import HTTPRangeReader
+from wheel.wheelfile import WheelFile
+
+TESTWHEEL_NAME = "test-1.0-py2.py3-none-any.whl"
+TESTWHEEL_PATH = Path(__file__).parent / "testdata" / TESTWHEEL_NAME
+
+
+@pytest.fixture
+def large_wheel(http_server: RangeHTTPServer) -> tuple[str, bytes]:
+    """A wheel with a large payload ahead of its .dist-info members, served over
+    HTTP. Returns the URL and the wheel contents."""
+    path = os.path.join(http_server.directory, "big-1.0-py3-none-any.whl")
+    with WheelFile(path, "w") as wf:
+        wf.writestr("big/data.bin", os.urandom(1024 * 1024))
+        wf.writestr("big-1.0.dist-info/METADATA", "Name: big\nVersion: 1.0\n")
+        wf.writestr("big-1.0.dist-info/WHEEL", "Wheel-Version: 1.0\n")
+
+    with open(path, "rb") as f:
+        return f"{http_server.url}/{os.path.basename(path)}", f.read()
+
+
+def test_read(http_server: RangeHTTPServer, large_wheel: tuple[str, bytes]) -> None:
+    url, data = large_wheel
+    with HTTPRangeReader(url, block_size=4096, cache_blocks=4) as reader:
+        assert reader.name == "big-1.0-py3-none-any.whl"
+        assert reader.size == len(data)
+        assert reader.seek(-100, os.SEEK_END) == len(data) - 100
+        assert reader.read() == data[-100:]
+        assert reader.requests == 1
+
+        # A read spanning several blocks is fetched with a single request
+        reader.seek(1000)
+        assert reader.read(20000) == data[1000:21000]
+        assert reader.tell() == 21000
+        assert reader.requests == 2
+
+        # Only the most recently used blocks are kept
+        reader.seek(0)
+        assert reader.read(10) == data[:10]
+        assert reader.requests == 3
+        assert reader.read(10) == data[10:20]
+        assert reader.requests == 3
+
+        reader.seek(len(data) + 10)
+        assert reader.read() == b""
+        with pytest.raises(OSError, match="Negative seek position -1"):
+            reader.seek(-1)
+
+    assert http_server.requests[0] == "bytes=-4096"
+    assert http_server.requests[2] == "bytes=0-4095"
+
+
+def test_read_wheel(
+    http_server: RangeHTTPServer, large_wheel: tuple[str, bytes]
+) -> None:
+    url, data = large_wheel
+    with HTTPRangeReader(url) as reader, WheelFile(reader) as wf:
+        assert wf.read("big-1.0.dist-info/METADATA") == b"Name: big\nVersion: 1.0\n"
+        assert wf.read("big-1.0.dist-info/WHEEL") == b"Wheel-Version: 1.0\n"
+        assert reader.requests == 1
+
+        # Reading the payload fetches its local header, then the rest of it
+        assert len(wf.read("big/data.bin")) == 1024 * 1024
+        assert reader.requests == 3
+
+    assert len(http_server.requests) == 3
+
+
+def test_read_without_ranges(
+    http_server: RangeHTTPServer, large_wheel: tuple[str, bytes]
+) -> None:
+    url, data = large_wheel
+    http_server.ranges = False
+    with HTTPRangeReader(url, block_size=4096) as reader:
+        assert reader.size == len(data)
+        with ZipFile(reader) as zf:
+            assert zf.read("big-1.0.dist-info/WHEEL") == b"Wheel-Version: 1.0\n"
+
+        assert reader.requests == 1
+
+
+def test_small_file(http_server: RangeHTTPServer) -> None:
+    shutil.copy(TESTWHEEL_PATH, http_server.directory)
+    with HTTPRangeReader(f"{http_server.url}/{TESTWHEEL_NAME}") as reader:
+        assert reader.read() == TESTWHEEL_PATH.read_bytes()
+        assert reader.requests == 1
+
+
+def test_not_found(http_server: RangeHTTPServer) -> None:
+    with pytest.raises(OSError, match="404"):
+        HTTPRangeReader(f"{http_server.url}/missing-1.0-py3-none-any.whl")
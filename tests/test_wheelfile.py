@@ -1,14 +1,38 @@
 from __future__ import annotations
 
+import csv
+import errno
+import gc
+import hashlib
+import os
 import stat
+import struct
 import sys
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
 from pathlib import Path
-from zipfile import ZIP_DEFLATED, ZipFile
+from zipfile import ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile, ZipInfo
 
 import pytest
+from conftest import UnseekableBytesIO
 from pytest import MonkeyPatch, TempPathFactory
 
-from wheel.wheelfile import WheelError, WheelFile
+from wheel import wheelfile
+from wheel.wheelfile import (
+    ContentAwareCompression,
+    VerificationCache,
+    WheelError,
+    WheelFile,
+    WheelFilePool,
+    WheelIndexCache,
+    WheelStats,
+    WheelStreamReader,
+    urlsafe_b64decode,
+    urlsafe_b64encode,
+)
 
 
 @pytest.fixture
@@ -54,6 +78,22 @@ def test_missing_record(wheel_path: Path) -> None:
     exc.match("^Missing test-1.0.dist-info/RECORD file$")
 
 
+@pytest.mark.parametrize("name", ["test-1.0-py3-none-any.whl", "bad.whl"])
+def test_open_failure_cleanup(
+    tmp_path: Path, monkeypatch: MonkeyPatch, name: str
+) -> None:
+    # Closing a half-initialized wheel must not mask the original error
+    unraisable: list[object] = []
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+    path = tmp_path / name
+    path.write_bytes(b"not a zip file")
+    with pytest.raises((BadZipFile, WheelError)):
+        WheelFile(path)
+
+    gc.collect()
+    assert unraisable == []
+
+
 def test_mixed_case_dist_info(tmp_path: Path) -> None:
     """Regression test: wheel filename has uppercase but .dist-info dir is lowercase.
 
@@ -81,6 +121,271 @@ def test_mixed_case_dist_info(tmp_path: Path) -> None:
         assert wf.record_path == "mixedcase-1.0.dist-info/RECORD"
 
 
+def test_iter_prefix(wheel_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("pkg/sub/b.py", "")
+        wf.writestr("pkg/sub/a.py", "")
+        assert list(wf.iter_prefix("pkg/")) == ["pkg/sub/a.py", "pkg/sub/b.py"]
+
+        # The index must pick up members added after it was built
+        wf.writestr("pkg/subpackage.py", "")
+        wf.writestr("test-1.0.data/scripts/tool", "")
+        assert list(wf.iter_prefix("pkg/sub/")) == ["pkg/sub/a.py", "pkg/sub/b.py"]
+
+    with WheelFile(wheel_path) as wf:
+        assert list(wf.iter_prefix("pkg/sub")) == [
+            "pkg/sub/a.py",
+            "pkg/sub/b.py",
+            "pkg/subpackage.py",
+        ]
+        assert list(wf.iter_prefix("test-1.0.data/scripts/")) == [
+            "test-1.0.data/scripts/tool"
+        ]
+        assert list(wf.iter_prefix("test-1.0.dist-info/")) == [
+            "test-1.0.dist-info/RECORD"
+        ]
+        assert list(wf.iter_prefix("nonexistent/")) == []
+
+
+@pytest.mark.parametrize("prefix", [b"", b"#!/bin/sh\n"], ids=["plain", "appended"])
+def test_central_directory(wheel_path: Path, prefix: bytes) -> None:
+    # Members must be decoded exactly like ZipFile does, including names that
+    # ZipInfo sanitizes and wheels appended to another file
+    with ZipFile(wheel_path, "w", ZIP_DEFLATED) as zf:
+        zf.writestr("test-1.0.dist-info/RECORD", "")
+        info = ZipInfo("hello/h\u00e9llo.py", (2020, 5, 17, 10, 20, 30))
+        info.comment = b"a comment"
+        info.extra = struct.pack("<HHB4s", 0x5455, 5, 1, b"\x00" * 4)
+        info.external_attr = 0o100644 << 16
+        zf.writestr(info, b"print('hello')\n")
+        zf.writestr("hello/nul_x.py", b"")
+        zf.writestr("hello/dup.txt", b"first")
+        with pytest.warns(UserWarning, match="Duplicate name"):
+            zf.writestr("hello/dup.txt", b"second")
+
+    wheel_path.write_bytes(
+        prefix + wheel_path.read_bytes().replace(b"nul_x", b"nul\x00x")
+    )
+    with ZipFile(wheel_path) as zf, WheelFile(wheel_path, lazy_index=True) as wf:
+        assert isinstance(wf.filelist, wheelfile._CentralDirectory)
+        assert wf.namelist() == zf.namelist()
+        assert list(wf.NameToInfo) == list(zf.NameToInfo)
+        assert "hello/nul" in wf.NameToInfo
+        assert len(wf.filelist) == len(zf.filelist)
+        assert wf.filelist._infos.count(None) == len(zf.filelist) - 1
+
+        for expected, actual in zip(zf.infolist(), wf.infolist()):
+            for attr in ZipInfo.__slots__:
+                assert getattr(actual, attr, None) == getattr(expected, attr, None)
+
+        assert wf.getinfo("hello/dup.txt") is wf.filelist[-1]
+        assert wf.getinfo("hello/dup.txt").file_size == len(b"second")
+        assert wf.filelist[1:2] == [wf.getinfo("hello/h\u00e9llo.py")]
+
+
+def test_lazy_index_default(wheel_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello.py", b"print('hello')\n")
+
+    with WheelFile(wheel_path) as wf:
+        assert type(wf.filelist) is list
+        assert type(wf.NameToInfo) is dict
+
+    # Appending always uses ZipFile, as the member table is extended
+    with WheelFile(wheel_path, "a", lazy_index=True) as wf:
+        assert type(wf.filelist) is list
+
+
+@pytest.fixture
+def lazy_index_check() -> Iterator[None]:
+    wheelfile._lazy_index_supported.cache_clear()
+    yield
+    wheelfile._lazy_index_supported.cache_clear()
+
+
+@pytest.mark.usefixtures("lazy_index_check")
+@pytest.mark.parametrize(
+    "attribute, value",
+    [
+        pytest.param("_LAZY_INDEX_VERSIONS", ((2, 0), (2, 7)), id="version"),
+        pytest.param("_UNICODE_PATH_EXTRA", not wheelfile._UNICODE_PATH_EXTRA, id="up"),
+        pytest.param("_EndRecData", None, id="missing"),
+    ],
+)
+def test_lazy_index_fallback(
+    wheel_path: Path, monkeypatch: MonkeyPatch, attribute: str, value: object
+) -> None:
+    # Where the lazy index does not decode members exactly like ZipFile, it is
+    # not used at all
+    assert wheelfile._lazy_index_supported()
+    wheelfile._lazy_index_supported.cache_clear()
+    monkeypatch.setattr(wheelfile, attribute, value)
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello.py", b"print('hello')\n")
+
+    cache = WheelIndexCache(wheel_path.parent / "cache")
+    with WheelFile(wheel_path, lazy_index=True, index_cache=cache) as wf:
+        assert type(wf.filelist) is list
+        assert wf.read("hello.py") == b"print('hello')\n"
+
+    assert not wheelfile._lazy_index_supported()
+    assert os.listdir(cache.directory) == []
+
+
+def test_index_cache(
+    wheel_path: Path, tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/h\u00e9llo.py", b"print('hello')\n")
+        wf.writestr("hello/data.bin", os.urandom(100), ZIP_STORED)
+
+    cache = WheelIndexCache(tmp_path / "cache")
+    with WheelFile(wheel_path, index_cache=cache) as wf:
+        expected = [(zinfo.filename, zinfo.CRC) for zinfo in wf.infolist()]
+
+    assert len(os.listdir(cache.directory)) == 1
+
+    # Opening the wheel again must parse neither the central directory nor RECORD
+    with monkeypatch.context() as m:
+        m.setattr(wheelfile._CentralDirectory, "parse", None)
+        with WheelFile(wheel_path, index_cache=cache) as wf:
+            assert wf._record_loaded
+            assert wf.record_path == "test-1.0.dist-info/RECORD"
+            assert [(zinfo.filename, zinfo.CRC) for zinfo in wf.infolist()] == (
+                expected
+            )
+            assert wf.read("hello/h\u00e9llo.py") == b"print('hello')\n"
+            assert wf.verify().ok
+
+    # A modified wheel gets a new entry, and is checked against its new RECORD
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/h\u00e9llo.py", b"print('bye')\n")
+
+    with WheelFile(wheel_path, index_cache=cache) as wf:
+        assert wf.read("hello/h\u00e9llo.py") == b"print('bye')\n"
+        assert wf.namelist() == ["hello/h\u00e9llo.py", "test-1.0.dist-info/RECORD"]
+
+    assert len(os.listdir(cache.directory)) == 2
+    cache.clear()
+    assert os.listdir(cache.directory) == []
+
+
+def test_index_cache_corrupt(wheel_path: Path, tmp_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello.py", b"print('hello')\n")
+
+    cache = WheelIndexCache(tmp_path)
+    WheelFile(wheel_path, index_cache=cache).close()
+    (entry,) = tmp_path.glob("*.index")
+    entry.write_bytes(entry.read_bytes()[:-10])
+
+    # A damaged entry is ignored and replaced
+    with WheelFile(wheel_path, index_cache=cache) as wf:
+        assert wf.read("hello.py") == b"print('hello')\n"
+
+    with WheelFile(wheel_path, index_cache=cache) as wf:
+        assert wf._record_loaded
+
+
+def test_index_cache_eviction(tmp_path: Path) -> None:
+    paths = []
+    for name in ["one", "two", "six"]:
+        paths.append(tmp_path / f"{name}-1.0-py3-none-any.whl")
+        with WheelFile(paths[-1], "w") as wf:
+            wf.writestr(f"{name}.py", b"")
+
+    cache = WheelIndexCache(tmp_path / "cache")
+    WheelFile(paths[0], index_cache=cache).close()
+    (entry,) = os.scandir(cache.directory)
+    cache.max_size = entry.stat().st_size * 2
+
+    # The least recently used entry is removed, whatever the timestamp resolution
+    WheelFile(paths[1], index_cache=cache).close()
+    os.utime(entry.path, ns=(0, 0))
+    WheelFile(paths[2], index_cache=cache).close()
+    assert len(os.listdir(cache.directory)) == 2
+    assert not os.path.exists(entry.path)
+
+
+def test_verification_cache(wheel_path: Path, tmp_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/hello.py", b"print('hello')\n" * 100)
+        wf.writestr("hello/data.bin", os.urandom(1000), ZIP_STORED)
+
+    def check(cache: VerificationCache) -> WheelStats:
+        stats = WheelStats()
+        with WheelFile(wheel_path, stats=stats, verification_cache=cache) as wf:
+            assert wf.read("hello/hello.py") == b"print('hello')\n" * 100
+            assert wf.read_view("hello/data.bin") == wf.read("hello/data.bin")
+            wf.extractall(tmp_path / "unpacked")
+            assert wf.verify().verified == ["hello/hello.py", "hello/data.bin"]
+
+        return stats
+
+    with VerificationCache(tmp_path / "verified.db") as cache:
+        assert check(cache).hash_time > 0
+        assert check(cache).hash_time == 0
+
+    with VerificationCache(tmp_path / "verified.db", reverify=True) as cache:
+        assert check(cache).hash_time > 0
+
+    # Members of a rewritten wheel are hashed again
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/hello.py", b"print('hello')\n" * 100)
+        wf.writestr("hello/data.bin", os.urandom(1000), ZIP_STORED)
+
+    with VerificationCache(tmp_path / "verified.db") as cache:
+        assert check(cache).hash_time > 0
+        assert check(cache).hash_time == 0
+        cache.clear()
+        assert check(cache).hash_time > 0
+
+
+def test_verification_cache_crc(wheel_path: Path, tmp_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/data.bin", b"data" * 100, ZIP_STORED)
+
+    with VerificationCache(tmp_path / "verified.db") as cache:
+        with WheelFile(wheel_path, verification_cache=cache) as wf:
+            wf.read("hello/data.bin")
+
+        # Tampering that keeps the size and modification time of the wheel is
+        # still caught by the CRC-32 check
+        st = wheel_path.stat()
+        with wheel_path.open("r+b") as f:
+            data = f.read()
+            f.seek(data.index(b"datadata"))
+            f.write(b"DATA")
+
+        os.utime(wheel_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        with WheelFile(wheel_path, verification_cache=cache) as wf:
+            with pytest.raises(BadZipFile, match="Bad CRC-32"):
+                wf.read("hello/data.bin")
+
+            with pytest.raises(BadZipFile, match="Bad CRC-32"):
+                wf.extract("hello/data.bin", tmp_path / "unpacked")
+
+            assert wf.verify().errors == {
+                "hello/data.bin": "Bad CRC-32 for file 'hello/data.bin'"
+            }
+
+
+@pytest.mark.parametrize("lazy_index", [False, True], ids=["zipfile", "lazy"])
+def test_central_directory_corrupt(wheel_path: Path, lazy_index: bool) -> None:
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("test-1.0.dist-info/RECORD", "")
+
+    data = wheel_path.read_bytes()
+    start = data.index(b"PK\x01\x02")
+    wheel_path.write_bytes(data[: start + 6] + b"\xff" + data[start + 7 :])
+    with pytest.raises(NotImplementedError, match="zip file version 25.5"):
+        WheelFile(wheel_path, lazy_index=lazy_index)
+
+    wheel_path.write_bytes(data[:start] + b"PK\x00\x00" + data[start + 4 :])
+    with pytest.raises(BadZipFile, match="Bad magic number for central directory"):
+        WheelFile(wheel_path, lazy_index=lazy_index)
+
+
 def test_unsupported_hash_algorithm(wheel_path: Path) -> None:
     with ZipFile(wheel_path, "w") as zf:
         zf.writestr("hello/héllö.py", 'print("Héllö, w0rld!")\n')
@@ -89,8 +394,9 @@ def test_unsupported_hash_algorithm(wheel_path: Path) -> None:
             "hello/héllö.py,sha000=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25",
         )
 
-    exc = pytest.raises(WheelError, WheelFile, wheel_path)
-    exc.match("^Unsupported hash algorithm: sha000$")
+    with WheelFile(wheel_path) as wf:
+        exc = pytest.raises(WheelError, wf.testzip)
+        exc.match("^Unsupported hash algorithm: sha000$")
 
 
 @pytest.mark.parametrize(
@@ -106,8 +412,22 @@ def test_weak_hash_algorithm(wheel_path: Path, algorithm: str, digest: str) -> N
         zf.writestr("hello/héllö.py", 'print("Héllö, w0rld!")\n')
         zf.writestr("test-1.0.dist-info/RECORD", f"hello/héllö.py,{hash_string},25")
 
-    exc = pytest.raises(WheelError, WheelFile, wheel_path)
-    exc.match(rf"^Weak hash algorithm \({algorithm}\) is not permitted by PEP 427$")
+    with WheelFile(wheel_path) as wf:
+        exc = pytest.raises(WheelError, wf.testzip)
+        exc.match(rf"^Weak hash algorithm \({algorithm}\) is not permitted by PEP 427$")
+
+
+def test_record_loaded_lazily(wheel_path: Path) -> None:
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello/héllö.py", 'print("Héllö, w0rld!")\n')
+        zf.writestr("test-1.0.dist-info/RECORD", "hello/héllö.py,sha000=abc,25")
+
+    # Listing the archive or reading RECORD itself must not parse RECORD
+    with WheelFile(wheel_path) as wf:
+        assert wf.namelist() == ["hello/héllö.py", "test-1.0.dist-info/RECORD"]
+        assert wf.read("test-1.0.dist-info/RECORD").startswith(b"hello/")
+        exc = pytest.raises(WheelError, wf.read, "hello/héllö.py")
+        exc.match("^Unsupported hash algorithm: sha000$")
 
 
 @pytest.mark.parametrize(
@@ -162,6 +482,98 @@ def test_testzip_bad_hash(wheel_path: Path) -> None:
         exc.match("^Hash mismatch for file 'hello/héllö.py'$")
 
 
+@pytest.mark.parametrize(
+    "jobs", [pytest.param(1, id="serial"), pytest.param(4, id="4")]
+)
+def test_verify(wheel_path: Path, jobs: int) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        for i in range(10):
+            wf.writestr(f"hello/module{i}.py", f"print({i})\n" * 1000)
+
+    with WheelFile(wheel_path) as wf:
+        report = wf.verify(jobs=jobs)
+
+    assert report.ok
+    assert report.verified == [f"hello/module{i}.py" for i in range(10)]
+    assert report.unhashed == ["test-1.0.dist-info/RECORD"]
+    assert report.errors == {}
+
+
+def test_verify_errors(wheel_path: Path) -> None:
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello/héllö.py", 'print("Héllö, w0rld!")\n')
+        zf.writestr("hello/unlisted.py", "")
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello/héllö.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n"
+            "hello/gone.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n",
+        )
+
+    with WheelFile(wheel_path) as wf:
+        report = wf.verify()
+
+    assert not report.ok
+    assert report.verified == []
+    assert report.errors == {
+        "hello/héllö.py": "Hash mismatch for file 'hello/héllö.py'",
+        "hello/unlisted.py": "No hash found for file 'hello/unlisted.py'",
+        "hello/gone.py": "File 'hello/gone.py' listed in RECORD is missing",
+    }
+
+
+def corrupt_member(path: Path, name: str) -> None:
+    """Overwrite the compressed contents of a member with invalid deflate data."""
+    with ZipFile(path) as zf:
+        zinfo = zf.getinfo(name)
+
+    with path.open("r+b") as f:
+        f.seek(zinfo.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", f.read(4))
+        f.seek(name_length + extra_length, os.SEEK_CUR)
+        f.write(b"\xff" * 8)
+
+
+def test_verify_corrupt_deflate(wheel_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/hello.py", "print('hello')\n" * 100)
+        wf.writestr("hello/other.py", "print('other')\n" * 100)
+
+    corrupt_member(wheel_path, "hello/hello.py")
+    with WheelFile(wheel_path) as wf:
+        report = wf.verify()
+
+    assert report.verified == ["hello/other.py"]
+    assert list(report.errors) == ["hello/hello.py"]
+    assert report.errors["hello/hello.py"].startswith(
+        "Cannot read file 'hello/hello.py': Error -3 while decompressing data"
+    )
+
+
+@pytest.mark.parametrize("source", ["file", "buffer"])
+def test_zero_copy_header_name_mismatch(
+    wheel_path: Path, tmp_path: Path, source: str
+) -> None:
+    # Reading a member without ZipFile.open() still checks that its local header
+    # belongs to it
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/aaa.py", b"print('hello')\n", ZIP_STORED)
+
+    data = wheel_path.read_bytes()
+    wheel_path.write_bytes(data.replace(b"hello/aaa.py", b"hello/bbb.py", 1))
+    file = wheel_path.read_bytes() if source == "buffer" else wheel_path
+    message = "File name in directory 'hello/aaa.py' and header b'hello/bbb.py' differ"
+    with WheelFile(file, filename=wheel_path.name) as wf:
+        with pytest.raises(BadZipFile, match=message):
+            wf.read_view("hello/aaa.py")
+
+        with pytest.raises(BadZipFile, match=message):
+            wf.extract("hello/aaa.py", tmp_path / "unpacked")
+
+        with WheelFile(tmp_path / wheel_path.name, "w") as copy:
+            with pytest.raises(BadZipFile, match=message):
+                copy.copy_member_raw(wf, wf.getinfo("hello/aaa.py"))
+
+
 def test_write_str(wheel_path: Path) -> None:
     with WheelFile(wheel_path, "w") as wf:
         wf.writestr("hello/héllö.py", 'print("Héllö, world!")\n')
@@ -184,6 +596,40 @@ def test_write_str(wheel_path: Path) -> None:
         )
 
 
+def test_record_spooled_to_disk(wheel_path: Path, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("wheel.wheelfile._RECORD_SPOOL_SIZE", 100)
+    with WheelFile(wheel_path, "w") as wf:
+        for i in range(10):
+            wf.writestr(f"hello/module{i}.py", 'print("Héllö, world!")\n')
+
+        assert wf._record_spool._rolled
+
+    with WheelFile(wheel_path) as wf:
+        assert wf.read("test-1.0.dist-info/RECORD").decode("utf-8") == "".join(
+            f"hello/module{i}.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n"
+            for i in range(10)
+        ) + ("test-1.0.dist-info/RECORD,,\n")
+        assert wf.verify().ok
+
+
+def test_write_in_chunks(
+    tmp_path: Path, wheel_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setattr("wheel.wheelfile._CHUNK_SIZE", 1000)
+    contents = bytes(range(256)) * 100
+    source_path = tmp_path / "data.bin"
+    source_path.write_bytes(contents)
+    with WheelFile(wheel_path, "w") as wf:
+        wf.write(str(source_path), "pkg/data.bin")
+
+    with WheelFile(wheel_path) as wf:
+        assert wf.getinfo("pkg/data.bin").file_size == len(contents)
+        assert wf.read("pkg/data.bin") == contents
+        record = wf.read("test-1.0.dist-info/RECORD").decode("utf-8")
+        assert record.startswith("pkg/data.bin,sha256=")
+        assert record.splitlines()[0].endswith(f",{len(contents)}")
+
+
 def test_timestamp(
     tmp_path_factory: TempPathFactory, wheel_path: Path, monkeypatch: MonkeyPatch
 ) -> None:
@@ -205,6 +651,135 @@ def test_timestamp(
             assert info.compress_type == ZIP_DEFLATED
 
 
+@pytest.mark.parametrize("budget", [pytest.param(10**9, id="all"), 20000])
+def test_write_files_parallel(
+    tmp_path_factory: TempPathFactory, monkeypatch: MonkeyPatch, budget: int
+) -> None:
+    # Files larger than the budget are written serially between parallel ones
+    monkeypatch.setattr("wheel.wheelfile._CHUNK_SIZE", 4096)
+    monkeypatch.setattr("wheel.wheelfile._PARALLEL_BUDGET", budget)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "315576060")
+    build_dir = tmp_path_factory.mktemp("build")
+    build_dir.joinpath("test-1.0.dist-info").mkdir()
+    build_dir.joinpath("test-1.0.dist-info", "METADATA").write_text("Name: test\n")
+    for i in range(20):
+        path = build_dir.joinpath("pkg", f"sub{i % 3}", f"module{i}.py")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"print('%d')\n" % i * (i * 400))
+
+    build_dir.joinpath("pkg", "random.bin").write_bytes(os.urandom(30000))
+
+    dist_dir = tmp_path_factory.mktemp("dist")
+    serial_path = dist_dir / "serial" / "test-1.0-py3-none-any.whl"
+    parallel_path = dist_dir / "parallel" / "test-1.0-py3-none-any.whl"
+    serial_path.parent.mkdir()
+    parallel_path.parent.mkdir()
+    with WheelFile(serial_path, "w") as wf:
+        wf.write_files(str(build_dir))
+
+    with WheelFile(parallel_path, "w", jobs=4) as wf:
+        wf.write_files(str(build_dir))
+
+    assert parallel_path.read_bytes() == serial_path.read_bytes()
+    with WheelFile(parallel_path) as wf:
+        assert wf.verify().ok
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_stats(tmp_path_factory: TempPathFactory, wheel_path: Path, jobs: int) -> None:
+    build_dir = tmp_path_factory.mktemp("build")
+    build_dir.joinpath("test-1.0.dist-info").mkdir()
+    build_dir.joinpath("test-1.0.dist-info", "METADATA").write_text("Name: test\n")
+    build_dir.joinpath("hello.py").write_bytes(b"print('hello')\n" * 1000)
+
+    write_stats = WheelStats()
+    with WheelFile(wheel_path, "w", jobs=jobs, stats=write_stats) as wf:
+        wf.write_files(str(build_dir))
+        wf.writestr("hello/data.txt", b"data" * 100)
+
+    # Local headers are rewritten once the sizes of their members are known
+    assert write_stats.bytes_written >= wheel_path.stat().st_size
+    assert write_stats.bytes_read == write_stats.bytes_decompressed == 0
+    assert write_stats.bytes_compressed >= 15400
+    assert write_stats.compress_time > 0
+    assert write_stats.hash_time > 0
+    assert write_stats.io_time > 0
+    assert set(write_stats.member_times) == {
+        "hello.py",
+        "hello/data.txt",
+        "test-1.0.dist-info/METADATA",
+        "test-1.0.dist-info/RECORD",
+    }
+
+    read_stats = WheelStats()
+    with WheelFile(wheel_path, stats=read_stats) as wf:
+        assert wf.read("hello.py") == b"print('hello')\n" * 1000
+        assert wf.verify().ok
+
+    assert read_stats.bytes_written == read_stats.bytes_compressed == 0
+    # hello.py is decompressed twice, once for reading it and once for verifying
+    assert read_stats.bytes_decompressed > 2 * 15000 + 400
+    assert 0 < read_stats.bytes_read < 2 * wheel_path.stat().st_size
+    assert [name for name, _ in read_stats.slowest_members(10)] == sorted(
+        read_stats.member_times,
+        key=read_stats.member_times.__getitem__,
+        reverse=True,
+    )
+    summary = read_stats.summary()
+    assert "Bytes decompressed:" in summary
+    assert "Slowest members:" in summary
+
+
+def test_compresslevel(tmp_path_factory: TempPathFactory) -> None:
+    build_dir = tmp_path_factory.mktemp("build")
+    contents = b"".join(b"line %d of some compressible text\n" % i for i in range(5000))
+    build_dir.joinpath("module.py").write_bytes(contents)
+    dist_dir = tmp_path_factory.mktemp("dist")
+    sizes: dict[int, list[int]] = {}
+    for level in (0, 1, 9):
+        wheel_path = dist_dir / str(level) / "test-1.0-py3-none-any.whl"
+        wheel_path.parent.mkdir()
+        with WheelFile(wheel_path, "w", compresslevel=level) as wf:
+            wf.writestr("written.py", contents)
+            wf.write(str(build_dir / "module.py"), "copied.py")
+            wf.write_files(str(build_dir))
+
+        with ZipFile(wheel_path) as zf:
+            sizes[level] = [
+                zf.getinfo(name).compress_size
+                for name in ("written.py", "copied.py", "module.py")
+            ]
+
+    for index in range(3):
+        assert sizes[0][index] > len(contents)
+        assert sizes[0][index] > sizes[1][index] > sizes[9][index]
+
+
+@pytest.mark.parametrize(
+    "arcname, contents, expected",
+    [
+        pytest.param("pkg/module.py", b"import os\n" * 100, ZIP_DEFLATED, id="text"),
+        pytest.param("pkg/tiny.py", b"import os\n", ZIP_STORED, id="tiny"),
+        pytest.param("pkg/logo.PNG", b"import os\n" * 100, ZIP_STORED, id="png"),
+        pytest.param("pkg/data.bin", os.urandom(1000), ZIP_STORED, id="random"),
+    ],
+)
+def test_content_aware_compression(
+    tmp_path: Path, wheel_path: Path, arcname: str, contents: bytes, expected: int
+) -> None:
+    source_path = tmp_path / "source"
+    source_path.write_bytes(contents)
+    with WheelFile(wheel_path, "w", compression_policy=ContentAwareCompression()) as wf:
+        wf.write(str(source_path), arcname)
+        # An explicitly given compression method overrides the policy
+        wf.write(str(source_path), "explicit", ZIP_DEFLATED)
+
+    with WheelFile(wheel_path) as wf:
+        assert wf.getinfo(arcname).compress_type == expected
+        assert wf.getinfo("explicit").compress_type == ZIP_DEFLATED
+        assert wf.read(arcname) == contents
+
+
 @pytest.mark.skipif(
     sys.platform == "win32", reason="Windows does not support UNIX-like permissions"
 )
@@ -229,3 +804,736 @@ def test_attributes(tmp_path_factory: TempPathFactory, wheel_path: Path) -> None
 
         info = zf.getinfo("test-1.0.dist-info/RECORD")
         assert info.external_attr == (0o664 | stat.S_IFREG) << 16
+
+
+def test_record_memory(wheel_path: Path) -> None:
+    # Compare the memory used for the parsed RECORD against the dict-of-tuples
+    # layout that the compact table replaced
+    with WheelFile(wheel_path, "w", ZIP_STORED) as wf:
+        for i in range(10000):
+            wf.writestr(f"pkg/module{i}.py", b"")
+
+    with WheelFile(wheel_path) as wf:
+        rows = list(csv.reader(StringIO(wf.read(wf.record_path).decode("utf-8"))))
+        tracemalloc.start()
+        try:
+            hashes: dict[str, tuple[str, bytes]] = {}
+            sizes: dict[str, int] = {}
+            for path, hash_sum, size in rows:
+                if hash_sum:
+                    algorithm, digest = hash_sum.split("=")
+                    hashes[path] = algorithm, urlsafe_b64decode(digest.encode())
+                    sizes[path] = int(size)
+
+            dict_usage = tracemalloc.get_traced_memory()[0]
+            del hashes, sizes
+            baseline = tracemalloc.get_traced_memory()[0]
+            wf.read("pkg/module0.py")  # loads RECORD
+            table_usage = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+
+    assert table_usage < dict_usage * 0.6
+
+
+@pytest.mark.parametrize("zero_copy", [True, False], ids=["zero_copy", "buffered"])
+def test_copy_member_raw(
+    wheel_path: Path, tmp_path: Path, monkeypatch: MonkeyPatch, zero_copy: bool
+) -> None:
+    monkeypatch.setattr("wheel.wheelfile._ZERO_COPY", zero_copy)
+    contents = b"print('hello')\n" * 1000
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/hello.py", contents)
+        wf.writestr("hello/data.bin", os.urandom(1000), ZIP_STORED)
+
+    copy_path = tmp_path / "copy-1.0-py2.py3-none-any.whl"
+    with WheelFile(wheel_path) as source, WheelFile(copy_path, "w") as wf:
+        for name in ("hello/hello.py", "hello/data.bin"):
+            wf.copy_member_raw(source, name)
+
+    with ZipFile(wheel_path) as source, WheelFile(copy_path) as wf:
+        assert wf.verify().ok
+        assert wf.read("hello/hello.py") == contents
+        for name in ("hello/hello.py", "hello/data.bin"):
+            original, copy = source.getinfo(name), wf.getinfo(name)
+            assert copy.compress_type == original.compress_type
+            assert copy.compress_size == original.compress_size
+            assert copy.CRC == original.CRC
+
+        original_record = source.read("test-1.0.dist-info/RECORD").decode("utf-8")
+        record = wf.read("copy-1.0.dist-info/RECORD").decode("utf-8")
+        assert record.splitlines()[:2] == original_record.splitlines()[:2]
+
+
+def test_copy_member_raw_missing_hash(wheel_path: Path, tmp_path: Path) -> None:
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello/hello.py", b"")
+        zf.writestr("test-1.0.dist-info/RECORD", "")
+
+    copy_path = tmp_path / "copy-1.0-py2.py3-none-any.whl"
+    with WheelFile(wheel_path) as source, WheelFile(copy_path, "w") as wf:
+        exc = pytest.raises(WheelError, wf.copy_member_raw, source, "hello/hello.py")
+        exc.match("^No hash found for file 'hello/hello.py'$")
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="zero-copy extraction is Linux only"
+)
+@pytest.mark.parametrize("copy_file_range", [True, False], ids=["cfr", "sendfile"])
+def test_extract_stored(
+    wheel_path: Path, tmp_path: Path, monkeypatch: MonkeyPatch, copy_file_range: bool
+) -> None:
+    def reject_copy_file_range(*args: object) -> int:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    def spy(*args: object) -> int:
+        copied.append(args)
+        return copy_fd_range(*args)
+
+    if not copy_file_range:
+        monkeypatch.setattr(os, "copy_file_range", reject_copy_file_range)
+
+    copied: list[tuple[object, ...]] = []
+    copy_fd_range = wheelfile._copy_file_range
+    monkeypatch.setattr("wheel.wheelfile._copy_file_range", spy)
+    contents = os.urandom(100000)
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/data.bin", contents, ZIP_STORED)
+        wf.writestr("hello/hello.py", b"print('hello')\n" * 100)
+
+    with WheelFile(wheel_path) as wf:
+        wf.extractall(tmp_path / "out")
+
+    assert len(copied) == 1
+    assert tmp_path.joinpath("out", "hello", "data.bin").read_bytes() == contents
+    assert tmp_path.joinpath("out", "hello", "hello.py").read_bytes() == (
+        b"print('hello')\n" * 100
+    )
+
+
+def test_extract_stored_hash_mismatch(wheel_path: Path, tmp_path: Path) -> None:
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello.py", b"print('hello')\n")
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,15\n",
+        )
+
+    with WheelFile(wheel_path) as wf:
+        exc = pytest.raises(WheelError, wf.extract, "hello.py", tmp_path)
+        exc.match("^Hash mismatch for file 'hello.py'$")
+
+
+def test_read_view(wheel_path: Path) -> None:
+    stored = os.urandom(1000)
+    deflated = b"print('hello')\n" * 100
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/data.bin", stored, ZIP_STORED)
+        wf.writestr("hello/hello.py", deflated)
+
+    with WheelFile(wheel_path) as wf:
+        view = wf.read_view("hello/data.bin")
+        assert view == stored
+        assert view.readonly
+        assert wf.read_view(wf.getinfo("hello/data.bin")) is view
+
+        assert wf.read_view("hello/hello.py") == deflated
+        buffer = bytearray(2000)
+        view = wf.read_view("hello/hello.py", buffer)
+        assert view == deflated
+        assert buffer[: len(deflated)] == deflated
+        exc = pytest.raises(ValueError, wf.read_view, "hello/hello.py", bytearray(10))
+        exc.match("too small")
+
+        view = wf.read_view("hello/data.bin")
+
+    # Views remain usable after closing the wheel
+    assert view == stored
+
+
+def test_read_view_unmapped() -> None:
+    output = BytesIO()
+    with WheelFile(output, "w", filename="test-1.0-py3-none-any.whl") as wf:
+        wf.writestr("hello/data.bin", b"data", ZIP_STORED)
+
+    with WheelFile(
+        BytesIO(output.getvalue()), filename="test-1.0-py3-none-any.whl"
+    ) as wf:
+        view = wf.read_view("hello/data.bin")
+        assert view == b"data"
+        assert not view.readonly
+
+
+@pytest.mark.parametrize("compression", [ZIP_STORED, ZIP_DEFLATED])
+def test_read_view_hash_mismatch(wheel_path: Path, compression: int) -> None:
+    with ZipFile(wheel_path, "w", compression) as zf:
+        zf.writestr("hello.py", b"print('hello')\n")
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,15\n",
+        )
+
+    with WheelFile(wheel_path) as wf:
+        exc = pytest.raises(WheelError, wf.read_view, "hello.py")
+        exc.match("^Hash mismatch for file 'hello.py'$")
+        # A failed check is not cached
+        pytest.raises(WheelError, wf.read_view, "hello.py")
+
+
+@pytest.mark.skipif(not hasattr(os, "pread"), reason="requires os.pread()")
+def test_concurrent_reads(wheel_path: Path) -> None:
+    contents = {f"hello/data{i}.bin": os.urandom(100000) for i in range(8)}
+    with WheelFile(wheel_path, "w") as wf:
+        for name, data in contents.items():
+            wf.writestr(name, data * 2)
+
+    def read_member(name: str) -> bytes:
+        with wf.open(name) as f:
+            assert isinstance(f._fileobj, wheelfile._PositionalFile)
+            assert f.read(10) == contents[name][:10]
+            f.seek(0)
+            return f.read()
+
+    with WheelFile(wheel_path, concurrent_reads=True) as wf:
+        with ThreadPoolExecutor(4) as executor:
+            results = dict(zip(contents, executor.map(read_member, contents)))
+
+        assert results == {name: data * 2 for name, data in contents.items()}
+        assert wf.verify(jobs=4).ok
+        fp = wf.fp
+
+    assert fp.closed
+
+
+def test_write_duplicate_record_rows(wheel_path: Path) -> None:
+    # A member written again gets a single RECORD row, with its last hash, in the
+    # place of the first one
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/a.py", b"first\n")
+        wf.writestr("hello/b.py", b"other\n")
+        with pytest.warns(UserWarning, match="Duplicate name"):
+            wf.writestr("hello/a.py", b"second\n")
+
+    with WheelFile(wheel_path) as wf:
+        record = wf.read("test-1.0.dist-info/RECORD").decode("utf-8")
+        assert [row.split(",")[0] for row in record.splitlines()] == [
+            "hello/a.py",
+            "hello/b.py",
+            "test-1.0.dist-info/RECORD",
+        ]
+        assert wf.read("hello/a.py") == b"second\n"
+
+
+def test_concurrent_record_load(wheel_path: Path) -> None:
+    # Members found in RECORD while another thread is loading it must have their
+    # whole entry in place already
+    names = [f"hello/module{i}.py" for i in range(5000)]
+    with WheelFile(wheel_path, "w") as wf:
+        for name in names:
+            wf.writestr(name, name, ZIP_STORED)
+
+    def probe(wf: WheelFile, loaded: threading.Event) -> None:
+        while not loaded.is_set():
+            # Look up the member added last, as that is the one being added
+            try:
+                name = next(reversed(wf._record._index))
+            except (StopIteration, RuntimeError):
+                continue
+
+            assert wf._record[name].size in (len(name), None)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(10):
+            loaded = threading.Event()
+            with WheelFile(wheel_path) as wf, ThreadPoolExecutor(4) as executor:
+                probes = [executor.submit(probe, wf, loaded) for _ in range(4)]
+                try:
+                    wf._load_record()
+                finally:
+                    loaded.set()
+
+                for future in probes:
+                    future.result()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def test_invalid_record_size(wheel_path: Path) -> None:
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello.py", 'print("Hello, w0rld!")\n')
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,big\n",
+        )
+
+    with WheelFile(wheel_path) as wf:
+        with pytest.raises(WheelError, match="^Invalid size for 'hello.py' in RECORD$"):
+            wf.read("hello.py")
+
+
+def test_partial_record_load(wheel_path: Path) -> None:
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello.py", 'print("Hello, w0rld!")\n')
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n"
+            "other.py,sha000=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n",
+        )
+
+    # A RECORD that failed to load is not trusted for the rows read before then
+    with WheelFile(wheel_path) as wf:
+        for _ in range(2):
+            with pytest.raises(
+                WheelError, match="^Unsupported hash algorithm: sha000$"
+            ):
+                wf.read("hello.py")
+
+
+def test_writestr_precompressed(wheel_path: Path, tmp_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/hello.py", b"print('hello')\n" * 1000)
+
+    copy_path = tmp_path / "copy-1.0-py2.py3-none-any.whl"
+    with WheelFile(wheel_path) as source, WheelFile(copy_path, "w") as wf:
+        zinfo = source.getinfo("hello/hello.py")
+        with open(wheel_path, "rb") as f:
+            f.seek(zinfo.header_offset + 30 + len(zinfo.filename))
+            data = f.read(zinfo.compress_size)
+
+        record_hash = "sha256=" + urlsafe_b64encode(
+            hashlib.sha256(source.read(zinfo)).digest()
+        ).decode("ascii")
+        wf.writestr_precompressed(zinfo, data, record_hash)
+
+    with WheelFile(copy_path) as wf:
+        assert wf.verify().ok
+        assert wf.read("hello/hello.py") == b"print('hello')\n" * 1000
+
+
+def test_writestr_precompressed_weak_hash(wheel_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        zinfo = ZipInfo("hello/hello.py")
+        exc = pytest.raises(
+            WheelError,
+            wf.writestr_precompressed,
+            zinfo,
+            b"",
+            "md5=1B2M2Y8AsgTpgAmY7PhCfg",
+        )
+        exc.match(r"^Weak hash algorithm \(md5\) is not permitted by PEP 427$")
+
+
+def test_write_iter(wheel_path: Path, tmp_path: Path) -> None:
+    source_path = tmp_path / "source.txt"
+    source_path.write_bytes(b"from a file\n")
+    zinfo = ZipInfo("hello/hint.py")
+    zinfo.file_size = 15
+    with WheelFile(wheel_path, "w") as wf, source_path.open("rb") as f:
+        wf.write_iter(
+            [
+                ("hello/stream.py", f),
+                ("hello/chunks.py", (b"from %d\n" % i for i in range(3))),
+                ("hello/bytes.py", b"from bytes\n"),
+                (zinfo, [b"from a zipinfo\n"]),
+            ]
+        )
+
+    with WheelFile(wheel_path) as wf:
+        assert wf.verify().ok
+        assert wf.read("hello/stream.py") == b"from a file\n"
+        assert wf.read("hello/chunks.py") == b"from 0\nfrom 1\nfrom 2\n"
+        assert wf.read("hello/bytes.py") == b"from bytes\n"
+        assert wf.read("hello/hint.py") == b"from a zipinfo\n"
+        for name in wf.namelist():
+            assert not wf.getinfo(name).extra
+
+
+def test_write_iter_over_budget(wheel_path: Path) -> None:
+    # Members larger than the buffer cannot be sized up front, so they are written
+    # with ZIP64 extensions
+    with WheelFile(wheel_path, "w") as wf:
+        wf.write_iter(
+            [
+                ("hello/small.py", iter([b"x" * 10])),
+                ("hello/large.py", iter([b"x" * 10] * 3)),
+            ],
+            buffer_size=16,
+        )
+
+    with WheelFile(wheel_path) as wf:
+        assert wf.verify().ok
+        assert wf.read("hello/large.py") == b"x" * 30
+        with open(wheel_path, "rb") as f:
+            for name, zip64 in [("hello/small.py", False), ("hello/large.py", True)]:
+                f.seek(wf.getinfo(name).header_offset + 28)
+                assert (f.read(2) != b"\x00\x00") is zip64
+
+
+def test_write_iter_memory(wheel_path: Path) -> None:
+    def produce() -> Iterator[bytes]:
+        for _ in range(64):
+            yield os.urandom(256 * 1024)
+
+    tracemalloc.start()
+    try:
+        with WheelFile(wheel_path, "w", ZIP_STORED) as wf:
+            wf.write_iter([("hello/big.bin", produce())], buffer_size=1024 * 1024)
+
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert os.path.getsize(wheel_path) > 16 * 1024 * 1024
+    assert peak < 4 * 1024 * 1024
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs symbolic links")
+def test_write_files_order(tmp_path_factory: TempPathFactory, wheel_path: Path) -> None:
+    build_dir = tmp_path_factory.mktemp("build")
+    for name in ("b/z.py", "b/a/x.py", "a.py", "b.py", "c/d/e.py", "b-c.py"):
+        build_dir.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+        build_dir.joinpath(name).write_text(name)
+
+    build_dir.joinpath("test-1.0.dist-info").mkdir()
+    build_dir.joinpath("test-1.0.dist-info", "METADATA").write_text("")
+    build_dir.joinpath("test-1.0.dist-info", "RECORD").write_text("")
+    build_dir.joinpath("link.py").symlink_to("a.py")
+    build_dir.joinpath("linkdir").symlink_to("b", target_is_directory=True)
+    build_dir.joinpath("broken.py").symlink_to("missing.py")
+
+    expected = []
+    for root, dirnames, filenames in os.walk(build_dir):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(root, name)
+            if os.path.isfile(path) and not root.endswith(".dist-info"):
+                expected.append(os.path.relpath(path, build_dir).replace(os.sep, "/"))
+
+    with WheelFile(wheel_path, "w") as wf:
+        wf.write_files(str(build_dir))
+
+    with WheelFile(wheel_path) as wf:
+        assert wf.namelist() == [
+            *expected,
+            "test-1.0.dist-info/METADATA",
+            "test-1.0.dist-info/RECORD",
+        ]
+        assert wf.read("link.py") == b"a.py"
+
+
+def test_write_to_pipe(tmp_path_factory: TempPathFactory, wheel_path: Path) -> None:
+    build_dir = tmp_path_factory.mktemp("build")
+    for i in range(10):
+        build_dir.joinpath(f"module{i}.py").write_bytes(b"x = %d\n" % i * 1000)
+
+    read_fd, write_fd = os.pipe()
+    received: list[bytes] = []
+    with ThreadPoolExecutor(1) as executor:
+        with open(read_fd, "rb") as reader:
+            reading = executor.submit(lambda: received.append(reader.read()))
+            with open(write_fd, "wb") as writer:
+                with WheelFile(writer, "w", filename=wheel_path.name, jobs=2) as wf:
+                    wf.writestr("hello/hello.py", b"print('hello')\n")
+                    wf.write_iter([("hello/chunks.py", [b"a = 1\n", b"b = 2\n"])])
+                    wf.write_files(str(build_dir))
+
+            reading.result()
+
+    wheel_path.write_bytes(received[0])
+    with WheelFile(wheel_path) as wf:
+        assert wf.verify().ok
+        assert wf.read("hello/chunks.py") == b"a = 1\nb = 2\n"
+        assert len(wf.namelist()) == 13
+
+
+def test_write_to_file_object_without_filename() -> None:
+    exc = pytest.raises(WheelError, WheelFile, BytesIO(), "w")
+    exc.match("^The wheel filename is required for file objects and buffers$")
+
+
+@pytest.mark.parametrize("kind", [bytes, bytearray, memoryview])
+def test_read_from_buffer(kind: type) -> None:
+    stored = os.urandom(1000)
+    output = BytesIO()
+    with WheelFile(output, "w", filename="test-1.0-py3-none-any.whl") as wf:
+        wf.writestr("hello/data.bin", stored, ZIP_STORED)
+        wf.writestr("hello/hello.py", b"print('hello')\n")
+
+    buffer = kind(output.getvalue())
+    with WheelFile(buffer, filename="test-1.0-py3-none-any.whl") as wf:
+        assert wf.read("hello/hello.py") == b"print('hello')\n"
+        assert wf.verify().ok
+
+        view = wf.read_view("hello/data.bin")
+        assert view == stored
+        assert view.readonly
+        assert view.obj is buffer or view.obj is getattr(buffer, "obj", None)
+
+
+def test_read_from_buffer_without_filename() -> None:
+    exc = pytest.raises(WheelError, WheelFile, b"")
+    exc.match("^The wheel filename is required for file objects and buffers$")
+
+
+def test_write_to_buffer() -> None:
+    exc = pytest.raises(
+        WheelError, WheelFile, bytearray(), "w", filename="test-1.0-py3-none-any.whl"
+    )
+    exc.match("^Wheels in memory buffers can only be read$")
+
+
+def test_read_from_bad_buffer() -> None:
+    with pytest.raises(BadZipFile):
+        WheelFile(b"not a zip", filename="test-1.0-py3-none-any.whl")
+
+
+@pytest.mark.parametrize("compression", [ZIP_STORED, ZIP_DEFLATED])
+@pytest.mark.parametrize("seekable", [True, False], ids=["seekable", "unseekable"])
+def test_stream_reader(compression: int, seekable: bool) -> None:
+    # Unseekable output uses data descriptors; stored data with a descriptor must
+    # be split at the descriptor matching it, not at a lookalike in the data
+    lookalike = os.urandom(100) + b"PK\x07\x08" + os.urandom(100)
+    output = BytesIO() if seekable else UnseekableBytesIO()
+    with WheelFile(
+        output, "w", compression, filename="test-1.0-py3-none-any.whl"
+    ) as wf:
+        wf.writestr("hello/hello.py", b"print('hello')\n" * 100)
+        wf.writestr("hello/data.bin", lookalike)
+        wf.writestr("hello/empty.py", b"")
+        wf.write_iter([("hello/large.bin", [b"x" * 10] * 3)], buffer_size=16)
+
+    reader = WheelStreamReader(BytesIO(output.getvalue()))
+    contents = {}
+    for zinfo, chunks in reader:
+        if zinfo.filename != "hello/empty.py":
+            contents[zinfo.filename] = b"".join(chunks)
+
+    report = reader.verify()
+    assert report.errors == {}
+    assert report.verified == [
+        "hello/hello.py",
+        "hello/data.bin",
+        "hello/empty.py",
+        "hello/large.bin",
+    ]
+    assert report.unhashed == ["test-1.0.dist-info/RECORD"]
+    assert reader.dist_info_path == "test-1.0.dist-info"
+    assert contents["hello/data.bin"] == lookalike
+    assert contents["hello/large.bin"] == b"x" * 30
+
+
+def test_stream_reader_stats() -> None:
+    output = BytesIO()
+    with WheelFile(output, "w", filename="test-1.0-py3-none-any.whl") as wf:
+        wf.writestr("hello/hello.py", b"print('hello')\n" * 100)
+
+    stats = WheelStats()
+    reader = WheelStreamReader(BytesIO(output.getvalue()), stats)
+    assert reader.verify().ok
+    assert stats.bytes_read == len(output.getvalue())
+    assert stats.bytes_decompressed > 1500
+    assert set(stats.member_times) == {"hello/hello.py", "test-1.0.dist-info/RECORD"}
+
+
+def test_stream_reader_record_case() -> None:
+    # WheelFile finds RECORD whatever the case of the .dist-info directory, so a
+    # streamed wheel must be read the same way
+    output = BytesIO()
+    with WheelFile(output, "w", filename="test-1.0-py3-none-any.whl") as wf:
+        wf.writestr("hello/hello.py", b"print('hello')\n")
+
+    renamed = BytesIO()
+    with ZipFile(BytesIO(output.getvalue())) as source, ZipFile(renamed, "w") as zf:
+        for name in source.namelist():
+            data = source.read(name).replace(b".dist-info/", b".DIST-INFO/")
+            zf.writestr(name.replace(".dist-info/", ".DIST-INFO/"), data)
+
+    reader = WheelStreamReader(BytesIO(renamed.getvalue()))
+    assert reader.verify().ok
+    assert reader.record_path == "test-1.0.DIST-INFO/RECORD"
+
+
+def test_stream_reader_errors(wheel_path: Path) -> None:
+    with ZipFile(wheel_path, "w") as zf:
+        zf.writestr("hello.py", b"print('hello')\n")
+        zf.writestr("unlisted.py", b"")
+        zf.writestr(
+            "test-1.0.dist-info/RECORD",
+            "hello.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n"
+            "missing.py,sha256=bv-QV3RciQC2v3zL8Uvhd_arp40J5A9xmyubN34OVwo,25\n",
+        )
+
+    with wheel_path.open("rb") as f:
+        report = WheelStreamReader(f).verify()
+
+    assert report.errors == {
+        "hello.py": "Hash mismatch for file 'hello.py'",
+        "unlisted.py": "No hash found for file 'unlisted.py'",
+        "missing.py": "File 'missing.py' listed in RECORD is missing",
+    }
+
+
+def test_stream_reader_central_directory_mismatch(wheel_path: Path) -> None:
+    # A random access reader would see different contents than a streaming one
+    with WheelFile(wheel_path, "w", ZIP_STORED) as wf:
+        wf.writestr("hello.py", b"print('hello')\n")
+
+    data = bytearray(wheel_path.read_bytes())
+    with ZipFile(wheel_path) as zf:
+        central_directory = data.index(b"PK\x01\x02")
+        assert zf.getinfo("hello.py").header_offset == 0
+
+    # Make the central directory entry of hello.py point past its local header
+    data[central_directory + 42 : central_directory + 46] = b"\x01\x00\x00\x00"
+    report = WheelStreamReader(BytesIO(data)).verify()
+    assert report.errors == {
+        "hello.py": "Central directory entry for file 'hello.py' does not match its "
+        "local header"
+    }
+
+
+def test_stream_reader_missing_record() -> None:
+    output = BytesIO()
+    with ZipFile(output, "w") as zf:
+        zf.writestr("hello.py", b"print('hello')\n")
+
+    reader = WheelStreamReader(BytesIO(output.getvalue()))
+    exc = pytest.raises(WheelError, reader.verify)
+    exc.match(r"^Missing \.dist-info/RECORD file$")
+
+
+def test_stream_reader_truncated(wheel_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello.py", b"print('hello')\n" * 100)
+
+    report = WheelStreamReader(BytesIO(wheel_path.read_bytes()[:100])).verify()
+    assert report.errors == {"": "Unexpected end of wheel data"}
+
+
+def test_stream_reader_corrupt_deflate(wheel_path: Path) -> None:
+    with WheelFile(wheel_path, "w") as wf:
+        wf.writestr("hello/hello.py", "print('hello')\n" * 100)
+        wf.writestr("hello/other.py", "print('other')\n" * 100)
+
+    corrupt_member(wheel_path, "hello/hello.py")
+    report = WheelStreamReader(BytesIO(wheel_path.read_bytes())).verify()
+    assert report.verified == ["hello/other.py"]
+    assert list(report.errors) == ["hello/hello.py"]
+    assert report.errors["hello/hello.py"].startswith(
+        "Bad compressed data for file 'hello/hello.py': Error -3"
+    )
+
+
+def test_stream_reader_malformed_record() -> None:
+    output = BytesIO()
+    with ZipFile(output, "w") as zf:
+        zf.writestr("hello.py", b"")
+        zf.writestr("test-1.0.dist-info/RECORD", "hello.py\n")
+
+    report = WheelStreamReader(BytesIO(output.getvalue())).verify()
+    assert report.errors == {
+        "test-1.0.dist-info/RECORD": "Malformed RECORD row for file 'hello.py'",
+        "hello.py": "No hash found for file 'hello.py'",
+    }
+
+
+def test_wheel_file_pool(tmp_path: Path) -> None:
+    paths = []
+    for name in "abc":
+        path = tmp_path / f"{name}-1.0-py3-none-any.whl"
+        with WheelFile(path, "w") as wf:
+            wf.writestr(f"{name}.py", f"print({name!r})\n")
+
+        paths.append(path)
+
+    a, b, c = paths
+    with WheelFilePool(max_open=2) as pool:
+        with pool.open(a) as wf:
+            assert wf.read("a.py") == b"print('a')\n"
+
+        with pool.open(a) as wf2:
+            assert wf2 is wf
+
+        assert (pool.hits, pool.misses, pool.evictions) == (1, 1, 0)
+
+        # Wheels in use are kept open beyond max_open
+        with pool.open(a) as wa, pool.open(b) as wb, pool.open(c) as wc:
+            assert len(pool) == 3
+            assert wa.read("a.py") == b"print('a')\n"
+
+        # ...until they are given back, when the least recently used unused one is
+        # closed
+        assert len(pool) == 2
+        assert wa.fp is not None
+        assert wb.fp is not None
+        assert wc.fp is None
+        assert (pool.hits, pool.misses, pool.evictions) == (2, 3, 1)
+
+        # Using the oldest wheel again makes the other one the least recently used,
+        # and so the one closed when another wheel is opened
+        with pool.open(a):
+            pass
+
+        with pool.open(c) as wc:
+            assert wc.read("c.py") == b"print('c')\n"
+
+        assert wa.fp is not None
+        assert wb.fp is None
+        assert (pool.hits, pool.misses, pool.evictions) == (3, 4, 2)
+
+        # A wheel that was replaced is opened afresh, while the old one stays
+        # usable until given back
+        with pool.open(b) as wb2:
+            new_path = tmp_path / "new" / b.name
+            new_path.parent.mkdir()
+            with WheelFile(new_path, "w") as wf:
+                wf.writestr("b.py", "print('B')\n")
+
+            os.replace(new_path, b)
+
+            with pool.open(b) as wb3:
+                assert wb3 is not wb2
+                assert wb3.read("b.py") == b"print('B')\n"
+
+            assert wb2.fp is not None
+            assert wb2.read("b.py") == b"print('b')\n"
+
+        assert wb2.fp is None
+        assert wa.fp is None
+        assert (pool.hits, pool.misses, pool.evictions) == (3, 6, 4)
+
+        with pool.open(c) as wc:
+            pass
+
+    assert wc.fp is None
+    assert len(pool) == 0
+    with pytest.raises(WheelError, match="^The pool is closed$"):
+        with pool.open(a):
+            pass
+
+    with pytest.raises(ValueError, match="^max_open must be at least 1$"):
+        WheelFilePool(max_open=0)
+
+
+def test_wheel_file_pool_threads(tmp_path: Path) -> None:
+    paths = []
+    for i in range(8):
+        path = tmp_path / f"test{i}-1.0-py3-none-any.whl"
+        with WheelFile(path, "w") as wf:
+            wf.writestr("module.py", f"print({i})\n")
+
+        paths.append(path)
+
+    def read(i: int) -> bytes:
+        with pool.open(paths[i % 8]) as wf:
+            return wf.read("module.py")
+
+    with WheelFilePool(max_open=3, concurrent_reads=True) as pool:
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(read, range(400)))
+
+        assert results == [b"print(%d)\n" % (i % 8) for i in range(400)]
+        assert pool.hits + pool.misses == 400
+        assert len(pool) <= 3